@@ -1,23 +1,77 @@
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, request, jsonify
 from flask_cors import CORS
 import os
 from config import Config
 
 # Import controllers
+from controllers.admin_controller import admin_bp
 from controllers.auth_controller import auth_bp
+from controllers.export_controller import export_bp
+from controllers.job_controller import job_bp
 from controllers.match_controller import match_bp
+from controllers.rating_controller import rating_bp
 from controllers.team_controller import team_bp
 from controllers.tournament_controller import tournament_bp
+from services.admission_service import admission_service
+from services.change_log import ChangeLogConflict
+from services.db_service import db_service
+from services.profiling_service import profiling_service
+from services.serialization import FastJSONProvider
 
 app = Flask(__name__, static_folder='../frontend/build')
 app.config.from_object(Config)
 
+# orjson with native Decimal handling, and MessagePack for clients that send Accept: application/msgpack
+app.json = FastJSONProvider(app)
+
 # Configure CORS
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+# Shed anonymous reads under overload so admin writes keep their capacity
+@app.before_request
+def admission_control():
+    shed = admission_service.admit(request)
+    if shed:
+        reason, wait = shed
+        response = jsonify({'message': 'Server busy, please retry shortly', 'reason': reason})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(admission_service.retry_after(wait))
+        return response
+
+# Opt-in profiling: admins send X-Profile: 1 (or ?_profile=1); PROFILE_SAMPLE_RATE samples the rest
+db_service.add_client_hook(profiling_service.instrument_client)
+
+@app.before_request
+def start_profile():
+    profiling_service.start(request)
+
+@app.after_request
+def finish_profile(response):
+    profile = profiling_service.finish(response.status_code)
+    if profile:
+        response.headers['X-Profile-Id'] = profile.profile_id
+    return response
+
+@app.teardown_request
+def admission_release(exc):
+    profiling_service.finish()  # Requests that raised never reached after_request
+    admission_service.release(request)
+
+# A logged match write that kept losing the race for the change log is safe to retry
+@app.errorhandler(ChangeLogConflict)
+def change_log_conflict(e):
+    response = jsonify({'message': 'Too many concurrent updates to this tournament, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 # Register blueprints
+app.register_blueprint(admin_bp, url_prefix='/api/admin')
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
+app.register_blueprint(export_bp, url_prefix='/api/export')
+app.register_blueprint(job_bp, url_prefix='/api/jobs')
 app.register_blueprint(match_bp, url_prefix='/api/matches')
+app.register_blueprint(rating_bp, url_prefix='/api/ratings')
 app.register_blueprint(team_bp, url_prefix='/api/teams')
 app.register_blueprint(tournament_bp, url_prefix='/api/tournaments')
 
@@ -11,11 +11,95 @@ class Config:
     AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
     DYNAMODB_ENDPOINT = os.environ.get('DYNAMODB_ENDPOINT', None)
     
+    # botocore client tuning (applies to every client: each thread's own and the shared plain client)
+    DYNAMODB_MAX_POOL_CONNECTIONS = int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '50'))
+    DYNAMODB_CONNECT_TIMEOUT = float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '2'))
+    DYNAMODB_READ_TIMEOUT = float(os.environ.get('DYNAMODB_READ_TIMEOUT', '5'))
+    DYNAMODB_RETRY_MODE = os.environ.get('DYNAMODB_RETRY_MODE', 'adaptive')  # 'legacy', 'standard' or 'adaptive'
+    DYNAMODB_MAX_ATTEMPTS = int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '5'))
+    DYNAMODB_TCP_KEEPALIVE = os.environ.get('DYNAMODB_TCP_KEEPALIVE', 'True').lower() in ('true', '1', 't')
+    
     # DynamoDB Tables
     TEAMS_TABLE = os.environ.get('TEAMS_TABLE', 'VolleyDB_Teams')
     MATCHES_TABLE = os.environ.get('MATCHES_TABLE', 'VolleyDB_Matches')
     TOURNAMENTS_TABLE = os.environ.get('TOURNAMENTS_TABLE', 'VolleyDB_Tournaments')
     
+    # Storage layout: 'multi_table' (one table per entity) or 'single_table'
+    # (everything for a tournament in one partition of SINGLE_TABLE)
+    DATA_LAYOUT = os.environ.get('DATA_LAYOUT', 'multi_table')
+    SINGLE_TABLE = os.environ.get('SINGLE_TABLE', 'VolleyDB_Main')
+    
+    # Nginx micro-cache refresh (e.g. http://127.0.0.1); unset disables it
+    CACHE_REFRESH_URL = os.environ.get('CACHE_REFRESH_URL', None)
+    CACHE_REFRESH_TIMEOUT = float(os.environ.get('CACHE_REFRESH_TIMEOUT', '2'))
+    
+    # Export: parallel scan segments per table (DynamoDB scans are I/O bound)
+    EXPORT_SCAN_SEGMENTS = int(os.environ.get('EXPORT_SCAN_SEGMENTS', (os.cpu_count() or 1) * 2))
+    EXPORT_MAX_SEGMENTS = int(os.environ.get('EXPORT_MAX_SEGMENTS', '64'))
+    
+    # Background jobs: worker threads per process and max queued jobs
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+    JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '20'))
+    # Brackets for larger fields are generated as a background job
+    BRACKET_ASYNC_THRESHOLD = int(os.environ.get('BRACKET_ASYNC_THRESHOLD', '64'))
+    EXPORT_DIR = os.environ.get('EXPORT_DIR', '/tmp/volleytracker-exports')
+    
+    # Team ratings (Elo)
+    RATING_INITIAL = float(os.environ.get('RATING_INITIAL', '1500'))
+    RATING_K_FACTOR = float(os.environ.get('RATING_K_FACTOR', '32'))
+    
+    # Monte Carlo bracket projections
+    PROJECTION_SIMULATIONS = int(os.environ.get('PROJECTION_SIMULATIONS', '100000'))
+    PROJECTION_MAX_SIMULATIONS = int(os.environ.get('PROJECTION_MAX_SIMULATIONS', '1000000'))
+    PROJECTION_BATCH_SIZE = int(os.environ.get('PROJECTION_BATCH_SIZE', '50000'))  # Bounds memory per pass
+    PROJECTION_CACHE_SIZE = int(os.environ.get('PROJECTION_CACHE_SIZE', '64'))  # Tournaments kept per process
+    
+    # Court display boards: most matches a queue request may ask for
+    COURT_QUEUE_MAX_LIMIT = int(os.environ.get('COURT_QUEUE_MAX_LIMIT', '20'))
+    
+    # Admission control for anonymous API reads, per worker process (requests/second)
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'True').lower() in ('true', '1', 't')
+    ADMISSION_READ_RATE = float(os.environ.get('ADMISSION_READ_RATE', '40'))
+    ADMISSION_READ_BURST = float(os.environ.get('ADMISSION_READ_BURST', '80'))
+    ADMISSION_CLIENT_RATE = float(os.environ.get('ADMISSION_CLIENT_RATE', '5'))
+    ADMISSION_CLIENT_BURST = float(os.environ.get('ADMISSION_CLIENT_BURST', '20'))
+    ADMISSION_MAX_CLIENTS = int(os.environ.get('ADMISSION_MAX_CLIENTS', '10000'))
+    # Reads allowed in flight at once (0 = no cap); keep it below the worker's
+    # thread count so some threads are always free for admin writes
+    ADMISSION_READ_MAX_INFLIGHT = int(os.environ.get('ADMISSION_READ_MAX_INFLIGHT', '0'))
+    
+    # Request profiling: admin opt-in per request, plus random sampling (0-1)
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', '/tmp/volleytracker-profiles')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '200'))
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '1'))
+    
+    # Match change feed: how long records are kept, and the most one poll returns
+    CHANGE_LOG_TTL = int(os.environ.get('CHANGE_LOG_TTL', '86400'))
+    CHANGE_FEED_LIMIT = int(os.environ.get('CHANGE_FEED_LIMIT', '500'))
+    # Logged writes that lose the race for a tournament's sequence number retry with
+    # jittered exponential backoff: up to CHANGE_LOG_ATTEMPTS tries, the first wait
+    # up to CHANGE_LOG_BACKOFF seconds, capped at CHANGE_LOG_BACKOFF_MAX
+    CHANGE_LOG_ATTEMPTS = int(os.environ.get('CHANGE_LOG_ATTEMPTS', '8'))
+    CHANGE_LOG_BACKOFF = float(os.environ.get('CHANGE_LOG_BACKOFF', '0.01'))
+    CHANGE_LOG_BACKOFF_MAX = float(os.environ.get('CHANGE_LOG_BACKOFF_MAX', '0.5'))
+    
+    # Projected start times: expected match length, the step projections are
+    # rounded up to (so every rally of a long match doesn't rewrite the
+    # schedule), and tournament graphs kept per process
+    SCHEDULE_MATCH_MINUTES = int(os.environ.get('SCHEDULE_MATCH_MINUTES', '45'))
+    SCHEDULE_ROUNDING = int(os.environ.get('SCHEDULE_ROUNDING', '60'))
+    SCHEDULE_CACHE_SIZE = int(os.environ.get('SCHEDULE_CACHE_SIZE', '64'))
+    
+    # Team search: seconds before a worker rebuilds its index (to pick up other
+    # workers' writes), and the most results one query may ask for
+    SEARCH_INDEX_MAX_AGE = int(os.environ.get('SEARCH_INDEX_MAX_AGE', '300'))
+    SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', '50'))
+    
+    # Cold archive for completed tournaments (local files, shared by every worker)
+    ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', '/var/lib/volleytracker/archive')
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '30'))
+    
     # Admin configuration
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'password')  # Change in production!
     
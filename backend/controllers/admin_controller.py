@@ -0,0 +1,84 @@
+import os
+from flask import Blueprint, request, jsonify, send_file
+from services.admission_service import admission_service
+from services.profiling_service import profiling_service
+from services.auth_service import AuthService
+from services.job_service import job_service, JobQueueFull
+from models.tournament import Tournament
+from config import Config
+from functools import wraps
+
+admin_bp = Blueprint('admin', __name__)
+
+# Auth middleware
+def require_auth(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'Authentication required'}), 401
+        
+        token = auth_header.split(' ')[1]
+        payload = AuthService.validate_token(token)
+        
+        if not payload:
+            return jsonify({'message': 'Invalid or expired token'}), 401
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+@admin_bp.route('/admission', methods=['GET'])
+@require_auth
+def get_admission_stats():
+    """Get admission control counters for the worker process that answers (admin only)"""
+    return jsonify(admission_service.stats()), 200
+
+@admin_bp.route('/profiles', methods=['GET'])
+@require_auth
+def list_profiles():
+    """List stored request profiles, newest first (admin only)"""
+    limit = request.args.get('limit', 50, type=int)
+    summaries = []
+    for profile_id in profiling_service.list_ids()[:limit]:
+        summary = profiling_service.get_summary(profile_id)
+        if summary:
+            summary.pop('dynamodb_calls', None)
+            summaries.append(summary)
+    return jsonify(summaries), 200
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@require_auth
+def get_profile(profile_id):
+    """Get a profile's wall-clock and DynamoDB timings (admin only)"""
+    summary = profiling_service.get_summary(profile_id)
+    
+    if not summary:
+        return jsonify({'message': 'Profile not found'}), 404
+    
+    return jsonify(summary), 200
+
+@admin_bp.route('/profiles/<profile_id>/stacks', methods=['GET'])
+@require_auth
+def get_profile_stacks(profile_id):
+    """Download a profile's collapsed stacks, e.g. for flamegraph.pl (admin only)"""
+    path = profiling_service.path(profile_id, '.collapsed')
+    
+    if not path or not os.path.exists(path):
+        return jsonify({'message': 'Profile not found'}), 404
+    
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=f'{profile_id}.collapsed')
+
+@admin_bp.route('/archive', methods=['POST'])
+@require_auth
+def archive_tournaments():
+    """Move completed tournaments older than ?older_than_days= to the cold archive in the background (admin only)"""
+    older_than_days = request.args.get('older_than_days', Config.ARCHIVE_AFTER_DAYS, type=int)
+    if older_than_days < 0:
+        return jsonify({'message': 'older_than_days must not be negative'}), 400
+    
+    try:
+        job = job_service.submit('archive_tournaments', Tournament.archive_completed, older_than_days=older_than_days)
+    except JobQueueFull as e:
+        return jsonify({'message': str(e)}), 503
+    
+    return jsonify({'message': 'Archiving started', 'job': job.to_dict()}), 202
@@ -0,0 +1,73 @@
+import time
+from flask import Blueprint, Response, request, jsonify, send_from_directory
+from services.auth_service import AuthService
+from services.export_service import export_service
+from services.job_service import job_service, JobQueueFull
+from config import Config
+from functools import wraps
+
+export_bp = Blueprint('export', __name__)
+
+# Auth middleware
+def require_auth(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'Authentication required'}), 401
+        
+        token = auth_header.split(' ')[1]
+        payload = AuthService.validate_token(token)
+        
+        if not payload:
+            return jsonify({'message': 'Invalid or expired token'}), 401
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+def _segments():
+    """Parse and bound the ?segments= parameter"""
+    segments = request.args.get('segments', Config.EXPORT_SCAN_SEGMENTS, type=int)
+    if not 1 <= segments <= Config.EXPORT_MAX_SEGMENTS:
+        return None
+    return segments
+
+@export_bp.route('/', methods=['GET'])
+@require_auth
+def export_all():
+    """Stream every tournament, team and match as gzip'd NDJSON (admin only)"""
+    segments = _segments()
+    if not segments:
+        return jsonify({'message': f'segments must be between 1 and {Config.EXPORT_MAX_SEGMENTS}'}), 400
+    
+    filename = f"volleytracker-export-{int(time.time())}.ndjson.gz"
+    return Response(
+        export_service.export_ndjson_gz(segments),
+        mimetype='application/gzip',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            # Let nginx pass chunks straight through instead of buffering the export
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@export_bp.route('/', methods=['POST'])
+@require_auth
+def start_export():
+    """Write an export file in the background (admin only)"""
+    segments = _segments()
+    if not segments:
+        return jsonify({'message': f'segments must be between 1 and {Config.EXPORT_MAX_SEGMENTS}'}), 400
+    
+    try:
+        job = job_service.submit('export', export_service.export_to_file, segments)
+    except JobQueueFull as e:
+        return jsonify({'message': str(e)}), 503
+    
+    return jsonify({'message': 'Export started', 'job': job.to_dict()}), 202
+
+@export_bp.route('/files/<filename>', methods=['GET'])
+@require_auth
+def download_export(filename):
+    """Download an export file written by an export job (admin only)"""
+    return send_from_directory(Config.EXPORT_DIR, filename, as_attachment=True)
@@ -0,0 +1,34 @@
+from flask import Blueprint, request, jsonify
+from models.job import Job
+from services.auth_service import AuthService
+from functools import wraps
+
+job_bp = Blueprint('job', __name__)
+
+# Auth middleware
+def require_auth(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'Authentication required'}), 401
+        
+        token = auth_header.split(' ')[1]
+        payload = AuthService.validate_token(token)
+        
+        if not payload:
+            return jsonify({'message': 'Invalid or expired token'}), 401
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+@job_bp.route('/<job_id>', methods=['GET'])
+@require_auth
+def get_job(job_id):
+    """Get the status, progress and result of a background job (admin only)"""
+    job = Job.get(job_id)
+    
+    if not job:
+        return jsonify({'message': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict()), 200
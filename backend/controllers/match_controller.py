@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from models.match import Match
 from services.auth_service import AuthService
+from services.cache_service import cache_service
+from services.schedule_service import schedule_service
+from services.field_projection import parse_fields
 from functools import wraps
 
 match_bp = Blueprint('match', __name__)
@@ -31,13 +34,27 @@ def get_matches():
     if not tournament_id:
         return jsonify({'message': 'Tournament ID is required'}), 400
     
+    try:
+        fields = parse_fields(request.args.get('fields'), Match.FIELDS, 'match_id')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    if fields:
+        # Only read and return the requested attributes
+        return jsonify(Match.get_fields_by_tournament_status(fields, tournament_id, status)), 200
+    
     matches = Match.get_by_tournament_status(tournament_id, status)
     return jsonify([match.to_dict() for match in matches]), 200
 
+@match_bp.route('/live', methods=['GET'])
+def get_live_matches():
+    """Get every match being played right now, across all tournaments"""
+    return jsonify(Match.get_live()), 200
+
 @match_bp.route('/<match_id>', methods=['GET'])
 def get_match(match_id):
-    """Get a specific match"""
-    match = Match.get(match_id)
+    """Get a specific match (pass tournament_id to read it back right after a write)"""
+    match = Match.get(match_id, request.args.get('tournament_id'))
     
     if not match:
         return jsonify({'message': 'Match not found'}), 404
@@ -66,6 +83,11 @@ def update_score(match_id):
     if data.get('complete', False):
         match.complete_match()
     
+    # Push the new start/finish through to later matches on the court and in the bracket
+    projected = schedule_service.refresh(match.tournament_id)
+    match.projected_time = projected.get(match.match_id, match.projected_time)
+    
+    cache_service.invalidate_tournament(match.tournament_id, match_ids=[match.match_id, match.next_match_id, *projected])
     return jsonify(match.to_dict()), 200
 
 @match_bp.route('/<match_id>/court', methods=['POST'])
@@ -82,6 +104,10 @@ def update_court(match_id):
     match.court = court
     match.update()
     
+    projected = schedule_service.refresh(match.tournament_id)
+    match.projected_time = projected.get(match.match_id, match.projected_time)
+    
+    cache_service.invalidate_tournament(match.tournament_id, match_ids=[match.match_id, *projected])
     return jsonify(match.to_dict()), 200
 
 @match_bp.route('/<match_id>/schedule', methods=['POST'])
@@ -95,7 +121,15 @@ def update_schedule(match_id):
     if not match:
         return jsonify({'message': 'Match not found'}), 404
     
-    match.scheduled_time = scheduled_time
+    # Stored as a number: it is the sort key of the court schedule index
+    try:
+        match.scheduled_time = int(scheduled_time)
+    except (TypeError, ValueError):
+        return jsonify({'message': 'scheduled_time must be a Unix timestamp'}), 400
     match.update()
     
+    projected = schedule_service.refresh(match.tournament_id)
+    match.projected_time = projected.get(match.match_id, match.projected_time)
+    
+    cache_service.invalidate_tournament(match.tournament_id, match_ids=[match.match_id, *projected])
     return jsonify(match.to_dict()), 200
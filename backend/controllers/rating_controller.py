@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify
+from models.rating import Rating, team_identity
+from models.team import Team
+from services.auth_service import AuthService
+from services.job_service import job_service, JobQueueFull
+from services.rating_service import rating_service
+from functools import wraps
+
+rating_bp = Blueprint('rating', __name__)
+
+# Auth middleware
+def require_auth(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'Authentication required'}), 401
+        
+        token = auth_header.split(' ')[1]
+        payload = AuthService.validate_token(token)
+        
+        if not payload:
+            return jsonify({'message': 'Invalid or expired token'}), 401
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+@rating_bp.route('/', methods=['GET'])
+def get_ratings():
+    """Get the rating leaderboard, or the ratings of one tournament's teams"""
+    tournament_id = request.args.get('tournament_id')
+    
+    if not tournament_id:
+        return jsonify([rating.to_dict() for rating in Rating.get_all()]), 200
+    
+    teams = Team.get_all(tournament_id)
+    ratings = Rating.get_many(team_identity(team.team_name) for team in teams)
+    result = []
+    for team in teams:
+        identity = team_identity(team.team_name)
+        rating = ratings.get(identity) or Rating(identity, team.team_name)
+        result.append(dict(rating.to_dict(), team_id=team.team_id))
+    result.sort(key=lambda entry: entry['rating'], reverse=True)
+    return jsonify(result), 200
+
+@rating_bp.route('/<identity>', methods=['GET'])
+def get_rating(identity):
+    """Get the rating of one team, by name"""
+    identity = team_identity(identity)
+    rating = Rating.get(identity) if identity else None
+    
+    if not rating:
+        return jsonify({'message': 'Rating not found'}), 404
+    
+    return jsonify(rating.to_dict()), 200
+
+@rating_bp.route('/recompute', methods=['POST'])
+@require_auth
+def recompute_ratings():
+    """Rebuild all ratings from the match history in the background (admin only)"""
+    try:
+        job = job_service.submit('recompute_ratings', rating_service.recompute_all)
+    except JobQueueFull as e:
+        return jsonify({'message': str(e)}), 503
+    
+    return jsonify({'message': 'Rating recomputation started', 'job': job.to_dict()}), 202
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from models.team import Team
 from services.auth_service import AuthService
+from services.cache_service import cache_service
+from services.field_projection import parse_fields
+from services.search_service import team_search
 from functools import wraps
 
 team_bp = Blueprint('team', __name__)
@@ -27,6 +30,15 @@ def get_teams():
     """Get all teams for a tournament"""
     tournament_id = request.args.get('tournament_id')
     
+    try:
+        fields = parse_fields(request.args.get('fields'), Team.FIELDS, 'team_id')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    if fields:
+        # Only read and return the requested attributes
+        return jsonify(Team.get_all_fields(fields, tournament_id)), 200
+    
     if tournament_id:
         teams = Team.get_all(tournament_id)
     else:
@@ -34,10 +46,21 @@ def get_teams():
     
     return jsonify([team.to_dict() for team in teams]), 200
 
+@team_bp.route('/search', methods=['GET'])
+def search_teams():
+    """Find teams by team or player name (typeahead), across all tournaments"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'message': 'q is required'}), 400
+    
+    limit = request.args.get('limit', 10, type=int)
+    tournament_id = request.args.get('tournament_id')
+    return jsonify(team_search.search(query, limit, tournament_id)), 200
+
 @team_bp.route('/<team_id>', methods=['GET'])
 def get_team(team_id):
-    """Get a specific team"""
-    team = Team.get(team_id)
+    """Get a specific team (pass tournament_id to read it back right after a write)"""
+    team = Team.get(team_id, request.args.get('tournament_id'))
     
     if not team:
         return jsonify({'message': 'Team not found'}), 404
@@ -58,6 +81,7 @@ def create_team():
         return jsonify({'message': 'Team name and tournament ID are required'}), 400
     
     team = Team.create(team_name, tournament_id, players)
+    cache_service.invalidate_tournament(tournament_id, team_ids=[team.team_id])
     return jsonify(team.to_dict()), 201
 
 @team_bp.route('/<team_id>', methods=['PUT'])
@@ -79,6 +103,7 @@ def update_team(team_id):
     
     # Save the updated team
     team = Team.update(team)
+    cache_service.invalidate_tournament(team.tournament_id, team_ids=[team.team_id])
     
     return jsonify(team.to_dict()), 200
 
@@ -92,4 +117,5 @@ def delete_team(team_id):
         return jsonify({'message': 'Team not found'}), 404
     
     team.delete()
+    cache_service.invalidate_tournament(team.tournament_id, team_ids=[team.team_id])
     return jsonify({'message': 'Team deleted successfully'}), 200
@@ -1,6 +1,19 @@
 from flask import Blueprint, request, jsonify
 from models.tournament import Tournament
+from models.team import Team
+from models.match import Match
+from models.bracket import BracketConflict
 from services.auth_service import AuthService
+from services.cache_service import cache_service
+from services.job_service import job_service, JobQueueFull
+from services.rating_service import rating_service
+from services.simulation_service import simulation_service
+from services.change_log import change_log
+from services.archive_service import archive_service
+from services.schedule_service import schedule_service
+from config import Config
+from services.field_projection import parse_fields
+from services.swiss import PairingError
 from functools import wraps
 
 tournament_bp = Blueprint('tournament', __name__)
@@ -25,9 +38,23 @@ def require_auth(f):
 @tournament_bp.route('/', methods=['GET'])
 def get_tournaments():
     """Get all tournaments"""
+    try:
+        fields = parse_fields(request.args.get('fields'), Tournament.FIELDS, 'tournament_id')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    if fields:
+        # Only read and return the requested attributes
+        return jsonify(Tournament.get_all_fields(fields)), 200
+    
     tournaments = Tournament.get_all()
     return jsonify([tournament.to_dict() for tournament in tournaments]), 200
 
+@tournament_bp.route('/archived', methods=['GET'])
+def get_archived_tournaments():
+    """Get the tournaments moved to the cold archive"""
+    return jsonify([dict(item, archived=True) for item in archive_service.list_tournaments()]), 200
+
 @tournament_bp.route('/<tournament_id>', methods=['GET'])
 def get_tournament(tournament_id):
     """Get a specific tournament"""
@@ -46,9 +73,77 @@ def get_tournament_bracket(tournament_id):
     if not tournament:
         return jsonify({'message': 'Tournament not found'}), 404
     
-    bracket = tournament.get_bracket()
+    try:
+        compact = _compact_requested()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    bracket = tournament.get_bracket(compact=compact)
     return jsonify(bracket), 200
 
+@tournament_bp.route('/<tournament_id>/projections', methods=['GET'])
+def get_tournament_projections(tournament_id):
+    """Get each team's simulated chances of reaching each round and winning"""
+    tournament = Tournament.get(tournament_id)
+    
+    if not tournament:
+        return jsonify({'message': 'Tournament not found'}), 404
+    
+    if tournament.type != 'single_elimination':
+        return jsonify({'message': 'Projections are only available for single elimination brackets'}), 400
+    
+    simulations = request.args.get('simulations', type=int)
+    if simulations is not None and simulations < 1:
+        return jsonify({'message': 'simulations must be a positive integer'}), 400
+    
+    return jsonify(simulation_service.get_projections(tournament_id, simulations)), 200
+
+@tournament_bp.route('/<tournament_id>/courts/<court>/queue', methods=['GET'])
+def get_court_queue(tournament_id, court):
+    """Get what's playing and up next on a court, for the court display boards"""
+    limit = max(1, min(request.args.get('limit', 3, type=int), Config.COURT_QUEUE_MAX_LIMIT))
+    matches = Match.get_court_queue(tournament_id, court, limit)
+    
+    # Boards poll; an unchanged queue is answered with 304 and no body
+    response = jsonify({
+        'court': court,
+        'now_playing': next((match.to_dict() for match in matches if match.status == 'in_progress'), None),
+        'matches': [match.to_dict() for match in matches]
+    })
+    response.add_etag()
+    return response.make_conditional(request)
+
+@tournament_bp.route('/<tournament_id>/changes', methods=['GET'])
+def get_tournament_changes(tournament_id):
+    """Get the match changes since a sequence number, or a signal to reload the bracket"""
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'message': 'since must be an integer sequence number'}), 400
+    
+    return jsonify(change_log.changes_since(tournament_id, since)), 200
+
+@tournament_bp.route('/<tournament_id>/full', methods=['GET'])
+def get_tournament_full(tournament_id):
+    """Get a tournament together with its teams and bracket"""
+    try:
+        compact = _compact_requested()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    tournament, teams, bracket = Tournament.get_full(tournament_id)
+    
+    if not tournament:
+        return jsonify({'message': 'Tournament not found'}), 404
+    
+    return jsonify({
+        'tournament': tournament.to_dict(),
+        'teams': [team.to_dict() for team in teams],
+        'bracket': bracket.compact() if compact else bracket.rounds()
+    }), 200
+
 @tournament_bp.route('/', methods=['POST'])
 @require_auth
 def create_tournament():
@@ -75,6 +170,7 @@ def create_tournament():
     
     # Use the create method to save it
     tournament = Tournament.create(tournament)
+    cache_service.invalidate_tournament(tournament.tournament_id)
     
     return jsonify(tournament.to_dict()), 201
 
@@ -88,6 +184,9 @@ def update_tournament(tournament_id):
     if not tournament:
         return jsonify({'message': 'Tournament not found'}), 404
     
+    if tournament.archived:
+        return jsonify({'message': 'Archived tournaments are read-only'}), 409
+    
     # Update fields if provided
     if 'name' in data:
         tournament.name = data['name']
@@ -106,6 +205,7 @@ def update_tournament(tournament_id):
     
     # Save the updated tournament
     tournament = Tournament.update(tournament)
+    cache_service.invalidate_tournament(tournament.tournament_id)
     
     return jsonify(tournament.to_dict()), 200
 
@@ -118,14 +218,47 @@ def delete_tournament(tournament_id):
     if not tournament:
         return jsonify({'message': 'Tournament not found'}), 404
     
+    if tournament.archived:
+        return jsonify({'message': 'Archived tournaments are read-only'}), 409
+    
     tournament.delete()
-    return jsonify({'message': 'Tournament deleted successfully'}), 200
+    cache_service.invalidate_tournament(tournament.tournament_id)
+    
+    # Teams and matches are removed in the background
+    try:
+        job = job_service.submit('delete_tournament', tournament.delete_related)
+    except JobQueueFull as e:
+        return jsonify({'message': f'Tournament deleted, but cleanup could not be queued: {str(e)}'}), 503
+    
+    return jsonify({'message': 'Tournament deleted successfully', 'job': job.to_dict()}), 202
+
+@tournament_bp.route('/<tournament_id>/archive', methods=['POST'])
+@require_auth
+def archive_tournament(tournament_id):
+    """Move a completed tournament to the cold archive in the background (admin only)"""
+    tournament = Tournament.get(tournament_id)
+    
+    if not tournament:
+        return jsonify({'message': 'Tournament not found'}), 404
+    
+    if tournament.archived:
+        return jsonify({'message': 'Tournament is already archived'}), 409
+    
+    if tournament.status != 'completed':
+        return jsonify({'message': 'Only completed tournaments can be archived'}), 409
+    
+    try:
+        job = job_service.submit('archive_tournament', tournament.archive)
+    except JobQueueFull as e:
+        return jsonify({'message': str(e)}), 503
+    
+    return jsonify({'message': 'Tournament archiving started', 'job': job.to_dict()}), 202
 
 @tournament_bp.route('/<tournament_id>/bracket', methods=['POST'])
 @require_auth
 def create_tournament_bracket(tournament_id):
     """Create the bracket for a tournament (admin only)"""
-    data = request.json
+    data = request.json or {}
     team_ids = data.get('team_ids', [])
     
     tournament = Tournament.get(tournament_id)
@@ -133,16 +266,100 @@ def create_tournament_bracket(tournament_id):
     if not tournament:
         return jsonify({'message': 'Tournament not found'}), 404
     
+    if tournament.archived:
+        return jsonify({'message': 'Archived tournaments are read-only'}), 409
+    
+    # Without an explicit order (or with seeding=rating) seed by historical rating
+    if not team_ids or data.get('seeding') == 'rating':
+        team_names = {team.team_id: team.team_name for team in Team.get_all(tournament_id)}
+        candidates = [team_id for team_id in team_ids if team_id in team_names] if team_ids else list(team_names)
+        team_ids = rating_service.seed_order([(team_id, team_names[team_id]) for team_id in candidates])
+    
     if not team_ids:
         return jsonify({'message': 'Team IDs are required'}), 400
     
+    # Calling this again re-seeds the stored bracket in place rather than adding a second one
+    if tournament.type == 'single_elimination':
+        try:
+            report = tournament.reseed_bracket(team_ids)
+        except BracketConflict as e:
+            return jsonify({'message': str(e), 'conflicts': e.conflicts}), 409
+        if report is not None:
+            projected = schedule_service.refresh(tournament.tournament_id)
+            cache_service.invalidate_tournament(tournament.tournament_id, match_ids=list(projected))
+            report['matches'] = [match.to_dict() for match in report['matches']]
+            return jsonify({'message': 'Tournament bracket re-seeded', **report}), 200
+    
+    # Big fields are generated in the background so they don't tie up a worker
+    if data.get('async') or len(team_ids) > Config.BRACKET_ASYNC_THRESHOLD:
+        try:
+            job = job_service.submit('create_bracket', _create_bracket_job, tournament, team_ids)
+        except JobQueueFull as e:
+            return jsonify({'message': str(e)}), 503
+        return jsonify({'message': 'Tournament bracket creation started', 'job': job.to_dict()}), 202
+    
     try:
         matches = tournament.create_bracket(team_ids)
+        schedule_service.refresh(tournament.tournament_id)
+        cache_service.invalidate_tournament(tournament.tournament_id)
         return jsonify({
             'message': 'Tournament bracket created successfully',
             'matches': [match.to_dict() for match in matches]
         }), 201
     except NotImplementedError as e:
         return jsonify({'message': str(e)}), 400
+    except (ValueError, PairingError) as e:
+        return jsonify({'message': str(e)}), 409
     except Exception as e:
         return jsonify({'message': f'Error creating bracket: {str(e)}'}), 500
+
+@tournament_bp.route('/<tournament_id>/rounds', methods=['POST'])
+@require_auth
+def create_tournament_round(tournament_id):
+    """Pair and create the next Swiss round (admin only)"""
+    tournament = Tournament.get(tournament_id)
+    
+    if not tournament:
+        return jsonify({'message': 'Tournament not found'}), 404
+    
+    if tournament.archived:
+        return jsonify({'message': 'Archived tournaments are read-only'}), 409
+    
+    if tournament.type != 'swiss':
+        return jsonify({'message': 'Only Swiss tournaments are played in rounds'}), 400
+    
+    try:
+        matches = tournament.create_swiss_round()
+    except (ValueError, PairingError) as e:
+        return jsonify({'message': str(e)}), 409
+    
+    schedule_service.refresh(tournament.tournament_id)
+    cache_service.invalidate_tournament(tournament.tournament_id)
+    return jsonify({
+        'message': 'Round created successfully',
+        'matches': [match.to_dict() for match in matches]
+    }), 201
+
+@tournament_bp.route('/<tournament_id>/standings', methods=['GET'])
+def get_tournament_standings(tournament_id):
+    """Get the Swiss standings for a tournament"""
+    tournament = Tournament.get(tournament_id)
+    
+    if not tournament:
+        return jsonify({'message': 'Tournament not found'}), 404
+    
+    return jsonify(tournament.get_standings()), 200
+
+def _compact_requested():
+    """Whether ?format=compact asks for the positional bracket form"""
+    bracket_format = request.args.get('format')
+    if bracket_format not in (None, 'compact'):
+        raise ValueError("format must be 'compact' or omitted")
+    return bracket_format == 'compact'
+
+def _create_bracket_job(job, tournament, team_ids):
+    """Background job body for bracket creation"""
+    matches = tournament.create_bracket(team_ids)
+    schedule_service.refresh(tournament.tournament_id)
+    cache_service.invalidate_tournament(tournament.tournament_id)
+    return {'tournament_id': tournament.tournament_id, 'matches': len(matches)}
@@ -0,0 +1,27 @@
+import os
+
+# Gunicorn settings (run with: gunicorn -c gunicorn.conf.py wsgi:app)
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '3'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+# Concurrency per worker. Requests mostly wait on DynamoDB, so 'gthread' with
+# GUNICORN_THREADS > 1 lets each worker serve other requests while one waits;
+# 'sync' handles one request per worker at a time. Gunicorn switches a 'sync'
+# worker to 'gthread' by itself whenever threads > 1. Threaded workers are
+# experimental (see README), so the default stays one synchronous thread.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+# Open connections a threaded worker keeps, idle keep-alives included
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+# Import the app (and botocore's API models) once in the master, so forked
+# workers start with everything loaded instead of paying for it on request one
+preload_app = True
+
+def post_fork(server, worker):
+    """Give each worker its own DynamoDB connection pool and open it before it takes traffic"""
+    from services.db_service import db_service
+    db_service.warm_up()
+    server.log.info(f"Worker {worker.pid} warmed up DynamoDB connections")
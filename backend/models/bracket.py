@@ -0,0 +1,315 @@
+import time
+from functools import lru_cache
+from models.match import Match, assign_positions
+from services.serialization import to_number
+
+@lru_cache(maxsize=None)
+def seed_order(size):
+    """
+    Standard seeded template for a power-of-two field: the seeds in first
+    round order, so 1 meets `size`, and 1 and 2 can only meet in the final.
+    Built by repeatedly pairing each seed s with (2 * current size + 1 - s).
+    """
+    order = (1,)
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = tuple(seed for s in order for seed in (s, total - s))
+    return order
+
+def build_single_elimination(tournament_id, teams, scheduled_time=None):
+    """
+    Build every match of a seeded single elimination bracket in memory.
+    `teams` is a list of (team_id, team_name) in seed order. The field is
+    padded to a power of two with byes for the top seeds, and byes are
+    settled here, so nothing needs a round trip to auto-advance.
+    """
+    num_rounds = max(1, (len(teams) - 1).bit_length())
+    size = 1 << num_rounds
+    now = int(time.time())
+    scheduled_time = scheduled_time or now
+    
+    rounds = {}
+    for round_number in range(num_rounds, 0, -1):
+        width = size >> round_number
+        rounds[round_number] = [
+            Match(
+                tournament_id=tournament_id,
+                scheduled_time=scheduled_time,
+                round_number=round_number,
+                position=position,
+                next_match_id=rounds[round_number + 1][position // 2].match_id if round_number < num_rounds else None
+            )
+            for position in range(width)
+        ]
+    
+    order = seed_order(size)
+    for position, match in enumerate(rounds[1]):
+        for slot, seed in ((1, order[position * 2]), (2, order[position * 2 + 1])):
+            if seed <= len(teams):
+                team_id, team_name = teams[seed - 1]
+                match.place_team(team_id, team_name, seed, slot=slot)
+        
+        # Seeds past the field are byes; the opponent goes straight through
+        if not match.team2_id:
+            match.status = 'completed'
+            match.score_team1, match.score_team2 = 1, 0
+            match.completed_at = now
+            if num_rounds > 1:
+                parent = rounds[2][position // 2]
+                parent.place_team(match.team1_id, match.team1_name, match.team1_seed, slot=position % 2 + 1)
+    
+    return [match for round_number in sorted(rounds) for match in rounds[round_number]]
+
+# Bracket slot fields a re-seed may rewrite (courts and times stay as assigned)
+SEEDING_FIELDS = ('team1_id', 'team2_id', 'team1_name', 'team2_name', 'team1_seed', 'team2_seed',
+                  'status', 'score_team1', 'score_team2', 'next_match_id')
+
+class BracketConflict(ValueError):
+    """Raised when a re-seed would move teams out of matches that have already started"""
+    
+    def __init__(self, conflicts):
+        super().__init__("The new seeding changes matches that have already started")
+        self.conflicts = conflicts
+
+def reseed_matches(stored, desired):
+    """
+    Plan a re-seed: diff a freshly built bracket (`desired`) against a
+    tournament's stored matches slot by slot (round, position). Stored
+    matches are updated in place and keep their IDs, and the links of new
+    slots follow them. Every started match must come out the same under the
+    new seeding; otherwise its team would hold a second slot, so the whole
+    re-seed is refused with BracketConflict listing them. Returns
+    {'matches', 'changed', 'created', 'deleted'}; nothing is written here.
+    """
+    # Earlier versions stored a new bracket per call; keep one match per slot, a started one if any
+    slots = {}
+    for match in stored:
+        slots.setdefault((int(match.round_number), int(match.position)), []).append(match)
+    kept, extras = {}, []
+    for slot, matches in slots.items():
+        matches.sort(key=lambda match: (not _started(match), match.match_id))
+        kept[slot] = matches[0]
+        extras.extend(matches[1:])
+    
+    wanted = {(match.round_number, match.position): match for match in desired}
+    
+    # Slots in both brackets keep their stored IDs, and the links between them follow
+    ids = {match.match_id: kept[slot].match_id for slot, match in wanted.items() if slot in kept}
+    for match in desired:
+        match.next_match_id = ids.get(match.next_match_id, match.next_match_id)
+    for match in desired:
+        match.match_id = ids.get(match.match_id, match.match_id)
+    
+    # Round by round, so a kept result is carried up before its parent slot is compared
+    conflicts = []
+    for slot in sorted(wanted):
+        match, want = kept.get(slot), wanted[slot]
+        if match is None or not _started(match):
+            continue
+        if (match.team1_id, match.team2_id) != (want.team1_id, want.team2_id):
+            conflicts.append(_conflict(match, want))
+            continue
+        for field in SEEDING_FIELDS:
+            if field != 'next_match_id':
+                setattr(want, field, getattr(match, field))
+        parent = wanted.get((slot[0] + 1, slot[1] // 2))
+        if parent is not None:
+            # The slot it feeds holds its winner, or waits for one
+            parent.place_team(*_winner(match), slot=slot[1] % 2 + 1)
+    
+    obsolete = extras + [match for slot, match in kept.items() if slot not in wanted]
+    conflicts.extend(_conflict(match, None) for match in obsolete if _started(match))
+    if conflicts:
+        raise BracketConflict(conflicts)
+    
+    changed, created, matches = [], [], []
+    for slot in sorted(wanted):
+        match, want = kept.get(slot), wanted[slot]
+        if match is None:
+            created.append(want)
+            matches.append(want)
+            continue
+        for field in SEEDING_FIELDS:
+            setattr(match, field, getattr(want, field))
+        if match.status != 'completed':
+            match.completed_at = None
+        elif match.completed_at is None:
+            match.completed_at = want.completed_at
+        if match._change():
+            changed.append(match)
+        matches.append(match)
+    
+    return {'matches': matches, 'changed': changed, 'created': created, 'deleted': obsolete}
+
+def _started(match):
+    """Whether a match has been played (or is being played); byes don't count"""
+    return match.status == 'in_progress' or (match.status == 'completed' and bool(match.team1_id and match.team2_id))
+
+def _winner(match):
+    """(team_id, team_name, seed) of a completed match's winner, or Nones while it's undecided"""
+    if match.status != 'completed':
+        return None, None, None
+    if match.score_team1 > match.score_team2:
+        return match.team1_id, match.team1_name, match.team1_seed
+    return match.team2_id, match.team2_name, match.team2_seed
+
+def _conflict(match, want):
+    """Report entry for a started match the new seeding would change (or drop)"""
+    return {
+        'match_id': match.match_id,
+        'round_number': match.round_number,
+        'position': match.position,
+        'status': match.status,
+        'teams': [match.team1_id, match.team2_id],
+        'seeded_teams': None if want is None else [want.team1_id, want.team2_id]
+    }
+
+class BracketMatch:
+    """Lightweight match record held in a bracket slot (numbers converted from Decimal once, here)"""
+    __slots__ = ('match_id', 'tournament_id', 'team1_id', 'team2_id', 'score_team1', 'score_team2',
+                 'status', 'court', 'scheduled_time', 'next_match_id', 'round_number', 'position',
+                 'team1_name', 'team2_name', 'team1_seed', 'team2_seed', 'completed_at', 'started_at',
+                 'projected_time')
+
+    def __init__(self, item):
+        self.match_id = item.get('match_id')
+        self.tournament_id = item.get('tournament_id')
+        self.team1_id = item.get('team1_id')
+        self.team2_id = item.get('team2_id')
+        self.score_team1 = to_number(item.get('score_team1', 0))
+        self.score_team2 = to_number(item.get('score_team2', 0))
+        self.status = item.get('status', 'scheduled')
+        self.court = item.get('court')
+        self.scheduled_time = to_number(item.get('scheduled_time'))
+        self.next_match_id = item.get('next_match_id')
+        self.round_number = None if item.get('round_number') is None else int(item['round_number'])
+        self.position = None if item.get('position') is None else int(item['position'])
+        self.team1_name = item.get('team1_name')
+        self.team2_name = item.get('team2_name')
+        self.team1_seed = to_number(item.get('team1_seed'))
+        self.team2_seed = to_number(item.get('team2_seed'))
+        self.completed_at = to_number(item.get('completed_at'))
+        self.started_at = to_number(item.get('started_at'))
+        self.projected_time = to_number(item.get('projected_time')) or self.scheduled_time
+
+    def to_dict(self):
+        """Convert the record to a response dictionary"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_list(self):
+        """The record's values in __slots__ order, for the compact bracket form"""
+        return [getattr(self, field) for field in self.__slots__]
+
+class Bracket:
+    """
+    Single elimination bracket stored as a heap-ordered array: the final sits
+    at index 1, and the match at index i is fed by the matches at 2i and 2i+1.
+    Round r, position p lives at index 2**(num_rounds - r) + p.
+    """
+    __slots__ = ('num_rounds', 'slots', 'unplaced')
+
+    def __init__(self, num_rounds):
+        self.num_rounds = num_rounds
+        self.slots = [None] * (1 << num_rounds)
+        self.unplaced = []  # Matches without a valid, free slot
+
+    @classmethod
+    def from_items(cls, items, tree=True):
+        """
+        Build a bracket straight from stored match items. With tree=False
+        (Swiss rounds, which don't feed into each other) every match is kept
+        as a plain per-round list instead.
+        """
+        if not tree:
+            bracket = cls(0)
+            bracket.unplaced = [BracketMatch(item) for item in items]
+            return bracket
+        
+        items = assign_positions(items)
+        rounds = [int(item['round_number']) for item in items if item.get('round_number') is not None]
+        bracket = cls(max(rounds) if rounds else 0)
+
+        for item in items:
+            bracket.place(BracketMatch(item))
+        return bracket
+
+    def place(self, match):
+        """Put a match record into its slot"""
+        index = None
+        if match.round_number is not None and match.position is not None:
+            index = self.index_of(match.round_number, match.position)
+
+        if index is None or self.slots[index] is not None:
+            self.unplaced.append(match)
+        else:
+            self.slots[index] = match
+
+    def index_of(self, round_number, position):
+        """Array index for a round and position, or None if it's outside the bracket"""
+        if not 1 <= round_number <= self.num_rounds:
+            return None
+        width = 1 << (self.num_rounds - round_number)
+        if not 0 <= position < width:
+            return None
+        return width + position
+
+    def round_of(self, index):
+        """Round number of the match at an index"""
+        return self.num_rounds - (index.bit_length() - 1)
+
+    @staticmethod
+    def parent(index):
+        """Index of the match the winner of this one advances to"""
+        return index >> 1
+
+    @staticmethod
+    def children(index):
+        """Indexes of the two matches feeding this one"""
+        return index << 1, (index << 1) + 1
+
+    def get(self, index):
+        """Match record at an index, if any"""
+        if 0 < index < len(self.slots):
+            return self.slots[index]
+        return None
+
+    def grouped(self):
+        """(round number, match records) pairs, each round in true bracket order"""
+        extra = {}
+        unplaced = sorted(self.unplaced, key=lambda match: (match.position is None, match.position or 0))
+        for match in unplaced:
+            extra.setdefault(match.round_number, []).append(match)
+
+        result = []
+        for round_number in range(1, self.num_rounds + 1):
+            width = 1 << (self.num_rounds - round_number)
+            matches = [match for match in self.slots[width:width * 2] if match is not None]
+            matches.extend(extra.pop(round_number, []))
+            if matches:
+                result.append((round_number, matches))
+
+        # Anything that didn't fit the tree still gets returned after it
+        for round_number in sorted(extra, key=lambda r: (r is None, r or 0)):
+            result.append((round_number, extra[round_number]))
+        return result
+
+    def rounds(self):
+        """Matches grouped by round, each round in true bracket order"""
+        return [
+            {'round': round_number, 'matches': [match.to_dict() for match in matches]}
+            for round_number, matches in self.grouped()
+        ]
+
+    def compact(self):
+        """
+        The same rounds in positional form: field names once, then each match
+        as a plain array of values in that order. Roughly half the bytes of
+        rounds(), and cheaper to build and to encode.
+        """
+        return {
+            'fields': BracketMatch.__slots__,
+            'rounds': [
+                {'round': round_number, 'matches': [match.to_list() for match in matches]}
+                for round_number, matches in self.grouped()
+            ]
+        }
@@ -0,0 +1,98 @@
+import uuid
+import time
+from services.db_service import db_service
+from services.serialization import to_dynamo
+
+class Job:
+    # Don't write progress more often than this (seconds) unless it's done
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, job_id=None, job_type=None, status='queued', progress=0,
+                 result=None, error=None, created_at=None, updated_at=None):
+        self.job_id = job_id or str(uuid.uuid4())
+        self.job_type = job_type
+        self.status = status  # 'queued', 'running', 'completed', 'failed'
+        self.progress = progress  # 0-100
+        self.result = result
+        self.error = error
+        self.created_at = created_at or int(time.time())
+        self.updated_at = updated_at or self.created_at
+        self._last_progress_write = 0
+
+    @classmethod
+    def create(cls, job_type):
+        """Create a new queued job"""
+        job = cls(job_type=job_type)
+        db_service.jobs_table.put_item(Item=job.to_dict())
+        return job
+
+    @classmethod
+    def get(cls, job_id):
+        """Get a job by ID"""
+        response = db_service.jobs_table.get_item(
+            Key={'job_id': job_id},
+            ConsistentRead=True
+        )
+
+        item = response.get('Item')
+        if not item:
+            return None
+
+        return cls(
+            job_id=item.get('job_id'),
+            job_type=item.get('job_type'),
+            status=item.get('status', 'queued'),
+            progress=item.get('progress', 0),
+            result=item.get('result'),
+            error=item.get('error'),
+            created_at=item.get('created_at'),
+            updated_at=item.get('updated_at')
+        )
+
+    def mark_running(self):
+        """Record that a worker picked the job up"""
+        self._set(status='running')
+
+    def set_progress(self, progress):
+        """Record progress (0-100), throttled to one write per PROGRESS_INTERVAL"""
+        self.progress = max(0, min(100, int(progress)))
+        now = time.time()
+        if now - self._last_progress_write >= self.PROGRESS_INTERVAL:
+            self._last_progress_write = now
+            self._set(progress=self.progress)
+
+    def complete(self, result=None):
+        """Record a successful finish"""
+        self._set(status='completed', progress=100, result=to_dynamo(result))
+
+    def fail(self, error):
+        """Record a failure"""
+        self._set(status='failed', error=str(error))
+
+    def _set(self, **fields):
+        """Update some attributes of the stored job"""
+        fields['updated_at'] = int(time.time())
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        names = {f'#{name}': name for name in fields}
+        values = {f':{name}': value for name, value in fields.items()}
+        db_service.jobs_table.update_item(
+            Key={'job_id': self.job_id},
+            UpdateExpression='SET ' + ', '.join(f'#{name} = :{name}' for name in fields),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'job_id': self.job_id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
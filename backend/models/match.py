@@ -1,12 +1,25 @@
 import uuid
 import time
+from collections import defaultdict
 from services.db_service import db_service
-from boto3.dynamodb.conditions import Key
+from services import single_table
+from services.field_projection import projection_kwargs, project
+from services.rating_service import rating_service
+from services.change_log import change_log, UPDATES_PER_TRANSACTION
+from boto3.dynamodb.conditions import Attr, Key
 
 class Match:
+    # Attributes a caller can ask for with ?fields=
+    FIELDS = ('match_id', 'tournament_id', 'team1_id', 'team2_id', 'score_team1', 'score_team2',
+              'status', 'court', 'scheduled_time', 'next_match_id', 'round_number', 'position',
+              'team1_name', 'team2_name', 'team1_seed', 'team2_seed', 'completed_at', 'started_at',
+              'projected_time')
+    
     def __init__(self, match_id=None, tournament_id=None, team1_id=None, team2_id=None, 
                  score_team1=0, score_team2=0, status='scheduled', court=None, 
-                 scheduled_time=None, next_match_id=None, round_number=None):
+                 scheduled_time=None, next_match_id=None, round_number=None, position=None,
+                 team1_name=None, team2_name=None, team1_seed=None, team2_seed=None,
+                 completed_at=None, started_at=None, projected_time=None):
         self.match_id = match_id or str(uuid.uuid4())
         self.tournament_id = tournament_id
         self.team1_id = team1_id
@@ -18,10 +31,21 @@ class Match:
         self.scheduled_time = scheduled_time or int(time.time())
         self.next_match_id = next_match_id
         self.round_number = round_number
+        self.position = position  # Index within the round, in bracket order
+        # Denormalised from the teams so bracket reads need no team lookups
+        self.team1_name = team1_name
+        self.team2_name = team2_name
+        self.team1_seed = team1_seed
+        self.team2_seed = team2_seed
+        self.completed_at = completed_at
+        self.started_at = started_at
+        # Expected start given how play is running (see schedule_service); None until it's computed
+        self.projected_time = projected_time
+        self._stored = None  # Fields as last read or written, to log only what changed
     
     @classmethod
     def create(cls, tournament_id, team1_id=None, team2_id=None, court=None, 
-               scheduled_time=None, next_match_id=None, round_number=None):
+               scheduled_time=None, next_match_id=None, round_number=None, position=None):
         """Create a new match"""
         match = cls(
             tournament_id=tournament_id,
@@ -30,73 +54,173 @@ class Match:
             court=court,
             scheduled_time=scheduled_time,
             next_match_id=next_match_id,
-            round_number=round_number
+            round_number=round_number,
+            position=position
         )
         
-        # Save to DynamoDB
-        db_service.matches_table.put_item(Item=match.to_dict())
+        # Save to DynamoDB; the same transaction tells pollers to reload, since they don't know the match yet
+        change_log.write(tournament_id, [{'Put': {'TableName': cls._table().name, 'Item': match._to_item()}}],
+                         [{'resync': True}])
+        match._stored = match.to_dict()
         return match
     
     @classmethod
-    def get(cls, match_id):
-        """Get a match by ID"""
-        response = db_service.matches_table.get_item(
-            Key={'match_id': match_id}
+    def from_item(cls, item):
+        """Build a match from a stored item, ignoring storage-only attributes"""
+        match = cls(
+            match_id=item.get('match_id'),
+            tournament_id=item.get('tournament_id'),
+            team1_id=item.get('team1_id'),
+            team2_id=item.get('team2_id'),
+            score_team1=item.get('score_team1', 0),
+            score_team2=item.get('score_team2', 0),
+            status=item.get('status', 'scheduled'),
+            court=item.get('court'),
+            scheduled_time=item.get('scheduled_time'),
+            next_match_id=item.get('next_match_id'),
+            round_number=item.get('round_number'),
+            position=item.get('position'),
+            team1_name=item.get('team1_name'),
+            team2_name=item.get('team2_name'),
+            team1_seed=item.get('team1_seed'),
+            team2_seed=item.get('team2_seed'),
+            completed_at=item.get('completed_at'),
+            started_at=item.get('started_at'),
+            projected_time=item.get('projected_time')
         )
+        match._stored = match.to_dict()
+        return match
+    
+    @classmethod
+    def get(cls, match_id, tournament_id=None):
+        """Get a match by ID; with its tournament_id the single-table read is strongly consistent"""
+        if db_service.single_table_enabled:
+            item = single_table.get_by_entity_id(match_id, tournament_id)
+        else:
+            response = db_service.matches_table.get_item(
+                Key={'match_id': match_id}
+            )
+            item = response.get('Item')
         
-        item = response.get('Item')
         if not item:
             return None
             
-        return cls(**item)
+        return cls.from_item(item)
     
     @classmethod
     def get_by_tournament_status(cls, tournament_id, status=None):
         """Get matches for a tournament, optionally filtered by status"""
+        return [cls.from_item(item) for item in cls.query_items(tournament_id, status)]
+    
+    @classmethod
+    def get_fields_by_tournament_status(cls, fields, tournament_id, status=None):
+        """Get only the given attributes of a tournament's matches, as plain dicts"""
+        if 'projected_time' not in fields:
+            return project(cls.query_items(tournament_id, status, **projection_kwargs(fields)), fields)
+        
+        # A match not projected yet is expected on time, as in to_dict
+        items = cls.query_items(tournament_id, status, **projection_kwargs([*fields, 'scheduled_time']))
+        for item in items:
+            if item.get('projected_time') is None:
+                item['projected_time'] = item.get('scheduled_time')
+        return project(items, fields)
+    
+    @classmethod
+    def get_court_queue(cls, tournament_id, court, limit=3):
+        """The next unfinished matches on a court, in schedule order (one bounded query)"""
+        response = cls._table().query(
+            IndexName=db_service.COURT_SCHEDULE_INDEX,
+            KeyConditionExpression=Key('tournament_court').eq(court_key(tournament_id, court)),
+            Limit=limit
+        )
+        return [cls.from_item(item) for item in response.get('Items', [])]
+    
+    @classmethod
+    def get_live(cls):
+        """Scoreboard fields of every match in progress, across all tournaments (one query)"""
+        items = db_service.query_all(
+            cls._table(),
+            IndexName=db_service.LIVE_MATCHES_INDEX,
+            KeyConditionExpression=Key('live_partition').eq(LIVE_PARTITION)
+        )
+        items.sort(key=lambda item: (item.get('tournament_id') or '', str(item.get('court') or ''), item.get('match_id')))
+        return project(items, db_service.LIVE_MATCH_FIELDS)
+    
+    @classmethod
+    def query_items(cls, tournament_id, status=None, **kwargs):
+        """Get the raw stored items for a tournament's matches, optionally filtered by status"""
         try:
-            if status:
+            if db_service.single_table_enabled:
+                # One consistent query over the tournament partition, ordered by round/position
+                if status:
+                    kwargs['FilterExpression'] = Attr('status').eq(status)
+                return single_table.query_partition(tournament_id, single_table.MATCH_PREFIX, **kwargs)
+            elif status:
                 # Use the TournamentStatusIndex when filtering by both tournament and status
-                response = db_service.matches_table.query(
+                return db_service.query_all(
+                    db_service.matches_table,
                     IndexName='TournamentStatusIndex',
                     KeyConditionExpression=Key('tournament_id').eq(tournament_id) & 
-                                          Key('status').eq(status)
+                                          Key('status').eq(status),
+                    **kwargs
                 )
             else:
                 # Use the TournamentMatchesIndex when filtering only by tournament
-                response = db_service.matches_table.query(
+                return db_service.query_all(
+                    db_service.matches_table,
                     IndexName='TournamentMatchesIndex',
-                    KeyConditionExpression=Key('tournament_id').eq(tournament_id)
+                    KeyConditionExpression=Key('tournament_id').eq(tournament_id),
+                    **kwargs
                 )
-            
-            matches = []
-            for item in response.get('Items', []):
-                # Clean any keys that aren't part of the Match model
-                match_data = {
-                    'match_id': item.get('match_id'),
-                    'tournament_id': item.get('tournament_id'),
-                    'team1_id': item.get('team1_id'),
-                    'team2_id': item.get('team2_id'),
-                    'score_team1': item.get('score_team1', 0),
-                    'score_team2': item.get('score_team2', 0),
-                    'status': item.get('status', 'scheduled'),
-                    'court': item.get('court'),
-                    'scheduled_time': item.get('scheduled_time'),
-                    'next_match_id': item.get('next_match_id'),
-                    'round_number': item.get('round_number')
-                }
-                matches.append(cls(**match_data))
-                
-            return matches
         except Exception as e:
             print(f"Error querying matches: {e}")
             # Fall back to scan if there's an issue with the GSI
             return []
     
+    @classmethod
+    def put_many(cls, matches, deleted=()):
+        """Store many matches (and delete the `deleted` ones) with batched writes"""
+        with cls._table().batch_writer() as writer:
+            for match in matches:
+                writer.put_item(Item=match._to_item())
+                match._stored = match.to_dict()
+            for match in deleted:
+                writer.delete_item(Key=match._key())
+        
+        # Too many writes for one transaction; pollers reload the bracket instead (raises if that can't be logged)
+        for tournament_id in {match.tournament_id for match in [*matches, *deleted]}:
+            change_log.record_resync(tournament_id)
+        return matches
+    
     def update(self):
-        """Update a match"""
-        db_service.matches_table.put_item(Item=self.to_dict())
+        """Update a match, logging the changed fields in the same transaction"""
+        self._save_logged([self])
         return self
     
+    @staticmethod
+    def _save_logged(matches):
+        """Put matches of one tournament together with a change record for each one that changed"""
+        changes = [change for change in (match._change() for match in matches) if change]
+        if not changes:
+            return
+        table_name = Match._table().name
+        change_log.write(
+            matches[0].tournament_id,
+            [{'Put': {'TableName': table_name, 'Item': match._to_item()}} for match in matches],
+            changes
+        )
+        for match in matches:
+            match._stored = match.to_dict()
+    
+    def _change(self):
+        """Change record for the fields modified since the match was read, or None"""
+        stored = self._stored or {}
+        fields = {name: value for name, value in self.to_dict().items()
+                  if name not in stored or stored[name] != value}
+        if not fields:
+            return None
+        return {'match_id': self.match_id, 'fields': fields}
+    
     def update_score(self, score_team1, score_team2):
         """Update match scores and potentially status"""
         self.score_team1 = score_team1
@@ -105,6 +229,7 @@ class Match:
         # If scores are provided, automatically set to in_progress
         if self.status == 'scheduled' and (score_team1 > 0 or score_team2 > 0):
             self.status = 'in_progress'
+            self.started_at = int(time.time())
         
         # Update in DynamoDB
         self.update()
@@ -112,29 +237,118 @@ class Match:
     
     def complete_match(self):
         """Mark match as completed and update next match if applicable"""
+        # Completing again (say, after a score correction) mustn't count the result twice
+        already_completed = self.status == 'completed'
         self.status = 'completed'
-        winner_id = self.team1_id if self.score_team1 > self.score_team2 else self.team2_id
+        if not already_completed or self.completed_at is None:
+            self.completed_at = int(time.time())
+        if self.score_team1 > self.score_team2:
+            winner = (self.team1_id, self.team1_name, self.team1_seed)
+        else:
+            winner = (self.team2_id, self.team2_name, self.team2_seed)
         
         # Update the next match in the bracket if it exists
+        matches = [self]
         if self.next_match_id:
-            next_match = Match.get(self.next_match_id)
+            next_match = Match.get(self.next_match_id, self.tournament_id)
             if next_match:
-                # Assuming first empty slot gets filled first
-                if not next_match.team1_id:
-                    next_match.team1_id = winner_id
-                elif not next_match.team2_id:
-                    next_match.team2_id = winner_id
-                next_match.update()
+                # Even positions feed the top slot, odd ones the bottom; older matches fill the first free slot
+                slot = None if self.position is None else int(self.position) % 2 + 1
+                next_match.place_team(*winner, slot=slot)
+                matches.append(next_match)
         
-        # Update this match status
-        self.update()
+        # The result and the advancing team are written (and logged) together
+        self._save_logged(matches)
+        
+        # Ratings are best effort; record_result logs rather than raises
+        if not already_completed:
+            rating_service.record_result(self)
         return self
     
+    def place_team(self, team_id, team_name=None, seed=None, slot=None):
+        """Put a team (with its display name and seed) into a slot, or the first empty one"""
+        if slot is None:
+            slot = 1 if not self.team1_id else 2 if not self.team2_id else None
+        if slot == 1:
+            self.team1_id, self.team1_name, self.team1_seed = team_id, team_name, seed
+        elif slot == 2:
+            self.team2_id, self.team2_name, self.team2_seed = team_id, team_name, seed
+        return self
+    
+    @classmethod
+    def rename_team(cls, tournament_id, team_id, team_name):
+        """
+        Rewrite a team's denormalised name on every match it appears in.
+        Conditional updates touch only the name, so concurrent score writes
+        to the same matches aren't overwritten; each one is logged. They go
+        out in transactions of up to UPDATES_PER_TRANSACTION updates.
+        """
+        table_name = cls._table().name
+        updates = []
+        for item in cls.query_items(tournament_id):
+            match = cls.from_item(item)
+            for slot in ('team1', 'team2'):
+                if getattr(match, f'{slot}_id') != team_id or getattr(match, f'{slot}_name') == team_name:
+                    continue
+                updates.append(({'Update': {
+                    'TableName': table_name,
+                    'Key': match._key(),
+                    'UpdateExpression': f'SET {slot}_name = :name',
+                    'ConditionExpression': f'{slot}_id = :team_id',
+                    'ExpressionAttributeValues': {':name': team_name, ':team_id': team_id}
+                }}, {'match_id': match.match_id, 'fields': {f'{slot}_name': team_name}}))
+        
+        client = db_service.dynamodb.meta.client
+        for start in range(0, len(updates), UPDATES_PER_TRANSACTION):
+            chunk = updates[start:start + UPDATES_PER_TRANSACTION]
+            try:
+                change_log.write(tournament_id, [update for update, _ in chunk], [change for _, change in chunk])
+            except client.exceptions.TransactionCanceledException:
+                # A slot changed hands since we read it; write the rest of the chunk one by one, skipping it
+                for update, change in chunk:
+                    try:
+                        change_log.write(tournament_id, [update], [change])
+                    except client.exceptions.TransactionCanceledException:
+                        pass
+    
     def delete(self):
         """Delete a match"""
-        db_service.matches_table.delete_item(
-            Key={'match_id': self.match_id}
-        )
+        self._table().delete_item(Key=self._key())
+    
+    @staticmethod
+    def _table():
+        """Table holding match items for the configured layout"""
+        if db_service.single_table_enabled:
+            return db_service.single_table
+        return db_service.matches_table
+    
+    def _key(self):
+        """Primary key of this match for the configured layout"""
+        if db_service.single_table_enabled:
+            return {
+                'PK': single_table.tournament_pk(self.tournament_id),
+                'SK': single_table.match_sk(self.round_number, self.position, self.match_id)
+            }
+        return {'match_id': self.match_id}
+    
+    def _to_item(self):
+        """Convert match to the item stored in DynamoDB"""
+        item = self.to_dict()
+        # Only a computed projection is stored; readers fall back to the scheduled time
+        item['projected_time'] = self.projected_time
+        
+        # Index key for the court display boards; left off once the match is over
+        if self.court not in (None, '') and self.status != 'completed' and self.scheduled_time is not None:
+            item['tournament_court'] = court_key(self.tournament_id, self.court)
+        
+        # Index key for the live feed; present only while the match is being played
+        if self.status == 'in_progress':
+            item['live_partition'] = LIVE_PARTITION
+        
+        if db_service.single_table_enabled:
+            key = self._key()
+            return single_table.to_item(item, key['PK'], key['SK'], 'match', self.match_id)
+        return item
     
     def to_dict(self):
         """Convert match to dictionary"""
@@ -149,5 +363,60 @@ class Match:
             'court': self.court,
             'scheduled_time': self.scheduled_time,
             'next_match_id': self.next_match_id,
-            'round_number': self.round_number
+            'round_number': self.round_number,
+            'position': self.position,
+            'team1_name': self.team1_name,
+            'team2_name': self.team2_name,
+            'team1_seed': self.team1_seed,
+            'team2_seed': self.team2_seed,
+            'completed_at': self.completed_at,
+            'started_at': self.started_at,
+            'projected_time': self.projected_time if self.projected_time is not None else self.scheduled_time
         }
+
+# The one LiveMatchesIndex partition every live match is written to
+LIVE_PARTITION = 'live'
+
+def court_key(tournament_id, court):
+    """Partition key of a court in CourtScheduleIndex"""
+    return f'{tournament_id}#{court}'
+
+def assign_positions(items):
+    """
+    Fill in missing bracket positions on match items (dicts) using their
+    next_match_id links. Matches that predate positions were created parent
+    first, so sibling order can't be recovered exactly; ties fall back to
+    scheduled time and match ID.
+    """
+    if all(item.get('position') is not None for item in items if item.get('round_number') is not None):
+        return items
+    
+    by_id = {item['match_id']: item for item in items}
+    children = defaultdict(list)
+    roots = defaultdict(list)
+    for item in items:
+        if item.get('round_number') is None:
+            continue
+        parent_id = item.get('next_match_id')
+        if parent_id in by_id:
+            children[parent_id].append(item)
+        else:
+            roots[item['round_number']].append(item)
+    
+    def order(item):
+        return (item.get('scheduled_time') or 0, item['match_id'])
+    
+    # Walk down from the final so every child lands at 2p / 2p+1 under its parent
+    pending = []
+    for round_number in sorted(roots, reverse=True):
+        for position, item in enumerate(sorted(roots[round_number], key=order)):
+            item['position'] = position
+            pending.append(item)
+    
+    while pending:
+        parent = pending.pop()
+        for offset, child in enumerate(sorted(children[parent['match_id']], key=order)):
+            child['position'] = int(parent['position']) * 2 + offset
+            pending.append(child)
+    
+    return items
@@ -0,0 +1,124 @@
+import re
+import time
+from decimal import Decimal
+from services.db_service import db_service
+from config import Config
+
+def team_identity(team_name):
+    """
+    Persistent identity for a team across tournaments. Teams are created per
+    tournament, so the same squad is recognised by its normalised name.
+    """
+    if not team_name:
+        return None
+    return re.sub(r'\s+', ' ', team_name).strip().casefold() or None
+
+class Rating:
+    def __init__(self, identity, display_name=None, rating=None, matches_played=0,
+                 wins=0, losses=0, updated_at=None):
+        self.identity = identity
+        self.display_name = display_name or identity
+        self.rating = float(rating) if rating is not None else Config.RATING_INITIAL
+        self.matches_played = int(matches_played)
+        self.wins = int(wins)
+        self.losses = int(losses)
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_item(cls, item):
+        """Build a rating from a stored item"""
+        return cls(
+            identity=item.get('identity'),
+            display_name=item.get('display_name'),
+            rating=item.get('rating'),
+            matches_played=item.get('matches_played', 0),
+            wins=item.get('wins', 0),
+            losses=item.get('losses', 0),
+            updated_at=item.get('updated_at')
+        )
+
+    @classmethod
+    def get(cls, identity):
+        """Get a rating by identity"""
+        response = db_service.ratings_table.get_item(
+            Key={'identity': identity},
+            ConsistentRead=True
+        )
+
+        item = response.get('Item')
+        if not item:
+            return None
+
+        return cls.from_item(item)
+
+    @classmethod
+    def get_many(cls, identities):
+        """Get ratings for several identities at once, keyed by identity"""
+        identities = list(dict.fromkeys(i for i in identities if i))
+        ratings = {}
+        # BatchGetItem takes at most 100 keys per request
+        for start in range(0, len(identities), 100):
+            request = {db_service.RATINGS_TABLE: {
+                'Keys': [{'identity': identity} for identity in identities[start:start + 100]]
+            }}
+            while request:
+                response = db_service.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(db_service.RATINGS_TABLE, []):
+                    ratings[item['identity']] = cls.from_item(item)
+                request = response.get('UnprocessedKeys') or None
+        return ratings
+
+    @classmethod
+    def get_all(cls):
+        """Get every rating, best first"""
+        ratings = [cls.from_item(item) for item in db_service.scan_all(db_service.ratings_table)]
+        ratings.sort(key=lambda rating: rating.rating, reverse=True)
+        return ratings
+
+    @classmethod
+    def save_together(cls, ratings):
+        """
+        Save several ratings in one transaction. `ratings` is a list of
+        (rating, matches_played it was read with): either every rating is
+        written, or, when any of them was updated since it was read, none is.
+        """
+        now = int(time.time())
+        items = []
+        for rating, expected_matches_played in ratings:
+            rating.updated_at = now
+            items.append({'Put': {
+                'TableName': db_service.RATINGS_TABLE,
+                'Item': rating._to_item(),
+                'ConditionExpression': 'attribute_not_exists(#identity) OR matches_played = :played',
+                'ExpressionAttributeNames': {'#identity': 'identity'},
+                'ExpressionAttributeValues': {':played': expected_matches_played}
+            }})
+        db_service.dynamodb.meta.client.transact_write_items(TransactItems=items)
+        return [rating for rating, _ in ratings]
+
+    @classmethod
+    def save_all(cls, ratings):
+        """Write many ratings in batches"""
+        now = int(time.time())
+        with db_service.ratings_table.batch_writer() as writer:
+            for rating in ratings:
+                rating.updated_at = now
+                writer.put_item(Item=rating._to_item())
+
+    def _to_item(self):
+        """Convert rating to the item stored in DynamoDB (which rejects floats)"""
+        item = self.to_dict()
+        item['rating'] = Decimal(str(round(self.rating, 2)))
+        return item
+
+    def to_dict(self):
+        """Convert rating to dictionary"""
+        return {
+            'identity': self.identity,
+            'display_name': self.display_name,
+            'rating': round(self.rating, 2),
+            'matches_played': self.matches_played,
+            'wins': self.wins,
+            'losses': self.losses,
+            'updated_at': self.updated_at
+        }
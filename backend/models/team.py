@@ -1,8 +1,16 @@
 import uuid
 from services.db_service import db_service
+from services.job_service import job_service, JobQueueFull
+from services import single_table
+from services.field_projection import projection_kwargs, project
+from services.search_service import team_search
+from models.match import Match
 from boto3.dynamodb.conditions import Attr, Key
 
 class Team:
+    # Attributes a caller can ask for with ?fields=
+    FIELDS = ('team_id', 'team_name', 'tournament_id', 'players')
+    
     def __init__(self, team_id=None, team_name=None, tournament_id=None, players=None):
         self.team_id = team_id or str(uuid.uuid4())
         self.team_name = team_name
@@ -20,74 +28,115 @@ class Team:
             players=players or []
         )
         
-        # Create the item with team_id as the primary key
-        item = {
-            'team_id': team_id,
-            'team_name': team_name,
-            'tournament_id': tournament_id,
-            'players': players or []
-        }
-        
-        db_service.teams_table.put_item(Item=item)
+        team._table().put_item(Item=team._to_item())
+        team_search.add(team)
         return team
     
     @classmethod
-    def get(cls, team_id):
-        """Get a team by ID"""
-        response = db_service.teams_table.get_item(
-            Key={'team_id': team_id}
-        )
+    def get(cls, team_id, tournament_id=None):
+        """Get a team by ID; with its tournament_id the single-table read is strongly consistent"""
+        if db_service.single_table_enabled and tournament_id is not None:
+            response = db_service.single_table.get_item(
+                Key={'PK': single_table.tournament_pk(tournament_id), 'SK': single_table.team_sk(team_id)},
+                ConsistentRead=True
+            )
+            item = response.get('Item')
+        elif db_service.single_table_enabled:
+            item = single_table.get_by_entity_id(team_id)
+        else:
+            response = db_service.teams_table.get_item(
+                Key={'team_id': team_id}
+            )
+            item = response.get('Item')
         
-        item = response.get('Item')
         if not item:
             return None
             
-        return cls(**item)
+        return cls.from_item(item)
+    
+    @classmethod
+    def from_item(cls, item):
+        """Build a team from a stored item, ignoring storage-only attributes"""
+        return cls(
+            team_id=item.get('team_id'),
+            team_name=item.get('team_name'),
+            tournament_id=item.get('tournament_id'),
+            players=item.get('players', [])
+        )
     
     @classmethod
     def get_all(cls, tournament_id=None):
         """Get all teams, optionally filtered by tournament_id"""
-        if tournament_id:
+        return [cls.from_item(item) for item in cls.query_items(tournament_id)]
+    
+    @classmethod
+    def get_all_fields(cls, fields, tournament_id=None):
+        """Get only the given attributes of each team, as plain dicts"""
+        return project(cls.query_items(tournament_id, **projection_kwargs(fields)), fields)
+    
+    @classmethod
+    def query_items(cls, tournament_id=None, **kwargs):
+        """Get the raw stored team items, optionally filtered by tournament_id"""
+        if db_service.single_table_enabled:
+            if tournament_id:
+                return single_table.query_partition(tournament_id, single_table.TEAM_PREFIX, **kwargs)
+            return single_table.scan_entities('team', **kwargs)
+        elif tournament_id:
             # Use the global secondary index for efficient queries by tournament_id
-            response = db_service.teams_table.query(
+            return db_service.query_all(
+                db_service.teams_table,
                 IndexName='TournamentTeamsIndex',
-                KeyConditionExpression=Key('tournament_id').eq(tournament_id)
+                KeyConditionExpression=Key('tournament_id').eq(tournament_id),
+                **kwargs
             )
         else:
             # Scan for all teams
-            response = db_service.teams_table.scan()
-        
-        teams = []
-        for item in response.get('Items', []):
-            # Clean any keys that aren't part of the Team model
-            team_data = {
-                'team_id': item.get('team_id'),
-                'team_name': item.get('team_name'),
-                'tournament_id': item.get('tournament_id'),
-                'players': item.get('players', [])
-            }
-            teams.append(cls(**team_data))
-            
-        return teams
+            return db_service.scan_all(db_service.teams_table, **kwargs)
     
     @classmethod
     def update(cls, team):
         """Update a team"""
-        item = {
-            'team_id': team.team_id,
-            'team_name': team.team_name,
-            'tournament_id': team.tournament_id,
-            'players': team.players
-        }
+        response = team._table().put_item(Item=team._to_item(), ReturnValues='ALL_OLD')
+        team_search.add(team)
+        
+        # Matches carry a copy of the team name; fan renames out in the background
+        old_name = response.get('Attributes', {}).get('team_name')
+        if old_name is not None and old_name != team.team_name:
+            args = (team.tournament_id, team.team_id, team.team_name)
+            try:
+                job_service.submit('rename_team', lambda job: Match.rename_team(*args))
+            except JobQueueFull:
+                Match.rename_team(*args)
         
-        db_service.teams_table.put_item(Item=item)
         return team
     
     def delete(self):
         """Delete a team"""
-        db_service.teams_table.delete_item(
-            Key={'team_id': self.team_id}
-        )
+        self._table().delete_item(Key=self._key())
+        team_search.remove(self.team_id)
+    
+    @staticmethod
+    def _table():
+        """Table holding team items for the configured layout"""
+        if db_service.single_table_enabled:
+            return db_service.single_table
+        return db_service.teams_table
+    
+    def _key(self):
+        """Primary key of this team for the configured layout"""
+        if db_service.single_table_enabled:
+            return {
+                'PK': single_table.tournament_pk(self.tournament_id),
+                'SK': single_table.team_sk(self.team_id)
+            }
+        return {'team_id': self.team_id}
+    
+    def _to_item(self):
+        """Convert team to the item stored in DynamoDB"""
+        if db_service.single_table_enabled:
+            key = self._key()
+            return single_table.to_item(self.to_dict(), key['PK'], key['SK'], 'team', self.team_id)
+        return self.to_dict()
     
     def to_dict(self):
         """Convert team to dictionary"""
@@ -1,10 +1,26 @@
 import uuid
 import time
+import logging
 from services.db_service import db_service
-from models.match import Match
+from services import single_table
+from services.field_projection import projection_kwargs, project
+from services import swiss
+from services.change_log import change_log
+from services.search_service import team_search
+from services.archive_service import archive_service
+from services.export_service import SINGLE_TABLE_KEYS, INDEX_KEYS
+from services.change_log import UPDATES_PER_TRANSACTION
+from models.match import Match, assign_positions
+from models.bracket import Bracket, build_single_elimination, reseed_matches
+from models.team import Team
 from boto3.dynamodb.conditions import Attr
 
+logger = logging.getLogger(__name__)
+
 class Tournament:
+    # Attributes a caller can ask for with ?fields=
+    FIELDS = ('tournament_id', 'name', 'start_date', 'end_date', 'location', 'status', 'type')
+    
     def __init__(self, tournament_id=None, name=None, start_date=None, end_date=None,
                  location=None, status='upcoming', type='single_elimination'):
         self.tournament_id = tournament_id or str(uuid.uuid4())
@@ -13,7 +29,13 @@ class Tournament:
         self.end_date = end_date
         self.location = location
         self.status = status  # 'upcoming', 'in_progress', 'completed'
-        self.type = type  # 'single_elimination', 'double_elimination', 'round_robin'
+        self.type = type  # 'single_elimination', 'swiss', 'double_elimination', 'round_robin'
+        self.archive_record = None  # Set when loaded from the cold archive (read-only)
+    
+    @property
+    def archived(self):
+        """Whether this tournament was loaded from the archive"""
+        return self.archive_record is not None
     
     @classmethod
     def create(cls, tournament):
@@ -21,189 +43,361 @@ class Tournament:
         tournament_id = str(uuid.uuid4())
         tournament.tournament_id = tournament_id
         
-        # Create item with tournament_id as the primary key
-        item = {
-            'tournament_id': tournament_id,
-            'name': tournament.name,
-            'start_date': tournament.start_date,
-            'end_date': tournament.end_date,
-            'location': tournament.location,
-            'type': tournament.type,
-            'status': tournament.status
-        }
-        
-        db_service.tournaments_table.put_item(Item=item)
+        tournament._table().put_item(Item=tournament._to_item())
         return tournament
 
     @classmethod
     def get(cls, tournament_id):
         """Get a tournament by ID"""
-        response = db_service.tournaments_table.get_item(
-            Key={
-                'tournament_id': tournament_id
-            }
-        )
+        if db_service.single_table_enabled:
+            response = db_service.single_table.get_item(
+                Key={
+                    'PK': single_table.tournament_pk(tournament_id),
+                    'SK': single_table.META_SK
+                },
+                ConsistentRead=True
+            )
+        else:
+            response = db_service.tournaments_table.get_item(
+                Key={
+                    'tournament_id': tournament_id
+                }
+            )
         
         item = response.get('Item')
         if not item:
+            return cls.get_archived(tournament_id)
+        
+        return cls.from_item(item)
+    
+    @classmethod
+    def get_archived(cls, tournament_id):
+        """Get a tournament from the cold archive, or None"""
+        record = archive_service.get(tournament_id)
+        if not record:
             return None
+        tournament = cls.from_item(record['tournament'])
+        tournament.archive_record = record
+        return tournament
+    
+    @classmethod
+    def from_item(cls, item):
+        """Build a tournament from a stored item, ignoring storage-only attributes"""
+        return cls(
+            tournament_id=item.get('tournament_id'),
+            name=item.get('name'),
+            start_date=item.get('start_date'),
+            end_date=item.get('end_date'),
+            location=item.get('location'),
+            type=item.get('type'),
+            status=item.get('status')
+        )
+    
+    @classmethod
+    def get_full(cls, tournament_id):
+        """
+        Get a tournament with its teams and bracket. In the single-table layout
+        this is one strongly consistent query, already ordered by round/position.
+        """
+        if not db_service.single_table_enabled:
+            tournament = cls.get(tournament_id)
+            if not tournament:
+                return None, [], None
+            return tournament, tournament._teams(), tournament._bracket(tournament._match_items())
+        
+        tournament, teams, match_items = None, [], []
+        for item in single_table.query_partition(tournament_id):
+            entity_type = item.get('entity_type')
+            if entity_type == 'tournament':
+                tournament = cls.from_item(item)
+            elif entity_type == 'team':
+                teams.append(Team.from_item(item))
+            elif entity_type == 'match':
+                match_items.append(item)
         
-        return cls(**item)
+        if not tournament:
+            tournament = cls.get_archived(tournament_id)
+            if not tournament:
+                return None, [], None
+            return tournament, tournament._teams(), tournament._bracket(tournament._match_items())
+        return tournament, teams, tournament._bracket(match_items)
 
     @classmethod
     def get_all(cls):
         """Get all tournaments"""
-        response = db_service.tournaments_table.scan()
-        
-        tournaments = []
-        for item in response.get('Items', []):
-            # Clean any keys that aren't part of the Tournament model
-            tournament_data = {
-                'tournament_id': item.get('tournament_id'),
-                'name': item.get('name'),
-                'start_date': item.get('start_date'),
-                'end_date': item.get('end_date'),
-                'location': item.get('location'),
-                'type': item.get('type'),
-                'status': item.get('status')
-            }
-            tournaments.append(cls(**tournament_data))
-            
-        return tournaments
+        return [cls.from_item(item) for item in cls.scan_items()]
+    
+    @classmethod
+    def get_all_fields(cls, fields):
+        """Get only the given attributes of each tournament, as plain dicts"""
+        return project(cls.scan_items(**projection_kwargs(fields)), fields)
+    
+    @classmethod
+    def scan_items(cls, **kwargs):
+        """Get the raw stored tournament items"""
+        if db_service.single_table_enabled:
+            return single_table.scan_entities('tournament', **kwargs)
+        return db_service.scan_all(db_service.tournaments_table, **kwargs)
 
     @classmethod
     def update(cls, tournament):
         """Update a tournament"""
-        item = {
-            'tournament_id': tournament.tournament_id,
-            'name': tournament.name,
-            'start_date': tournament.start_date,
-            'end_date': tournament.end_date,
-            'location': tournament.location,
-            'type': tournament.type,
-            'status': tournament.status
-        }
-        
-        db_service.tournaments_table.put_item(Item=item)
+        tournament._table().put_item(Item=tournament._to_item())
         return tournament
     
     def delete(self):
-        """Delete a tournament and optionally clean up related data"""
-        db_service.tournaments_table.delete_item(
-            Key={'tournament_id': self.tournament_id}
-        )
-        # Note: In a real application, you'd want to handle deletion of related 
-        # teams and matches here as well, or implement a cascading delete function
+        """Delete a tournament; its teams and matches are removed by delete_related"""
+        self._table().delete_item(Key=self._key())
+    
+    def delete_related(self, job=None):
+        """Delete the teams and matches belonging to this tournament (run as a job)"""
+        if db_service.single_table_enabled:
+            batches = [(db_service.single_table, [
+                {'PK': item['PK'], 'SK': item['SK']}
+                for item in single_table.query_partition(self.tournament_id, ProjectionExpression='PK, SK')
+            ])]
+        else:
+            batches = [
+                (db_service.matches_table, [
+                    {'match_id': item['match_id']}
+                    for item in Match.query_items(self.tournament_id, ProjectionExpression='match_id')
+                ]),
+                (db_service.teams_table, [
+                    {'team_id': item['team_id']}
+                    for item in Team.query_items(self.tournament_id, ProjectionExpression='team_id')
+                ])
+            ]
+        
+        total = sum(len(keys) for _, keys in batches) or 1
+        deleted = 0
+        for table, keys in batches:
+            with table.batch_writer() as writer:
+                for key in keys:
+                    writer.delete_item(Key=key)
+                    deleted += 1
+                    if job and deleted % 25 == 0:
+                        job.set_progress(deleted * 100 / total)
+        
+        change_log.delete_tournament(self.tournament_id)
+        team_search.remove_tournament(self.tournament_id)
+        return {'deleted_items': deleted}
         
     def create_bracket(self, team_ids):
         """
         Create a bracket for the tournament based on the list of team IDs
-        For simplicity, this example implements only single elimination
+        For simplicity, this example implements only single elimination and Swiss
         """
+        if self.type == 'swiss':
+            return self.create_swiss_round(team_ids)
         if self.type != 'single_elimination':
             raise NotImplementedError(f"Tournament type {self.type} not implemented yet")
         
-        # Ensure even number of teams by adding a "bye"
-        if len(team_ids) % 2 != 0:
-            team_ids.append(None)  # Bye team
-        
-        # Calculate number of rounds needed
-        num_teams = len(team_ids)
-        num_rounds = 0
-        while (1 << num_rounds) < num_teams:
-            num_rounds += 1
-        
-        # Create matches for each round
-        matches_by_round = {}
-        
-        # Create final match first
-        final_match = Match.create(
-            tournament_id=self.tournament_id,
-            round_number=num_rounds
-        )
-        matches_by_round[num_rounds] = [final_match]
-        
-        # Create earlier rounds (working backwards)
-        for r in range(num_rounds - 1, 0, -1):
-            matches_by_round[r] = []
-            for parent_match in matches_by_round[r + 1]:
-                # Create two child matches that feed into this parent
-                for _ in range(2):
-                    child_match = Match.create(
-                        tournament_id=self.tournament_id,
-                        next_match_id=parent_match.match_id,
-                        round_number=r
-                    )
-                    matches_by_round[r].append(child_match)
-        
-        # Assign teams to first round matches
-        for i, match in enumerate(matches_by_round[1]):
-            match.team1_id = team_ids[i * 2] if i * 2 < len(team_ids) else None
-            match.team2_id = team_ids[i * 2 + 1] if i * 2 + 1 < len(team_ids) else None
-            
-            # If a team gets a bye, automatically advance them
-            if match.team1_id and match.team2_id is None:
-                match.status = 'completed'
-                match.score_team1 = 1
-                match.score_team2 = 0
-                
-                # Advance the team to the next match
-                next_match = Match.get(match.next_match_id)
-                if not next_match.team1_id:
-                    next_match.team1_id = match.team1_id
-                else:
-                    next_match.team2_id = match.team1_id
-                next_match.update()
-            elif match.team1_id is None and match.team2_id:
-                match.status = 'completed'
-                match.score_team1 = 0
-                match.score_team2 = 1
-                
-                # Advance the team to the next match
-                next_match = Match.get(match.next_match_id)
-                if not next_match.team1_id:
-                    next_match.team1_id = match.team2_id
-                else:
-                    next_match.team2_id = match.team2_id
-                next_match.update()
-            
-            match.update()
+        # The whole bracket is built in memory (byes included) and written in one batch
+        matches = Match.put_many(build_single_elimination(self.tournament_id, self._seeded_teams(team_ids)))
         
         # Set tournament to in_progress
         self.status = 'in_progress'
         Tournament.update(self)
         
-        # Return all matches by round
-        all_matches = []
-        for round_matches in matches_by_round.values():
-            all_matches.extend(round_matches)
+        return matches
+    
+    def reseed_bracket(self, team_ids):
+        """
+        Re-seed a stored single elimination bracket in place (see
+        bracket.reseed_matches): only slots that differ are written, and
+        stored match IDs are kept. Raises BracketConflict, writing nothing,
+        when the new seeding would move a team out of a started match.
+        Returns None when the tournament has no bracket yet.
+        """
+        stored = [Match.from_item(item) for item in assign_positions(Match.query_items(self.tournament_id))
+                  if item.get('round_number') is not None]
+        if not stored:
+            return None
+        
+        scheduled_time = min(int(match.scheduled_time) for match in stored)
+        desired = build_single_elimination(self.tournament_id, self._seeded_teams(team_ids), scheduled_time)
+        plan = reseed_matches(stored, desired)
+        changed, created, deleted = plan['changed'], plan['created'], plan['deleted']
+        
+        # A few changed slots go out as one logged transaction, so pollers get just those changes
+        if created or deleted or len(changed) > UPDATES_PER_TRANSACTION:
+            Match.put_many(changed + created, deleted)
+        elif changed:
+            Match._save_logged(changed)
         
-        return all_matches
+        if self.status != 'in_progress':
+            self.status = 'in_progress'
+            Tournament.update(self)
+        return {
+            'matches': plan['matches'],
+            'changed': len(changed),
+            'created': len(created),
+            'deleted': len(deleted)
+        }
     
-    def get_bracket(self):
-        """Get all matches for this tournament grouped by round"""
-        matches = Match.get_by_tournament_status(self.tournament_id)
+    def _seeded_teams(self, team_ids):
+        """(team_id, team_name) in seed order; names and seeds are copied onto the matches"""
+        team_names = {team.team_id: team.team_name for team in Team.get_all(self.tournament_id)}
+        return [(team_id, team_names.get(team_id)) for team_id in dict.fromkeys(team_ids) if team_id]
+    
+    def create_swiss_round(self, team_ids=None):
+        """
+        Pair and store the next Swiss round. The first round pairs team_ids
+        (in seed order); later rounds pair the teams already playing by
+        their standings once every match so far is completed.
+        """
+        items = Match.query_items(self.tournament_id)
+        if any(item.get('status') != 'completed' for item in items):
+            raise ValueError("The current round still has unfinished matches")
         
-        # Group by round
-        rounds = {}
-        for match in matches:
-            if match.round_number not in rounds:
-                rounds[match.round_number] = []
-            rounds[match.round_number].append(match.to_dict())
+        table = swiss.standings(team_ids or [], items)
+        pairs, bye = swiss.pair_round(table)
         
-        # Sort rounds
-        result = []
-        for round_number in sorted(rounds.keys()):
-            result.append({
-                'round': round_number,
-                'matches': rounds[round_number]
-            })
+        round_number = max((int(item['round_number']) for item in items if item.get('round_number') is not None), default=0) + 1
+        team_names = {team.team_id: team.team_name for team in Team.get_all(self.tournament_id)}
+        seeds = {row['team_id']: row['seed'] for row in table}
         
-        return result
+        matches = []
+        for team1_id, team2_id in pairs:
+            match = Match(tournament_id=self.tournament_id, team1_id=team1_id, team2_id=team2_id,
+                          round_number=round_number, position=len(matches))
+            match.team1_name, match.team1_seed = team_names.get(team1_id), seeds.get(team1_id)
+            match.team2_name, match.team2_seed = team_names.get(team2_id), seeds.get(team2_id)
+            matches.append(match)
+        
+        if bye:
+            # A bye counts as a win and is settled straight away
+            match = Match(tournament_id=self.tournament_id, team1_id=bye, round_number=round_number,
+                          position=len(matches), status='completed', score_team1=1, score_team2=0)
+            match.team1_name, match.team1_seed = team_names.get(bye), seeds.get(bye)
+            match.completed_at = int(time.time())
+            matches.append(match)
+        
+        # The whole round goes out as one batch
+        Match.put_many(matches)
+        
+        if self.status != 'in_progress':
+            self.status = 'in_progress'
+            Tournament.update(self)
+        return matches
+    
+    def get_standings(self):
+        """Swiss standings: points, Buchholz tiebreak and seed for every team, best first"""
+        items = self._match_items()
+        team_names = {team.team_id: team.team_name for team in self._teams()}
+        table = swiss.standings([], items)
+        for rank, row in enumerate(table, 1):
+            del row['opponents']
+            row['rank'] = rank
+            row['team_name'] = team_names.get(row['team_id'])
+        return table
+    
+    def get_bracket(self, compact=False):
+        """Get all matches for this tournament grouped by round, in bracket order"""
+        bracket = self._bracket(self._match_items())
+        return bracket.compact() if compact else bracket.rounds()
+    
+    def _match_items(self):
+        """This tournament's match items, from the hot table or the archive"""
+        if self.archived:
+            return self.archive_record['matches']
+        return Match.query_items(self.tournament_id)
+    
+    def _teams(self):
+        """This tournament's teams, from the hot table or the archive"""
+        if self.archived:
+            return [Team.from_item(item) for item in self.archive_record['teams']]
+        return Team.get_all(self.tournament_id)
+    
+    def archive(self, job=None):
+        """
+        Move this completed tournament, its teams and its matches to the cold
+        archive, then delete them from the hot tables. The archived copy is
+        read back before anything is deleted.
+        """
+        if self.status != 'completed':
+            raise ValueError("Only completed tournaments can be archived")
+        
+        archive_service.store([self._archive_record()])
+        if not archive_service.contains(self.tournament_id):
+            raise RuntimeError(f"Tournament {self.tournament_id} could not be read back from the archive")
+        
+        self.delete()
+        result = self.delete_related(job)
+        return {'tournament_id': self.tournament_id, 'deleted_items': result['deleted_items'] + 1}
+    
+    @classmethod
+    def archive_completed(cls, job=None, older_than_days=30):
+        """Archive every completed tournament that ended more than `older_than_days` ago (run as a job)"""
+        candidates = cls.archive_candidates(older_than_days)
+        archived = []
+        for number, tournament in enumerate(candidates, 1):
+            tournament.archive()
+            archived.append(tournament.tournament_id)
+            if job:
+                job.set_progress(number * 100 / len(candidates))
+        return {'archived': archived}
+    
+    @classmethod
+    def archive_candidates(cls, older_than_days):
+        """Completed tournaments in the hot tables that ended more than `older_than_days` ago"""
+        cutoff = time.time() - older_than_days * 86400
+        candidates = []
+        for item in cls.scan_items():
+            if item.get('status') != 'completed':
+                continue
+            ended = item.get('end_date') or item.get('start_date') or 0
+            try:
+                ended = int(ended)
+            except (TypeError, ValueError):
+                # Hand-edited or imported rows may hold dates as text; leave them for an admin
+                logger.warning(f"Not archiving tournament {item.get('tournament_id')}: unreadable date {ended!r}")
+                continue
+            if ended < cutoff:
+                candidates.append(cls.from_item(item))
+        return candidates
+    
+    def _archive_record(self):
+        """Everything stored for this tournament, without the hot tables' storage-only attributes"""
+        def strip(item):
+            return {key: value for key, value in item.items() if key not in SINGLE_TABLE_KEYS and key not in INDEX_KEYS}
+        
+        return {
+            'tournament': self.to_dict(),
+            'teams': [strip(item) for item in Team.query_items(self.tournament_id)],
+            'matches': [strip(item) for item in Match.query_items(self.tournament_id)]
+        }
+    
+    def _bracket(self, match_items):
+        """Bracket for this tournament's match items; Swiss rounds aren't a tree"""
+        return Bracket.from_items(match_items, tree=self.type != 'swiss')
+    
+    @staticmethod
+    def _table():
+        """Table holding tournament items for the configured layout"""
+        if db_service.single_table_enabled:
+            return db_service.single_table
+        return db_service.tournaments_table
+    
+    def _key(self):
+        """Primary key of this tournament for the configured layout"""
+        if db_service.single_table_enabled:
+            return {
+                'PK': single_table.tournament_pk(self.tournament_id),
+                'SK': single_table.META_SK
+            }
+        return {'tournament_id': self.tournament_id}
+    
+    def _to_item(self):
+        """Convert tournament to the item stored in DynamoDB"""
+        if db_service.single_table_enabled:
+            key = self._key()
+            return single_table.to_item(self.to_dict(), key['PK'], key['SK'], 'tournament', self.tournament_id)
+        return self.to_dict()
     
     def to_dict(self):
         """Convert tournament to dictionary"""
-        return {
+        result = {
             'tournament_id': self.tournament_id,
             'name': self.name,
             'start_date': self.start_date,
@@ -212,3 +406,6 @@ class Tournament:
             'status': self.status,
             'type': self.type
         }
+        if self.archived:
+            result['archived'] = True
+        return result
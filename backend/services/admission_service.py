@@ -0,0 +1,164 @@
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from services.auth_service import AuthService
+from config import Config
+
+# Addresses allowed to tell us the real client address (nginx runs alongside)
+TRUSTED_PROXIES = ('127.0.0.1', '::1')
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`"""
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Take a token; returns (True, 0) or (False, seconds until one is free)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0
+        return False, (1 - self.tokens) / self.rate if self.rate > 0 else 60
+
+    def refund(self):
+        """Give back a token taken for a request that was turned away elsewhere"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+class AdmissionService:
+    def __init__(self):
+        """Initialize admission control (all state is per worker process)"""
+        self.enabled = Config.ADMISSION_ENABLED
+        self.max_clients = Config.ADMISSION_MAX_CLIENTS
+        self.max_inflight_reads = Config.ADMISSION_READ_MAX_INFLIGHT
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Fresh buckets and counters (also run in each forked worker)"""
+        self._pid = os.getpid()
+        self._global = TokenBucket(Config.ADMISSION_READ_RATE, Config.ADMISSION_READ_BURST)
+        self._clients = OrderedDict()
+        self._inflight_reads = 0
+        self._counters = dict.fromkeys(
+            ('admitted_reads', 'priority', 'shed_client', 'shed_global', 'shed_inflight'), 0
+        )
+
+    def admit(self, request):
+        """
+        Decide whether to serve a request. Returns None to admit it, or
+        (reason, retry_after_seconds) to shed it.
+
+        Only anonymous API reads are rate limited. Writes and authenticated
+        requests always get through, and the read buckets are sized below
+        what a worker can serve. Spectator load can't use up the capacity
+        scorekeepers need.
+        """
+        if not self.enabled or not request.path.startswith('/api/'):
+            return None
+
+        client = self.client_address(request)
+        # Cache refreshes after admin writes come from this host (see cache_service)
+        refresh = client in TRUSTED_PROXIES and request.headers.get('X-Cache-Refresh') == '1'
+
+        if request.method not in ('GET', 'HEAD') or refresh or self._is_authenticated(request):
+            with self._lock:
+                self._check_pid()
+                self._counters['priority'] += 1
+            request.environ['volleytracker.admission'] = 'priority'
+            return None
+
+        with self._lock:
+            self._check_pid()
+            if self.max_inflight_reads and self._inflight_reads >= self.max_inflight_reads:
+                self._counters['shed_inflight'] += 1
+                return 'busy', 1
+
+            bucket = self._clients.get(client)
+            if bucket is None:
+                bucket = self._clients[client] = TokenBucket(Config.ADMISSION_CLIENT_RATE,
+                                                             Config.ADMISSION_CLIENT_BURST)
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(client)
+
+            allowed, wait = bucket.take()
+            if not allowed:
+                self._counters['shed_client'] += 1
+                return 'client_rate', wait
+
+            allowed, wait = self._global.take()
+            if not allowed:
+                bucket.refund()
+                self._counters['shed_global'] += 1
+                return 'global_rate', wait
+
+            self._counters['admitted_reads'] += 1
+            self._inflight_reads += 1
+        request.environ['volleytracker.admission'] = 'read'
+        return None
+
+    def release(self, request):
+        """Mark an admitted read as finished"""
+        if request.environ.get('volleytracker.admission') != 'read':
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                self._inflight_reads = max(0, self._inflight_reads - 1)
+
+    @staticmethod
+    def retry_after(wait):
+        """Whole seconds for the Retry-After header"""
+        return max(1, math.ceil(wait))
+
+    @staticmethod
+    def client_address(request):
+        """The spectator's address, trusting X-Real-IP only from the local proxy"""
+        if request.remote_addr in TRUSTED_PROXIES:
+            return request.headers.get('X-Real-IP') or request.remote_addr
+        return request.remote_addr
+
+    @staticmethod
+    def _is_authenticated(request):
+        """Whether the request carries a valid admin token (a cheap local signature check)"""
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return False
+        return AuthService.validate_token(auth_header.split(' ')[1]) is not None
+
+    def _check_pid(self):
+        """Forked workers must not share the parent's counters (call with the lock held)"""
+        if self._pid != os.getpid():
+            self._reset()
+
+    def stats(self):
+        """Counters and current state for this worker process"""
+        with self._lock:
+            self._check_pid()
+            return {
+                'pid': self._pid,
+                'enabled': self.enabled,
+                'counters': dict(self._counters),
+                'inflight_reads': self._inflight_reads,
+                'tracked_clients': len(self._clients),
+                'global_tokens': round(self._global.tokens, 2),
+                'limits': {
+                    'read_rate': Config.ADMISSION_READ_RATE,
+                    'read_burst': Config.ADMISSION_READ_BURST,
+                    'client_rate': Config.ADMISSION_CLIENT_RATE,
+                    'client_burst': Config.ADMISSION_CLIENT_BURST,
+                    'read_max_inflight': self.max_inflight_reads
+                }
+            }
+
+# Create a singleton instance
+admission_service = AdmissionService()
@@ -0,0 +1,160 @@
+import os
+import json
+import mmap
+import zlib
+import fcntl
+import struct
+import threading
+from services.serialization import encode_default
+from config import Config
+
+# One index entry per tournament: key (tournament ID, NUL padded), data offset, compressed length
+INDEX_ENTRY = struct.Struct('>64sQI')
+DATA_FILE = 'tournaments.dat'
+INDEX_FILE = 'tournaments.idx'
+LOCK_FILE = '.lock'
+
+class ArchiveService:
+    """
+    Cold storage for completed tournaments, in two local files. The data
+    file holds one zlib-compressed JSON record per tournament (the
+    tournament, its teams and its matches), appended and never rewritten.
+    The index file holds fixed-size entries sorted by tournament ID, so a
+    lookup is a binary search over the memory-mapped index and one slice
+    of the memory-mapped data file; nothing is read that isn't needed.
+    """
+
+    def __init__(self):
+        """Initialize the archive (files are opened on first use)"""
+        self.archive_dir = Config.ARCHIVE_DIR
+        self._lock = threading.Lock()
+        self._maps = None  # (index file identity, index mmap, data mmap)
+        self._summaries = None  # (index file identity, tournament items)
+
+    def get(self, tournament_id):
+        """An archived tournament's record ({'tournament', 'teams', 'matches'}), or None"""
+        key = self._key(tournament_id)
+        if key is None:
+            return None
+        with self._lock:
+            maps = self._mapped()
+            if maps is None:
+                return None
+            _, index, data = maps
+            entry = self._find(index, key)
+            if entry is None:
+                return None
+            offset, length = entry
+            return json.loads(zlib.decompress(data[offset:offset + length]))
+
+    def contains(self, tournament_id):
+        """Whether a tournament is in the archive"""
+        key = self._key(tournament_id)
+        with self._lock:
+            maps = self._mapped()
+            return maps is not None and key is not None and self._find(maps[1], key) is not None
+
+    def list_tournaments(self):
+        """Tournament items of everything archived (cached until the archive changes)"""
+        with self._lock:
+            maps = self._mapped()
+            if maps is None:
+                return []
+            identity, index, data = maps
+            if self._summaries is None or self._summaries[0] != identity:
+                items = []
+                for _, offset, length in self._entries(index):
+                    items.append(json.loads(zlib.decompress(data[offset:offset + length]))['tournament'])
+                self._summaries = (identity, items)
+            return list(self._summaries[1])
+
+    def store(self, records):
+        """
+        Add records ({'tournament': item, 'teams': [...], 'matches': [...]})
+        to the archive: append them to the data file, flush it to disk, then
+        atomically replace the index. A crash part way through leaves the
+        old index, which never points past the data it was written with.
+        Processes sharing the directory take turns through a file lock.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(os.path.join(self.archive_dir, LOCK_FILE), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            added = {}
+            with open(os.path.join(self.archive_dir, DATA_FILE), 'ab') as data_file:
+                for record in records:
+                    key = self._key(record['tournament']['tournament_id'])
+                    if key is None:
+                        raise ValueError(f"Tournament ID too long to archive: {record['tournament']['tournament_id']}")
+                    blob = zlib.compress(json.dumps(record, default=encode_default, separators=(',', ':')).encode(), 6)
+                    added[key] = (data_file.tell(), len(blob))
+                    data_file.write(blob)
+                data_file.flush()
+                os.fsync(data_file.fileno())
+
+            entries = {}
+            index_path = os.path.join(self.archive_dir, INDEX_FILE)
+            if os.path.exists(index_path):
+                with open(index_path, 'rb') as index_file:
+                    for key, offset, length in INDEX_ENTRY.iter_unpack(index_file.read()):
+                        entries[key] = (offset, length)
+            entries.update(added)
+
+            temp_path = index_path + '.tmp'
+            with open(temp_path, 'wb') as index_file:
+                for key in sorted(entries):
+                    index_file.write(INDEX_ENTRY.pack(key, *entries[key]))
+                index_file.flush()
+                os.fsync(index_file.fileno())
+            os.replace(temp_path, index_path)
+        return len(added)
+
+    def _mapped(self):
+        """Current (identity, index mmap, data mmap), reopened when another process replaced the index"""
+        index_path = os.path.join(self.archive_dir, INDEX_FILE)
+        try:
+            stat = os.stat(index_path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if self._maps is not None and self._maps[0] == identity:
+            return self._maps
+        if stat.st_size == 0:
+            return None
+
+        with open(index_path, 'rb') as index_file:
+            index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(os.path.join(self.archive_dir, DATA_FILE), 'rb') as data_file:
+            data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps = (identity, index, data)
+        return self._maps
+
+    @staticmethod
+    def _entries(index):
+        """Every (key, offset, length) in an index"""
+        return INDEX_ENTRY.iter_unpack(index)
+
+    @staticmethod
+    def _find(index, key):
+        """Binary search a mapped index for a key; returns (offset, length) or None"""
+        low, high = 0, len(index) // INDEX_ENTRY.size
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = INDEX_ENTRY.unpack_from(index, middle * INDEX_ENTRY.size)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return offset, length
+        return None
+
+    @staticmethod
+    def _key(tournament_id):
+        """Index key bytes for a tournament ID, or None if it doesn't fit"""
+        key = (tournament_id or '').encode()
+        if not key or len(key) > 64:
+            return None
+        return key.ljust(64, b'\0')
+
+# Create a singleton instance
+archive_service = ArchiveService()
@@ -0,0 +1,68 @@
+import logging
+import threading
+import urllib.request
+from urllib.parse import quote
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Match status filters the frontend polls with
+MATCH_STATUSES = ('scheduled', 'in_progress', 'completed')
+
+# Accept headers for each encoding nginx caches separately (see $api_encoding in nginx.conf)
+ENCODINGS = ('application/json', 'application/msgpack')
+
+class CacheService:
+    def __init__(self):
+        """Initialize the nginx micro-cache refresher"""
+        self.refresh_url = Config.CACHE_REFRESH_URL
+        self.timeout = Config.CACHE_REFRESH_TIMEOUT
+
+    @staticmethod
+    def tournament_paths(tournament_id, match_ids=(), team_ids=()):
+        """Public GET URLs whose cached copies depend on a tournament's data"""
+        tid = quote(tournament_id, safe='')
+        paths = [
+            '/api/tournaments/',
+            f'/api/tournaments/{tid}',
+            f'/api/tournaments/{tid}/bracket',
+            f'/api/tournaments/{tid}/full',
+            f'/api/tournaments/{tid}/bracket?format=compact',
+            f'/api/tournaments/{tid}/full?format=compact',
+            f'/api/tournaments/{tid}/projections',
+            f'/api/tournaments/{tid}/standings',
+            f'/api/teams/?tournament_id={tid}',
+            f'/api/matches/?tournament_id={tid}',
+            '/api/matches/live',
+        ]
+        paths.extend(f'/api/matches/?tournament_id={tid}&status={status}' for status in MATCH_STATUSES)
+        paths.extend(f'/api/matches/{quote(match_id, safe="")}' for match_id in match_ids if match_id)
+        paths.extend(f'/api/teams/{quote(team_id, safe="")}' for team_id in team_ids if team_id)
+        return paths
+
+    def invalidate_tournament(self, tournament_id, match_ids=(), team_ids=()):
+        """Refresh cached responses for a tournament after an admin write"""
+        if not self.refresh_url or not tournament_id:
+            return
+
+        paths = self.tournament_paths(tournament_id, match_ids, team_ids)
+        # Don't hold up the admin's response on the refresh round trips
+        threading.Thread(target=self._refresh, args=(paths,), daemon=True).start()
+
+    def _refresh(self, paths):
+        """Re-fetch each path through nginx, once per encoding, so the cache stores the new responses"""
+        for path in paths:
+            for accept in ENCODINGS:
+                request = urllib.request.Request(
+                    self.refresh_url.rstrip('/') + path,
+                    headers={'X-Cache-Refresh': '1', 'Accept': accept}
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                        response.read()
+                except Exception as e:
+                    # Deleted resources 404 here; their old entries expire with the TTL
+                    logger.debug(f"Cache refresh for {path} ({accept}) failed: {e}")
+
+# Create a singleton instance
+cache_service = CacheService()
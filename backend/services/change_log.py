@@ -0,0 +1,129 @@
+import time
+import random
+from services.db_service import db_service
+from services.serialization import to_dynamo
+from boto3.dynamodb.conditions import Key
+from config import Config
+
+# seq 0 of each tournament holds its counter; change records start at 1
+HEAD_SEQ = 0
+# TransactWriteItems takes 100 items: each update brings a change record, plus the log counter
+UPDATES_PER_TRANSACTION = 49
+
+class ChangeLogConflict(Exception):
+    """Raised when a logged write keeps losing races for the sequence counter"""
+
+class ChangeLogService:
+    def __init__(self):
+        """Initialize the per-tournament match change log"""
+        self.ttl = Config.CHANGE_LOG_TTL
+        self.feed_limit = Config.CHANGE_FEED_LIMIT
+        self.max_attempts = max(Config.CHANGE_LOG_ATTEMPTS, 1)
+        self.backoff = Config.CHANGE_LOG_BACKOFF
+        self.backoff_max = Config.CHANGE_LOG_BACKOFF_MAX
+
+    def write(self, tournament_id, operations, changes):
+        """
+        Apply TransactWriteItems `operations` together with one change record
+        per entry of `changes` ({'match_id': ..., 'fields': {...}}, or
+        {'resync': True}). The counter, the records and the writes commit in
+        one transaction, so the feed never shows a change that didn't happen
+        or misses one that did.
+        """
+        client = db_service.dynamodb.meta.client
+        for attempt in range(self.max_attempts):
+            if attempt:
+                # Full jitter, so writers that collided don't collide again in lockstep
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff * 2 ** (attempt - 1))))
+            last_seq = self.last_seq(tournament_id)
+            now = int(time.time())
+            items = list(operations)
+            items.append({'Update': {
+                'TableName': db_service.CHANGES_TABLE,
+                'Key': {'tournament_id': tournament_id, 'seq': HEAD_SEQ},
+                'UpdateExpression': 'SET last_seq = :next',
+                'ConditionExpression': 'attribute_not_exists(last_seq) OR last_seq = :expected',
+                'ExpressionAttributeValues': {':next': last_seq + len(changes), ':expected': last_seq}
+            }})
+            for offset, change in enumerate(changes, 1):
+                record = dict(change, tournament_id=tournament_id, seq=last_seq + offset,
+                              created_at=now, expires_at=now + self.ttl)
+                items.append({'Put': {'TableName': db_service.CHANGES_TABLE, 'Item': to_dynamo(record)}})
+            try:
+                client.transact_write_items(TransactItems=items)
+                return last_seq + len(changes)
+            except client.exceptions.TransactionCanceledException as e:
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if 'ConditionalCheckFailed' in reasons[:len(operations)]:
+                    raise  # One of the caller's own conditions failed
+                if any(code not in (None, 'None', 'ConditionalCheckFailed', 'TransactionConflict') for code in reasons):
+                    raise
+                # Another writer took the next sequence number first; read it again
+        raise ChangeLogConflict(f"Could not log changes for tournament {tournament_id}")
+
+    def record_resync(self, tournament_id):
+        """
+        Tell pollers to reload everything, after bulk writes too big for one
+        transaction. Raises on failure: pollers that never hear of the writes
+        would keep a stale bracket, so the request that made them must fail.
+        """
+        return self.write(tournament_id, [], [{'resync': True}])
+
+    def last_seq(self, tournament_id):
+        """Latest sequence number of a tournament's log (0 if nothing was logged)"""
+        response = db_service.changes_table.get_item(
+            Key={'tournament_id': tournament_id, 'seq': HEAD_SEQ},
+            ConsistentRead=True
+        )
+        return int(response.get('Item', {}).get('last_seq', 0))
+
+    def changes_since(self, tournament_id, since):
+        """
+        Changes after `since`, as {'seq', 'resync', 'changes'}. resync is set
+        when the caller must reload the whole bracket: `since` is older than
+        the compacted log, newer than the log (it was reset), the gap is
+        bigger than one page, or a bulk write happened in between.
+        """
+        last_seq = self.last_seq(tournament_id)
+        if since is None or since == last_seq:
+            return {'seq': last_seq, 'resync': since is None, 'changes': []}
+        if since > last_seq or since < 0:
+            return {'seq': last_seq, 'resync': True, 'changes': []}
+
+        response = db_service.changes_table.query(
+            KeyConditionExpression=Key('tournament_id').eq(tournament_id) & Key('seq').between(since + 1, last_seq),
+            ConsistentRead=True,
+            Limit=self.feed_limit
+        )
+        records = response.get('Items', [])
+        now = int(time.time())
+        complete = len(records) == last_seq - since and 'LastEvaluatedKey' not in response
+        # TTL deletion lags, so an expired record counts as already compacted
+        if not complete or int(records[0]['seq']) != since + 1 or int(records[0].get('expires_at', now)) < now:
+            return {'seq': last_seq, 'resync': True, 'changes': []}
+        if any(record.get('resync') for record in records):
+            return {'seq': last_seq, 'resync': True, 'changes': []}
+
+        return {
+            'seq': last_seq,
+            'resync': False,
+            'changes': [
+                {'seq': int(record['seq']), 'match_id': record['match_id'], 'fields': record.get('fields', {})}
+                for record in records
+            ]
+        }
+
+    def delete_tournament(self, tournament_id):
+        """Drop a tournament's log and counter"""
+        keys = db_service.query_all(
+            db_service.changes_table,
+            KeyConditionExpression=Key('tournament_id').eq(tournament_id),
+            ProjectionExpression='tournament_id, seq'
+        )
+        with db_service.changes_table.batch_writer() as writer:
+            for key in keys:
+                writer.delete_item(Key=key)
+        return len(keys)
+
+# Create a singleton instance
+change_log = ChangeLogService()
@@ -1,4 +1,8 @@
+import os
+import threading
+import weakref
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 import logging
 from config import Config
@@ -7,28 +11,239 @@ logger = logging.getLogger(__name__)
 
 class DynamoDBService:
     def __init__(self):
-        """Initialize DynamoDB client"""
-        options = {}
+        """Initialize DynamoDB settings; clients are created on first use in each process"""
+        self.options = {'region_name': Config.AWS_REGION}
         if Config.DYNAMODB_ENDPOINT:
-            options['endpoint_url'] = Config.DYNAMODB_ENDPOINT
+            self.options['endpoint_url'] = Config.DYNAMODB_ENDPOINT
         
-        self.dynamodb = boto3.resource('dynamodb', region_name=Config.AWS_REGION, **options)
-        self.client = boto3.client('dynamodb', region_name=Config.AWS_REGION, **options)
+        # Connection pool settings for every client (the shared client's pool is sized for the threads using it)
+        self.client_config = BotoConfig(
+            max_pool_connections=Config.DYNAMODB_MAX_POOL_CONNECTIONS,
+            connect_timeout=Config.DYNAMODB_CONNECT_TIMEOUT,
+            read_timeout=Config.DYNAMODB_READ_TIMEOUT,
+            retries={'mode': Config.DYNAMODB_RETRY_MODE, 'total_max_attempts': Config.DYNAMODB_MAX_ATTEMPTS},
+            tcp_keepalive=Config.DYNAMODB_TCP_KEEPALIVE
+        )
         
         # Define table names
         self.TOURNAMENTS_TABLE = 'VolleyDB_Tournaments'
         self.TEAMS_TABLE = 'VolleyDB_Teams' 
         self.MATCHES_TABLE = 'VolleyDB_Matches'
+        self.JOBS_TABLE = 'VolleyDB_Jobs'
+        self.RATINGS_TABLE = 'VolleyDB_Ratings'
+        self.CHANGES_TABLE = 'VolleyDB_Changes'
+        self.SINGLE_TABLE = Config.SINGLE_TABLE
         
-        # Initialize tables
-        self.tournaments_table = self.dynamodb.Table(self.TOURNAMENTS_TABLE)
-        self.teams_table = self.dynamodb.Table(self.TEAMS_TABLE)
-        self.matches_table = self.dynamodb.Table(self.MATCHES_TABLE)
+        # Index behind the court display boards (see _court_schedule_index)
+        self.COURT_SCHEDULE_INDEX = 'CourtScheduleIndex'
+        self.COURT_SCHEDULE_ATTRIBUTES = (
+            {'AttributeName': 'tournament_court', 'AttributeType': 'S'},
+            {'AttributeName': 'scheduled_time', 'AttributeType': 'N'}
+        )
+        
+        # Index behind the cross-tournament live feed (see _live_matches_index)
+        self.LIVE_MATCHES_INDEX = 'LiveMatchesIndex'
+        self.LIVE_MATCHES_ATTRIBUTES = (
+            {'AttributeName': 'live_partition', 'AttributeType': 'S'},
+        )
+        self.LIVE_MATCH_FIELDS = (
+            'match_id', 'tournament_id', 'court', 'round_number', 'scheduled_time',
+            'team1_id', 'team2_id', 'team1_name', 'team2_name', 'score_team1', 'score_team2'
+        )
+        
+        # Models read and write SINGLE_TABLE instead of the per-entity tables
+        self.single_table_enabled = Config.DATA_LAYOUT == 'single_table'
+        
+        self._session = None
+        self._pid = None
+        self._client = None
+        self._resource_clients = weakref.WeakSet()
+        self._local = threading.local()
+        self._client_hooks = []
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        """
+        Create this process's plain client. Runs lazily, so a gunicorn
+        master that preloads the app never hands open sockets to its forked
+        workers; each worker builds its own pool (see gunicorn.conf.py).
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Sessions aren't thread-safe, so clients are only made under the lock; the
+            # session itself is reused after fork to keep its already-loaded API models
+            if self._session is None:
+                self._session = boto3.session.Session()
+            client = self._session.client('dynamodb', config=self.client_config, **self.options)
+            for hook in self._client_hooks:
+                hook(client)
+            
+            self._client = client
+            self._resource_clients = weakref.WeakSet()
+            self._pid = os.getpid()
+    
+    def _resource(self):
+        """
+        A resource on a session of its own. Resources register a
+        TransformationInjector on their client, and its condition-expression
+        builder numbers placeholders with counters it resets per call, so two
+        threads on one client would mix up each other's #n/:v names.
+        """
+        dynamodb = boto3.session.Session().resource('dynamodb', config=self.client_config, **self.options)
+        with self._lock:
+            for hook in self._client_hooks:
+                hook(dynamodb.meta.client)
+            self._resource_clients.add(dynamodb.meta.client)
+        return dynamodb
+    
+    @property
+    def dynamodb(self):
+        """
+        boto3 resource used by the models (its Table objects convert Python
+        types). Each thread gets its own resource, built from its own session,
+        so it has its own client, expression builder and connection pool.
+        """
+        if self._pid != os.getpid():
+            self._connect()
+        local = self._local
+        if getattr(local, 'pid', None) != self._pid:
+            # Threads that survive a fork keep their locals, so key them by process too
+            local.dynamodb = self._resource()
+            local.tables = {}
+            local.pid = self._pid
+        return local.dynamodb
+    
+    @property
+    def client(self):
+        """Plain low-level client, shared by every thread in the process (clients are thread-safe)"""
+        if self._pid != os.getpid():
+            self._connect()
+        return self._client
+    
+    def add_client_hook(self, hook):
+        """Call hook(botocore_client) on every client this service creates, now and after forks"""
+        with self._lock:
+            self._client_hooks.append(hook)
+            if self._pid == os.getpid():
+                hook(self._client)
+                for client in list(self._resource_clients):
+                    hook(client)
+    
+    def table(self, name):
+        """Table resource for this thread, cached"""
+        dynamodb = self.dynamodb
+        table = self._local.tables.get(name)
+        if table is None:
+            table = self._local.tables[name] = dynamodb.Table(name)
+        return table
+    
+    @property
+    def tournaments_table(self):
+        """Tournaments table"""
+        return self.table(self.TOURNAMENTS_TABLE)
+    
+    @property
+    def teams_table(self):
+        """Teams table"""
+        return self.table(self.TEAMS_TABLE)
+    
+    @property
+    def matches_table(self):
+        """Matches table"""
+        return self.table(self.MATCHES_TABLE)
+    
+    @property
+    def jobs_table(self):
+        """Background jobs table"""
+        return self.table(self.JOBS_TABLE)
+    
+    @property
+    def ratings_table(self):
+        """Team ratings table"""
+        return self.table(self.RATINGS_TABLE)
+    
+    @property
+    def changes_table(self):
+        """Match change log table"""
+        return self.table(self.CHANGES_TABLE)
+    
+    @property
+    def single_table(self):
+        """Single-table layout table"""
+        return self.table(self.SINGLE_TABLE)
+    
+    def warm_up(self):
+        """
+        Open this process's connection pool and load everything the first
+        request would otherwise pay for: clients, table resources, and a TLS
+        connection via a cheap DescribeTable. Threads other than the calling
+        one still open their own resource on their first request.
+        """
+        names = [self.SINGLE_TABLE] if self.single_table_enabled else [
+            self.TOURNAMENTS_TABLE, self.TEAMS_TABLE, self.MATCHES_TABLE
+        ]
+        for name in names + [self.JOBS_TABLE, self.RATINGS_TABLE, self.CHANGES_TABLE]:
+            self.table(name)
+        try:
+            self.client.describe_table(TableName=names[0])
+            self.dynamodb.meta.client.describe_table(TableName=names[0])
+        except ClientError as e:
+            logger.warning(f"DynamoDB warm-up failed: {e}")
+    
+    @staticmethod
+    def query_all(table, **kwargs):
+        """Run a query and follow LastEvaluatedKey until every page is read"""
+        items = []
+        while True:
+            response = table.query(**kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return items
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    @staticmethod
+    def scan_all(table, **kwargs):
+        """Run a scan and follow LastEvaluatedKey until every page is read"""
+        items = []
+        while True:
+            response = table.scan(**kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return items
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    @staticmethod
+    def scan_pages(table, **kwargs):
+        """Yield a scan's items one page at a time, so callers never hold the whole table"""
+        while True:
+            response = table.scan(**kwargs)
+            yield response.get('Items', [])
+            if 'LastEvaluatedKey' not in response:
+                return
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
     def create_tables_if_not_exists(self):
         """Create DynamoDB tables if they don't exist"""
         existing_tables = self.client.list_tables()['TableNames']
         
+        # Background jobs, team ratings and the change log live in their own tables in either layout
+        if self.JOBS_TABLE not in existing_tables:
+            self._create_jobs_table()
+        
+        if self.RATINGS_TABLE not in existing_tables:
+            self._create_ratings_table()
+        
+        if self.CHANGES_TABLE not in existing_tables:
+            self._create_changes_table()
+        
+        if self.single_table_enabled:
+            if self.SINGLE_TABLE not in existing_tables:
+                self._create_single_table()
+            else:
+                self._ensure_indexes(self.SINGLE_TABLE, ('PK', 'SK'))
+            return
+        
         # Create Tournaments table if it doesn't exist
         if self.TOURNAMENTS_TABLE not in existing_tables:
             self._create_tournaments_table()
@@ -40,6 +255,8 @@ class DynamoDBService:
         # Create Matches table if it doesn't exist
         if self.MATCHES_TABLE not in existing_tables:
             self._create_matches_table()
+        else:
+            self._ensure_indexes(self.MATCHES_TABLE, ('match_id',))
 
     def _create_tournaments_table(self):
         """Create tournaments table"""
@@ -98,7 +315,9 @@ class DynamoDBService:
                 AttributeDefinitions=[
                     {'AttributeName': 'match_id', 'AttributeType': 'S'},
                     {'AttributeName': 'tournament_id', 'AttributeType': 'S'},
-                    {'AttributeName': 'status', 'AttributeType': 'S'}
+                    {'AttributeName': 'status', 'AttributeType': 'S'},
+                    *self.COURT_SCHEDULE_ATTRIBUTES,
+                    *self.LIVE_MATCHES_ATTRIBUTES
                 ],
                 GlobalSecondaryIndexes=[
                     {
@@ -115,7 +334,9 @@ class DynamoDBService:
                             {'AttributeName': 'status', 'KeyType': 'RANGE'}
                         ],
                         'Projection': {'ProjectionType': 'ALL'}
-                    }
+                    },
+                    self._court_schedule_index(),
+                    self._live_matches_index(('match_id',))
                 ],
                 BillingMode='PAY_PER_REQUEST'
             )
@@ -124,5 +345,164 @@ class DynamoDBService:
             logger.error(f"Error creating table {self.MATCHES_TABLE}: {e}")
             raise
 
+    def _create_jobs_table(self):
+        """Create background jobs table"""
+        try:
+            self.client.create_table(
+                TableName=self.JOBS_TABLE,
+                KeySchema=[
+                    {'AttributeName': 'job_id', 'KeyType': 'HASH'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'job_id', 'AttributeType': 'S'}
+                ],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            logger.info(f"Created table: {self.JOBS_TABLE}")
+        except ClientError as e:
+            logger.error(f"Error creating table {self.JOBS_TABLE}: {e}")
+            raise
+    
+    def _create_ratings_table(self):
+        """Create team ratings table"""
+        try:
+            self.client.create_table(
+                TableName=self.RATINGS_TABLE,
+                KeySchema=[
+                    {'AttributeName': 'identity', 'KeyType': 'HASH'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'identity', 'AttributeType': 'S'}
+                ],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            logger.info(f"Created table: {self.RATINGS_TABLE}")
+        except ClientError as e:
+            logger.error(f"Error creating table {self.RATINGS_TABLE}: {e}")
+            raise
+    
+    def _create_changes_table(self):
+        """Create match change log table (records expire via TTL, which compacts the log)"""
+        try:
+            self.client.create_table(
+                TableName=self.CHANGES_TABLE,
+                KeySchema=[
+                    {'AttributeName': 'tournament_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'seq', 'KeyType': 'RANGE'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'tournament_id', 'AttributeType': 'S'},
+                    {'AttributeName': 'seq', 'AttributeType': 'N'}
+                ],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            self.client.get_waiter('table_exists').wait(TableName=self.CHANGES_TABLE)
+            self.client.update_time_to_live(
+                TableName=self.CHANGES_TABLE,
+                TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'}
+            )
+            logger.info(f"Created table: {self.CHANGES_TABLE}")
+        except ClientError as e:
+            logger.error(f"Error creating table {self.CHANGES_TABLE}: {e}")
+            raise
+    
+    def _create_single_table(self):
+        """Create the single-table layout table"""
+        try:
+            self.client.create_table(
+                TableName=self.SINGLE_TABLE,
+                KeySchema=[
+                    {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                    {'AttributeName': 'SK', 'KeyType': 'RANGE'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'PK', 'AttributeType': 'S'},
+                    {'AttributeName': 'SK', 'AttributeType': 'S'},
+                    {'AttributeName': 'entity_id', 'AttributeType': 'S'},
+                    *self.COURT_SCHEDULE_ATTRIBUTES,
+                    *self.LIVE_MATCHES_ATTRIBUTES
+                ],
+                GlobalSecondaryIndexes=[
+                    {
+                        # Resolves a bare match/team/tournament ID to its PK/SK
+                        'IndexName': 'EntityIndex',
+                        'KeySchema': [
+                            {'AttributeName': 'entity_id', 'KeyType': 'HASH'}
+                        ],
+                        'Projection': {'ProjectionType': 'KEYS_ONLY'}
+                    },
+                    self._court_schedule_index(),
+                    self._live_matches_index(('PK', 'SK'))
+                ],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            logger.info(f"Created table: {self.SINGLE_TABLE}")
+        except ClientError as e:
+            logger.error(f"Error creating table {self.SINGLE_TABLE}: {e}")
+            raise
+
+    def _court_schedule_index(self):
+        """
+        Sparse index of unfinished matches per court, in schedule order. Only
+        matches with a court carry tournament_court, and it's dropped once a
+        match completes, so a court's queue is a short bounded query.
+        """
+        return {
+            'IndexName': self.COURT_SCHEDULE_INDEX,
+            'KeySchema': [
+                {'AttributeName': 'tournament_court', 'KeyType': 'HASH'},
+                {'AttributeName': 'scheduled_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    
+    def _live_matches_index(self, table_keys):
+        """
+        Sparse index of every match in progress, across all tournaments. Only
+        live matches carry live_partition, all with the same value, so the
+        live feed is one query over a single small partition. It projects just
+        what a scoreboard shows (table key attributes are always projected).
+        """
+        return {
+            'IndexName': self.LIVE_MATCHES_INDEX,
+            'KeySchema': [
+                {'AttributeName': 'live_partition', 'KeyType': 'HASH'}
+            ],
+            'Projection': {
+                'ProjectionType': 'INCLUDE',
+                'NonKeyAttributes': [field for field in self.LIVE_MATCH_FIELDS if field not in table_keys]
+            }
+        }
+    
+    def _ensure_indexes(self, table_name, table_keys):
+        """
+        Add indexes to a table created before they existed. DynamoDB builds
+        one new index at a time, so any others are added on a later start.
+        """
+        missing = [
+            (self._court_schedule_index(), self.COURT_SCHEDULE_ATTRIBUTES),
+            (self._live_matches_index(table_keys), self.LIVE_MATCHES_ATTRIBUTES)
+        ]
+        try:
+            table = self.client.describe_table(TableName=table_name)['Table']
+            indexes = {index['IndexName']: index.get('IndexStatus') for index in table.get('GlobalSecondaryIndexes', [])}
+            missing = [(index, attributes) for index, attributes in missing if index['IndexName'] not in indexes]
+            if not missing:
+                return
+            if 'CREATING' in indexes.values():
+                logger.info(f"Table {table_name} is still building an index; {missing[0][0]['IndexName']} will be added on a later start")
+                return
+            
+            index, attributes = missing[0]
+            self.client.update_table(
+                TableName=table_name,
+                AttributeDefinitions=list(attributes),
+                GlobalSecondaryIndexUpdates=[{'Create': index}]
+            )
+            logger.info(f"Adding {index['IndexName']} to table: {table_name}")
+        except ClientError as e:
+            logger.error(f"Error adding indexes to table {table_name}: {e}")
+            raise
+
 # Create a singleton instance
 db_service = DynamoDBService()
@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
+from services.db_service import db_service
+from config import Config
+
+# Storage-only attributes of the single-table layout
+SINGLE_TABLE_KEYS = ('PK', 'SK', 'entity_type', 'entity_id')
+# Derived index keys, present in either layout
+INDEX_KEYS = ('tournament_court', 'live_partition')
+
+def _json_default(value):
+    """Encode the types DynamoDB hands back that json can't"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class ExportService:
+    def __init__(self):
+        """Initialize the exporter"""
+        self.default_segments = Config.EXPORT_SCAN_SEGMENTS
+        self.deserializer = TypeDeserializer()
+
+    def parallel_scan(self, table_name, total_segments=None, **kwargs):
+        """
+        Yield every item of a table, scanning its segments concurrently on a
+        thread pool. Pages pass through a bounded queue, so memory stays flat
+        however large the table is. Uses the low-level client, which is safe
+        to share between threads.
+        """
+        total_segments = total_segments or self.default_segments
+        pages = queue.Queue(maxsize=total_segments * 2)
+        finished = object()
+        stop = threading.Event()
+
+        def scan_segment(segment):
+            scan_kwargs = dict(kwargs, TableName=table_name, Segment=segment, TotalSegments=total_segments)
+            try:
+                while not stop.is_set():
+                    response = db_service.client.scan(**scan_kwargs)
+                    pages.put(response.get('Items', []))
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            finally:
+                pages.put(finished)
+
+        with ThreadPoolExecutor(max_workers=total_segments) as pool:
+            futures = [pool.submit(scan_segment, segment) for segment in range(total_segments)]
+            remaining = total_segments
+            try:
+                while remaining:
+                    page = pages.get()
+                    if page is finished:
+                        remaining -= 1
+                        continue
+                    for item in page:
+                        yield {key: self.deserializer.deserialize(value) for key, value in item.items()}
+            finally:
+                # If the consumer went away, unblock the producers so they can exit
+                stop.set()
+                while remaining:
+                    if pages.get() is finished:
+                        remaining -= 1
+
+            # Surface scan errors instead of silently returning a partial export
+            for future in futures:
+                future.result()
+
+    def iter_records(self, total_segments=None):
+        """Yield {'entity': ..., 'data': ...} records for every tournament, team and match"""
+        if db_service.single_table_enabled:
+            for item in self.parallel_scan(db_service.SINGLE_TABLE, total_segments):
+                entity = item.get('entity_type')
+                data = {key: value for key, value in item.items()
+                        if key not in SINGLE_TABLE_KEYS and key not in INDEX_KEYS}
+                yield {'entity': entity, 'data': data}
+            return
+
+        for entity, table_name in (('tournament', db_service.TOURNAMENTS_TABLE),
+                                   ('team', db_service.TEAMS_TABLE),
+                                   ('match', db_service.MATCHES_TABLE)):
+            for item in self.parallel_scan(table_name, total_segments):
+                data = {key: value for key, value in item.items() if key not in INDEX_KEYS}
+                yield {'entity': entity, 'data': data}
+
+    def export_ndjson_gz(self, total_segments=None):
+        """Stream the whole database as gzip'd NDJSON, one record per line"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+        for record in self.iter_records(total_segments):
+            line = json.dumps(record, default=_json_default, separators=(',', ':')) + '\n'
+            chunk = compressor.compress(line.encode('utf-8'))
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+
+    def export_to_file(self, job=None, total_segments=None):
+        """Write a gzip'd NDJSON export into EXPORT_DIR (run as a background job)"""
+        os.makedirs(Config.EXPORT_DIR, exist_ok=True)
+        filename = f"volleytracker-export-{int(time.time())}-{job.job_id[:8] if job else 'cli'}.ndjson.gz"
+        path = os.path.join(Config.EXPORT_DIR, filename)
+        
+        written = 0
+        with open(path + '.partial', 'wb') as out:
+            for chunk in self.export_ndjson_gz(total_segments):
+                out.write(chunk)
+                written += len(chunk)
+        os.replace(path + '.partial', path)
+        
+        return {'file': filename, 'bytes': written}
+
+# Create a singleton instance
+export_service = ExportService()
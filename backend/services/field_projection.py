@@ -0,0 +1,30 @@
+def parse_fields(raw, allowed, key_field):
+    """
+    Parse a comma separated ?fields= value into a list of attribute names.
+    Returns None when no projection was asked for; raises ValueError on
+    unknown fields. The key field is always included so results stay
+    addressable.
+    """
+    if not raw:
+        return None
+
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    if key_field not in fields:
+        fields.insert(0, key_field)
+    return fields
+
+def projection_kwargs(fields):
+    """ProjectionExpression arguments for a query or scan returning only these fields"""
+    names = {f'#p{i}': field for i, field in enumerate(fields)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+def project(items, fields):
+    """Trim projected items to plain dicts with exactly the requested fields"""
+    return [{field: item.get(field) for field in fields} for item in items]
@@ -0,0 +1,72 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from models.job import Job
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting in this process"""
+
+class JobService:
+    def __init__(self):
+        """Initialize the background job runner"""
+        self.max_workers = Config.JOB_WORKERS
+        self.max_pending = Config.JOB_MAX_PENDING
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Thread pool for this process, created lazily so forked workers get their own"""
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._executor
+
+    def submit(self, job_type, fn, *args, **kwargs):
+        """
+        Queue fn(job, *args, **kwargs) on the worker pool and return its Job.
+        Whatever fn returns is stored as the job's result; fn can report
+        progress with job.set_progress().
+        """
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Too many background jobs queued (limit {self.max_pending})")
+            self._pending += 1
+
+        job = Job.create(job_type)
+        try:
+            executor.submit(self._run, job, fn, args, kwargs)
+        except Exception:
+            self._done()
+            raise
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        """Execute a job and persist its outcome"""
+        try:
+            job.mark_running()
+            result = fn(job, *args, **kwargs)
+            job.complete(result)
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} ({job.job_type}) failed")
+            try:
+                job.fail(e)
+            except Exception:
+                logger.exception(f"Could not record failure of job {job.job_id}")
+        finally:
+            self._done()
+
+    def _done(self):
+        """Release a pending slot"""
+        with self._lock:
+            self._pending -= 1
+
+# Create a singleton instance
+job_service = JobService()
@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+from collections import Counter
+from services.auth_service import AuthService
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RequestProfile:
+    """Wall-clock stack samples and DynamoDB call timings for one request"""
+
+    def __init__(self, label, reason, interval):
+        self.profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"  # Sorts by start time
+        self.label = label
+        self.reason = reason
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.dynamodb_calls = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self._sampler.start()
+
+    def _sample(self):
+        """Poll the request thread's stack until stopped (includes time spent waiting on I/O)"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            names.append(self.label)
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self):
+        """Stop sampling and fix the request's wall-clock duration"""
+        self.duration = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+
+    def collapsed(self):
+        """Samples in collapsed-stack format (one `a;b;c count` line per stack), for flamegraph tools"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, status_code=None):
+        """Metadata, wall-clock and DynamoDB timings"""
+        dynamodb_ms = sum(call['ms'] for call in self.dynamodb_calls)
+        return {
+            'profile_id': self.profile_id,
+            'request': self.label,
+            'reason': self.reason,
+            'status': status_code,
+            'started_at': int(self.started_at),
+            'wall_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'dynamodb_ms': round(dynamodb_ms, 3),
+            'dynamodb_calls': self.dynamodb_calls,
+            'samples': sum(self.stacks.values()),
+            'sample_interval_ms': self.interval * 1000
+        }
+
+class ProfilingService:
+    def __init__(self):
+        """Initialize the opt-in request profiler"""
+        self.profile_dir = Config.PROFILE_DIR
+        self.max_files = Config.PROFILE_MAX_FILES
+        self.sample_rate = Config.PROFILE_SAMPLE_RATE
+        self.interval = Config.PROFILE_INTERVAL_MS / 1000.0
+        self._local = threading.local()
+        self._clients = set()
+
+    def instrument_client(self, client):
+        """Time every DynamoDB call a botocore client makes for the profiled request"""
+        if id(client) in self._clients:
+            return
+        self._clients.add(id(client))
+        client.meta.events.register('before-parameter-build.dynamodb', self._before_call)
+        client.meta.events.register('after-call.dynamodb', self._after_call)
+
+    def _before_call(self, params, model, context, **kwargs):
+        """botocore hook: note when a call starts (context is shared with after-call)"""
+        if getattr(self._local, 'profile', None) is not None:
+            context['profile_call'] = (time.perf_counter(), params.get('TableName'), params.get('IndexName'))
+
+    def _after_call(self, model, context, http_response=None, **kwargs):
+        """botocore hook: record how long the call took, retries included"""
+        profile = getattr(self._local, 'profile', None)
+        started = context.get('profile_call')
+        if profile is None or started is None:
+            return
+        start, table, index = started
+        call = {
+            'operation': model.name,
+            'table': table,
+            'ms': round((time.perf_counter() - start) * 1000, 3),
+            'status': getattr(http_response, 'status_code', None)
+        }
+        if index:
+            call['index'] = index
+        profile.dynamodb_calls.append(call)
+
+    def should_profile(self, request):
+        """Why to profile this request ('requested' or 'sampled'), or None"""
+        flag = request.headers.get('X-Profile') == '1' or request.args.get('_profile') == '1'
+        if flag and self._is_admin(request):
+            return 'requested'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    def start(self, request):
+        """Begin profiling the current request if it opted in or was sampled"""
+        reason = self.should_profile(request)
+        if not reason:
+            return None
+        rule = request.url_rule.rule if request.url_rule else request.path
+        self._local.profile = RequestProfile(f"{request.method} {rule}", reason, self.interval)
+        return self._local.profile
+
+    def finish(self, status_code=None):
+        """Stop the current request's profile (if any) and write it out; returns the profile"""
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            return None
+        self._local.profile = None
+        profile.stop()
+        try:
+            self._write(profile, status_code)
+        except Exception as e:
+            # Profiling must never break the request it observed
+            logger.error(f"Could not write profile {profile.profile_id}: {e}")
+        return profile
+
+    def _write(self, profile, status_code):
+        """Store the summary and collapsed stacks, dropping the oldest profiles past PROFILE_MAX_FILES"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, profile.profile_id)
+        with open(base + '.collapsed', 'w') as out:
+            out.write(profile.collapsed())
+        with open(base + '.json', 'w') as out:
+            json.dump(profile.summary(status_code), out)
+
+        profile_ids = self.list_ids()
+        for old_id in profile_ids[self.max_files:]:
+            for suffix in ('.json', '.collapsed'):
+                try:
+                    os.remove(os.path.join(self.profile_dir, old_id + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def list_ids(self):
+        """Stored profile IDs, newest first"""
+        if not os.path.isdir(self.profile_dir):
+            return []
+        ids = [name[:-5] for name in os.listdir(self.profile_dir) if name.endswith('.json')]
+        return sorted(ids, reverse=True)
+
+    def get_summary(self, profile_id):
+        """A stored profile's summary, or None"""
+        path = self.path(profile_id, '.json')
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def path(self, profile_id, suffix):
+        """File path for a profile ID, or None if the ID isn't one of ours"""
+        if not profile_id or os.path.basename(profile_id) != profile_id or profile_id.startswith('.'):
+            return None
+        return os.path.join(self.profile_dir, profile_id + suffix)
+
+    @staticmethod
+    def _is_admin(request):
+        """Only admins may ask for a profile"""
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return False
+        return AuthService.validate_token(auth_header.split(' ')[1]) is not None
+
+# Create a singleton instance
+profiling_service = ProfilingService()
@@ -0,0 +1,204 @@
+import logging
+import numpy as np
+from services.db_service import db_service
+from services import single_table
+from models.rating import Rating, team_identity
+from boto3.dynamodb.conditions import Attr
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RatingService:
+    def __init__(self):
+        """Initialize the Elo rating engine"""
+        self.initial = Config.RATING_INITIAL
+        self.k_factor = Config.RATING_K_FACTOR
+
+    @staticmethod
+    def expected_score(rating_a, rating_b):
+        """Probability that a team rated rating_a beats one rated rating_b (works on arrays too)"""
+        return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+
+    def record_result(self, match):
+        """Incrementally update both teams' ratings for a completed match"""
+        try:
+            self._record_result(match)
+        except Exception as e:
+            # Scoring must never fail because of ratings; a recompute fixes drift
+            logger.error(f"Error updating ratings for match {match.match_id}: {e}")
+
+    def _record_result(self, match, attempts=3):
+        if not match.team1_id or not match.team2_id or match.score_team1 == match.score_team2:
+            return  # Byes and unfinished/tied matches don't count
+
+        name1 = match.team1_name or self._team_name(match.team1_id)
+        name2 = match.team2_name or self._team_name(match.team2_id)
+        identity1, identity2 = team_identity(name1), team_identity(name2)
+        if not identity1 or not identity2 or identity1 == identity2:
+            return
+
+        team1_won = match.score_team1 > match.score_team2
+        for _ in range(attempts):
+            ratings = Rating.get_many([identity1, identity2])
+            rating1 = ratings.get(identity1) or Rating(identity1, name1)
+            rating2 = ratings.get(identity2) or Rating(identity2, name2)
+            played1, played2 = rating1.matches_played, rating2.matches_played
+
+            delta = self.k_factor * ((1.0 if team1_won else 0.0) - self.expected_score(rating1.rating, rating2.rating))
+            rating1.rating += delta
+            rating2.rating -= delta
+            for rating, name, won in ((rating1, name1, team1_won), (rating2, name2, not team1_won)):
+                rating.display_name = name
+                rating.matches_played += 1
+                rating.wins += int(won)
+                rating.losses += int(not won)
+
+            # Optimistic concurrency: both ratings commit together, or neither does and we retry
+            client = db_service.dynamodb.meta.client
+            try:
+                Rating.save_together([(rating1, played1), (rating2, played2)])
+                return
+            except client.exceptions.TransactionCanceledException as e:
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if any(code not in (None, 'None', 'ConditionalCheckFailed', 'TransactionConflict') for code in reasons):
+                    raise
+                # Another worker rated either team meanwhile; read both again
+        logger.warning(f"Gave up updating ratings for match {match.match_id} after {attempts} attempts")
+
+    def recompute_all(self, job=None):
+        """
+        Rebuild every rating from the full match history. Matches are replayed
+        in chronological order, grouped into waves where no team plays twice;
+        each wave is then one vectorised Elo update. Since a team's matches
+        land in successive waves, this gives exactly the sequential result.
+        """
+        items = self._completed_match_items()
+        names = {}
+        missing = any(not item.get('team1_name') or not item.get('team2_name') for item in items)
+        team_names = self._all_team_names() if missing else {}
+
+        # Chronological order: completion time, falling back to schedule and round
+        items.sort(key=lambda item: (
+            int(item.get('completed_at') or item.get('scheduled_time') or 0),
+            int(item.get('round_number') or 0)
+        ))
+
+        index = {}
+        team_a, team_b, a_won = [], [], []
+        for item in items:
+            name1 = item.get('team1_name') or team_names.get(item.get('team1_id'))
+            name2 = item.get('team2_name') or team_names.get(item.get('team2_id'))
+            identity1, identity2 = team_identity(name1), team_identity(name2)
+            if not identity1 or not identity2 or identity1 == identity2:
+                continue
+            score1, score2 = item.get('score_team1') or 0, item.get('score_team2') or 0
+            if score1 == score2:
+                continue
+            for identity, name in ((identity1, name1), (identity2, name2)):
+                if identity not in index:
+                    index[identity] = len(index)
+                names[identity] = name  # Latest spelling wins
+            team_a.append(index[identity1])
+            team_b.append(index[identity2])
+            a_won.append(score1 > score2)
+
+        if job:
+            job.set_progress(30)
+
+        ratings, wins, played = self._replay(np.array(team_a, dtype=np.int64), np.array(team_b, dtype=np.int64),
+                                             np.array(a_won, dtype=bool), len(index))
+
+        if job:
+            job.set_progress(60)
+
+        identities = list(index)
+        Rating.save_all(
+            Rating(identity, names[identity], float(ratings[i]), int(played[i]), int(wins[i]), int(played[i] - wins[i]))
+            for i, identity in enumerate(identities)
+        )
+        return {'matches': len(team_a), 'teams': len(identities)}
+
+    def _replay(self, team_a, team_b, a_won, num_teams):
+        """Vectorised Elo replay over matches already in chronological order"""
+        ratings = np.full(num_teams, self.initial, dtype=np.float64)
+        wins = np.bincount(np.where(a_won, team_a, team_b), minlength=num_teams)
+        played = np.bincount(np.concatenate([team_a, team_b]), minlength=num_teams)
+        if not len(team_a):
+            return ratings, wins, played
+
+        # wave[i] = 1 + the latest wave either team already played in
+        last_wave = [0] * num_teams
+        waves = np.empty(len(team_a), dtype=np.int64)
+        for i, (a, b) in enumerate(zip(team_a.tolist(), team_b.tolist())):
+            wave = max(last_wave[a], last_wave[b]) + 1
+            last_wave[a] = last_wave[b] = wave
+            waves[i] = wave
+
+        order = np.argsort(waves, kind='stable')
+        boundaries = np.flatnonzero(np.diff(waves[order])) + 1
+        outcome = a_won.astype(np.float64)
+        for group in np.split(order, boundaries):
+            a, b = team_a[group], team_b[group]
+            delta = self.k_factor * (outcome[group] - self.expected_score(ratings[a], ratings[b]))
+            # No team appears twice within a wave, so plain fancy-index updates are safe
+            ratings[a] += delta
+            ratings[b] -= delta
+        return ratings, wins, played
+
+    def seed_order(self, teams):
+        """Order (team_id, team_name) pairs by rating, best first; unrated teams keep their order"""
+        identities = [team_identity(name) for _, name in teams]
+        ratings = Rating.get_many(identities)
+        order = sorted(
+            range(len(teams)),
+            key=lambda i: -(ratings[identities[i]].rating if identities[i] in ratings else self.initial)
+        )
+        return [teams[i][0] for i in order]
+
+    def ratings_for(self, teams):
+        """Current rating of each (team_id, team_name) pair, keyed by team_id"""
+        identities = {team_id: team_identity(name) for team_id, name in teams}
+        ratings = Rating.get_many(identities.values())
+        return {
+            team_id: ratings[identity].rating if identity in ratings else self.initial
+            for team_id, identity in identities.items()
+        }
+
+    @staticmethod
+    def _completed_match_items():
+        """Every completed match, with just the attributes the replay needs"""
+        projection = ('team1_id, team2_id, team1_name, team2_name, score_team1, score_team2, '
+                      'completed_at, scheduled_time, round_number')
+        if db_service.single_table_enabled:
+            items = single_table.scan_entities(
+                'match',
+                ProjectionExpression=projection + ', #status',
+                ExpressionAttributeNames={'#status': 'status'}
+            )
+            return [item for item in items if item.get('status') == 'completed']
+        return db_service.scan_all(
+            db_service.matches_table,
+            FilterExpression=Attr('status').eq('completed'),
+            ProjectionExpression=projection
+        )
+
+    @staticmethod
+    def _all_team_names():
+        """team_id -> team_name for matches stored before names were denormalised"""
+        if db_service.single_table_enabled:
+            items = single_table.scan_entities('team', ProjectionExpression='team_id, team_name')
+        else:
+            items = db_service.scan_all(db_service.teams_table, ProjectionExpression='team_id, team_name')
+        return {item['team_id']: item.get('team_name') for item in items}
+
+    @staticmethod
+    def _team_name(team_id):
+        """Look up one team's name for a match that predates denormalised names"""
+        if db_service.single_table_enabled:
+            item = single_table.get_by_entity_id(team_id)
+        else:
+            item = db_service.teams_table.get_item(Key={'team_id': team_id}).get('Item')
+        return item.get('team_name') if item else None
+
+# Create a singleton instance
+rating_service = RatingService()
@@ -0,0 +1,249 @@
+import time
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+from models.match import Match
+from services.change_log import change_log, UPDATES_PER_TRANSACTION
+from services.serialization import to_number
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Fields that move edges of the graph; a change to one relinks it
+STRUCTURE_FIELDS = ('court', 'scheduled_time', 'next_match_id', 'round_number', 'position')
+# Fields the projection reads
+TIMING_FIELDS = ('status', 'started_at', 'completed_at', 'projected_time')
+
+class ScheduleNode:
+    """One match in the schedule graph"""
+    __slots__ = ('match_id', 'round_number', 'position', 'court', 'scheduled_time', 'next_match_id',
+                 'status', 'started_at', 'completed_at', 'projected_time', 'finish', 'predecessors',
+                 'successors')
+
+    def __init__(self, item):
+        self.match_id = item['match_id']
+        self.finish = None  # Projected end, set by propagation
+        self.predecessors = []
+        self.successors = []
+        for field in STRUCTURE_FIELDS + TIMING_FIELDS:
+            setattr(self, field, None)
+            self.set(field, item.get(field))
+        if self.projected_time is None:
+            self.projected_time = self.scheduled_time  # Never projected: on time, as Match reads it
+
+    def set(self, field, value):
+        """Store a field from an item or change record; returns whether it changed"""
+        if field == 'projected_time':
+            value = to_number(value)
+        elif field in ('scheduled_time', 'started_at', 'completed_at', 'round_number', 'position'):
+            value = None if value is None else int(value)
+        elif field == 'status':
+            value = value or 'scheduled'
+        if getattr(self, field) == value:
+            return False
+        setattr(self, field, value)
+        return True
+
+    def order(self):
+        """Sort key that puts every node after all of its predecessors"""
+        return (self.round_number or 0, self.scheduled_time or 0, self.match_id)
+
+class ScheduleGraph:
+    """
+    A tournament's matches as a DAG. A match waits for the matches that feed
+    it (bracket edges, from next_match_id) and for the match before it on its
+    court (court edges, in schedule order). A court edge that would point back
+    to an earlier round is left out: it can only come from a schedule that
+    contradicts the bracket, and dropping it keeps the graph acyclic, with
+    (round, scheduled time) as a topological order.
+    """
+
+    def __init__(self, items, duration, rounding):
+        self.duration = duration
+        self.rounding = rounding
+        self.nodes = {item['match_id']: ScheduleNode(item) for item in items}
+        self.link()
+
+    def link(self):
+        """(Re)build every edge from the nodes' fields"""
+        courts = {}
+        for node in self.nodes.values():
+            node.predecessors, node.successors = [], []
+            if node.court not in (None, ''):
+                courts.setdefault(str(node.court), []).append(node)
+        for node in self.nodes.values():
+            parent = self.nodes.get(node.next_match_id)
+            if parent is not None:
+                self._edge(node, parent)
+        for sequence in courts.values():
+            sequence.sort(key=lambda node: (node.scheduled_time or 0, node.match_id))
+            for before, after in zip(sequence, sequence[1:]):
+                if (before.round_number or 0) <= (after.round_number or 0):
+                    self._edge(before, after)
+
+    @staticmethod
+    def _edge(before, after):
+        """`after` can't start until `before` has finished"""
+        before.successors.append(after)
+        after.predecessors.append(before)
+
+    def apply(self, changes):
+        """
+        Apply change feed records to the nodes. Returns the nodes to
+        propagate from, or None when a record names a match the graph doesn't
+        know (the caller rebuilds instead).
+        """
+        sources, relink = {}, False
+        for change in changes:
+            node = self.nodes.get(change['match_id'])
+            if node is None:
+                return None
+            for field, value in change['fields'].items():
+                if field in STRUCTURE_FIELDS or field in TIMING_FIELDS:
+                    if node.set(field, value) and field != 'projected_time':
+                        sources[node.match_id] = node
+                        relink = relink or field in STRUCTURE_FIELDS
+            if node.status == 'in_progress' and set(change['fields']) != {'projected_time'}:
+                # A score update says the match is still on at this time, which may push its end back
+                sources[node.match_id] = node
+        if relink:
+            # Court neighbours shift when a match moves; edge changes are rare, so redo them all
+            self.link()
+            return list(self.nodes.values())
+        return list(sources.values())
+
+    def propagate(self, sources, now):
+        """
+        Recompute projected starts from `sources` downstream, in topological
+        order, stopping wherever a match's projected end doesn't move. Only
+        matches reachable from a change are visited. Returns the nodes whose
+        projected_time changed.
+        """
+        heap = [(node.order(), node.match_id) for node in sources]
+        heapq.heapify(heap)
+        queued = {node.match_id for node in sources}
+        changed = []
+        while heap:
+            _, match_id = heapq.heappop(heap)
+            node = self.nodes[match_id]
+            queued.discard(match_id)
+            start, finish = self._project(node, now)
+            if start != node.projected_time:
+                node.projected_time = start
+                changed.append(node)
+            if finish == node.finish:
+                continue
+            node.finish = finish
+            for successor in node.successors:
+                if successor.match_id not in queued:
+                    queued.add(successor.match_id)
+                    heapq.heappush(heap, (successor.order(), successor.match_id))
+        return changed
+
+    def _project(self, node, now):
+        """(projected start, projected end) of a match, given its predecessors' ends"""
+        if node.status == 'completed':
+            start = node.started_at or node.projected_time or node.scheduled_time or 0
+            return start, node.completed_at or start + self.duration
+        if node.status == 'in_progress' and node.started_at:
+            # A match running long is expected to finish no earlier than now
+            return node.started_at, max(node.started_at + self.duration, now)
+
+        scheduled = node.scheduled_time or 0
+        start = scheduled
+        for predecessor in node.predecessors:
+            if predecessor.finish is not None and predecessor.finish > start:
+                start = predecessor.finish
+        if start > scheduled:
+            start = -(-start // self.rounding) * self.rounding
+        return start, start + self.duration
+
+class ScheduleService:
+    def __init__(self):
+        """Initialize the projected start time engine"""
+        self.duration = Config.SCHEDULE_MATCH_MINUTES * 60
+        self.rounding = max(Config.SCHEDULE_ROUNDING, 1)
+        self.cache_size = Config.SCHEDULE_CACHE_SIZE
+        self._graphs = OrderedDict()  # tournament_id -> (change log seq, graph)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, tournament_id):
+        """
+        Bring a tournament's projected start times up to date after match
+        writes. The graph is kept per process and caught up from the change
+        feed, so an event only touches the matches downstream of what
+        changed. Best effort: errors are logged, and the graph is rebuilt
+        next time. Returns {match_id: projected_time} for the matches that moved.
+        """
+        try:
+            return self._refresh(tournament_id)
+        except Exception as e:
+            logger.error(f"Error projecting start times for tournament {tournament_id}: {e}")
+            with self._lock:
+                self._graphs.pop(tournament_id, None)
+            return {}
+
+    def _refresh(self, tournament_id):
+        with self._lock:
+            lock = self._locks.setdefault(tournament_id, threading.Lock())
+
+        # One thread per tournament at a time; the others find the graph caught up
+        with lock:
+            with self._lock:
+                cached = self._graphs.get(tournament_id)
+
+            sources = None
+            if cached is not None:
+                seq, graph = cached
+                feed = change_log.changes_since(tournament_id, seq)
+                if not feed['resync']:
+                    seq = feed['seq']
+                    sources = graph.apply(feed['changes'])
+            if sources is None:
+                # Read the counter first, so changes made during the query are replayed next time
+                seq = change_log.last_seq(tournament_id)
+                graph = ScheduleGraph(Match.query_items(tournament_id), self.duration, self.rounding)
+                sources = list(graph.nodes.values())
+
+            changed = graph.propagate(sources, int(time.time()))
+            self._save(tournament_id, changed)
+
+            # Our own records come back through the feed and match the graph, so they're no-ops
+            with self._lock:
+                self._graphs[tournament_id] = (seq, graph)
+                self._graphs.move_to_end(tournament_id)
+                while len(self._graphs) > self.cache_size:
+                    old_id, _ = self._graphs.popitem(last=False)
+                    self._locks.pop(old_id, None)
+        return {node.match_id: node.projected_time for node in changed}
+
+    @staticmethod
+    def _save(tournament_id, nodes):
+        """Write new projected times as logged updates, so only that attribute is touched"""
+        table_name = Match._table().name
+        for start in range(0, len(nodes), UPDATES_PER_TRANSACTION):
+            chunk = nodes[start:start + UPDATES_PER_TRANSACTION]
+            operations, changes = [], []
+            for node in chunk:
+                key = Match(match_id=node.match_id, tournament_id=tournament_id,
+                            round_number=node.round_number, position=node.position)._key()
+                operations.append({'Update': {
+                    'TableName': table_name,
+                    'Key': key,
+                    'UpdateExpression': 'SET projected_time = :time',
+                    'ConditionExpression': 'attribute_exists(match_id)',
+                    'ExpressionAttributeValues': {':time': node.projected_time}
+                }})
+                changes.append({'match_id': node.match_id, 'fields': {'projected_time': node.projected_time}})
+            change_log.write(tournament_id, operations, changes)
+
+    def project_items(self, items, now=None):
+        """Projected start of every match item, computed from scratch (for tools and benchmarks)"""
+        graph = ScheduleGraph(items, self.duration, self.rounding)
+        graph.propagate(list(graph.nodes.values()), int(now or time.time()))
+        return {match_id: node.projected_time for match_id, node in graph.nodes.items()}
+
+# Create a singleton instance
+schedule_service = ScheduleService()
@@ -0,0 +1,263 @@
+import re
+import sys
+import time
+import bisect
+import logging
+import threading
+from array import array
+from services.db_service import db_service
+from boto3.dynamodb.conditions import Attr
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text):
+    """Lowercased word tokens of a name, interned so every copy shares one string"""
+    if not text:
+        return []
+    return [sys.intern(token) for token in TOKEN_PATTERN.findall(text.casefold())]
+
+class TeamIndex:
+    """
+    Inverted index over team names and player names. Each team is a
+    document number; each term maps to an array of document numbers in
+    ascending order, and the sorted term list answers prefix lookups with
+    a binary search. Removed teams leave a hole that queries skip until
+    the index is compacted.
+    """
+
+    def __init__(self):
+        self.docs = []      # Document number -> (team_id, team_name, tournament_id, players, tokens), None once removed
+        self.doc_of = {}    # team_id -> document number
+        self.postings = {}  # Term -> array('I') of document numbers
+        self.terms = []     # Every term, sorted
+        self.by_tournament = {}  # tournament_id -> array('I') of document numbers
+        self.removed = 0
+
+    def add(self, team, bulk=False):
+        """Index a team dict, replacing any earlier version (bulk=True leaves sorting terms to finish())"""
+        team_id = team.get('team_id')
+        if not team_id:
+            return
+        self.remove(team_id)
+
+        intern = sys.intern
+        players = tuple(intern(player) for player in team.get('players') or () if player)
+        team_name = intern(team.get('team_name') or '')
+        tournament_id = intern(team.get('tournament_id') or '')
+        # Tokens per field (the team name, then each player), kept for matching multi-word queries
+        tokens = tuple(tuple(tokenize(field)) for field in (team_name,) + players)
+        record = (intern(team_id), team_name, tournament_id, players, tokens)
+        doc = len(self.docs)
+        self.docs.append(record)
+        self.doc_of[record[0]] = doc
+        self.by_tournament.setdefault(tournament_id, array('I')).append(doc)
+
+        terms = set()
+        for field_tokens in tokens:
+            terms.update(field_tokens)
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = array('I')
+                if not bulk:
+                    bisect.insort(self.terms, term)
+            postings.append(doc)
+
+    def finish(self):
+        """Sort the term list after a bulk load"""
+        self.terms = sorted(self.postings)
+
+    def remove(self, team_id):
+        """Drop a team from search results"""
+        doc = self.doc_of.pop(team_id, None)
+        if doc is not None:
+            self.docs[doc] = None
+            self.removed += 1
+
+    def needs_compaction(self):
+        """Whether holes left by removed teams outnumber the live teams"""
+        return self.removed > 1000 and self.removed * 2 > len(self.docs)
+
+    def search(self, query, limit, tournament_id=None):
+        """
+        Teams whose name, or one of whose players, has a word starting
+        with each query word. Candidates come from the postings of the
+        longest query word in term order (or from the tournament's teams),
+        and the walk stops as soon as `limit` teams match, so typeahead
+        cost doesn't grow with the number of teams indexed.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        results = []
+        for doc in (self._tournament_docs(tournament_id) if tournament_id else self._candidates(max(words, key=len))):
+            record = self.docs[doc]
+            if record is None:
+                continue
+            matched = _matching_field(record, words)
+            if matched is None:
+                continue
+            results.append({
+                'team_id': record[0],
+                'team_name': record[1],
+                'tournament_id': record[2],
+                'players': list(record[3]),
+                'matched': matched
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def _candidates(self, prefix):
+        """Documents with a term starting with `prefix`, each once, in term order"""
+        seen = set()
+        terms = self.terms
+        for position in range(bisect.bisect_left(terms, prefix), len(terms)):
+            term = terms[position]
+            if not term.startswith(prefix):
+                return
+            for doc in self.postings[term]:
+                if doc not in seen:
+                    seen.add(doc)
+                    yield doc
+
+    def _tournament_docs(self, tournament_id):
+        """A tournament's documents; a tournament only has a few dozen teams, so these are just checked one by one"""
+        return self.by_tournament.get(tournament_id, ())
+
+    def live_docs(self):
+        """Records of every team still in the index"""
+        return [record for record in self.docs if record is not None]
+
+def _matching_field(record, words):
+    """The team name or player name in which every query word starts a word, or None"""
+    for field, tokens in zip((record[1],) + record[3], record[4]):
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            return field
+    return None
+
+class TeamSearchService:
+    def __init__(self):
+        """Initialize the per-process team search index (built on first use)"""
+        self.max_age = Config.SEARCH_INDEX_MAX_AGE
+        self.max_limit = Config.SEARCH_MAX_LIMIT
+        self._index = None
+        self._built_at = None
+        self._rebuilding = False
+        self._pending = None  # Writes made while a rebuild scans, replayed onto the new index
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def search(self, query, limit=10, tournament_id=None):
+        """Typeahead search over team and player names, across every tournament"""
+        self._ensure_built()
+        limit = max(1, min(limit, self.max_limit))
+        with self._lock:
+            return self._index.search(query, limit, tournament_id)
+
+    def add(self, team):
+        """Index a new or updated team (a Team or a team dict)"""
+        self._apply('add', team.to_dict() if hasattr(team, 'to_dict') else team)
+
+    def remove(self, team_id):
+        """Drop a deleted team"""
+        self._apply('remove', team_id)
+
+    def remove_tournament(self, tournament_id):
+        """Drop every team of a deleted tournament"""
+        with self._lock:
+            if self._index is None:
+                return
+            team_ids = [record[0] for record in self._index.live_docs() if record[2] == tournament_id]
+        for team_id in team_ids:
+            self.remove(team_id)
+
+    def _apply(self, operation, value):
+        """Apply a write to the index, if it has been built (otherwise the build will read it)"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((operation, value))
+            if self._index is None:
+                return
+            if operation == 'add':
+                self._index.add(value)
+            else:
+                self._index.remove(value)
+            compact = self._index.needs_compaction()
+        if compact:
+            self._start_rebuild()
+
+    def _ensure_built(self):
+        """Build the index on first use; afterwards refresh it in the background once it's old"""
+        if self._index is None:
+            with self._build_lock:
+                if self._index is None:
+                    self._rebuild()
+        elif self.max_age and time.time() - self._built_at > self.max_age:
+            self._start_rebuild()
+
+    def _start_rebuild(self):
+        """Rebuild on a background thread while queries keep using the current index"""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._background_rebuild, name='team-search-rebuild', daemon=True).start()
+
+    def _background_rebuild(self):
+        """Thread body for _start_rebuild"""
+        try:
+            with self._build_lock:
+                self._rebuild()
+        except Exception as e:
+            logger.error(f"Rebuilding the team search index failed: {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _rebuild(self):
+        """Load every team page by page into a fresh index, then swap it in (call with _build_lock held)"""
+        with self._lock:
+            self._pending = []
+        started = time.time()
+        index = TeamIndex()
+        table, kwargs = self._scan_args()
+        try:
+            for page in db_service.scan_pages(table, **kwargs):
+                for item in page:
+                    index.add(item, bulk=True)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        index.finish()
+
+        with self._lock:
+            for operation, value in self._pending:
+                if operation == 'add':
+                    index.add(value)
+                else:
+                    index.remove(value)
+            self._pending = None
+            self._index = index
+            self._built_at = started
+        logger.info(f"Team search index built: {len(index.doc_of)} teams, {len(index.terms)} terms "
+                    f"in {time.time() - started:.2f}s")
+
+    @staticmethod
+    def _scan_args():
+        """(table, scan kwargs) reading just the indexed attributes of every team"""
+        kwargs = {
+            'ProjectionExpression': 'team_id, team_name, tournament_id, players'
+        }
+        if db_service.single_table_enabled:
+            kwargs['FilterExpression'] = Attr('entity_type').eq('team')
+            return db_service.single_table, kwargs
+        return db_service.teams_table, kwargs
+
+# Create a singleton instance
+team_search = TeamSearchService()
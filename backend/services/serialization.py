@@ -0,0 +1,79 @@
+from decimal import Decimal
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library json is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: clients asking for MessagePack get JSON instead
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+def to_number(value):
+    """A DynamoDB Decimal as an int or float; anything else unchanged"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+def to_dynamo(value):
+    """A value (nested dicts and lists included) with floats as Decimals, since DynamoDB rejects floats"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {key: to_dynamo(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamo(item) for item in value]
+    return value
+
+def encode_default(value):
+    """Encode the types DynamoDB hands back: Decimals become ints or floats, sets become lists"""
+    if isinstance(value, Decimal):
+        return to_number(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return DefaultJSONProvider.default(value)
+
+def wants_msgpack():
+    """Whether the current request prefers MessagePack over JSON (JSON wins ties, e.g. */*)"""
+    if msgpack is None or not has_request_context():
+        return False
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson (in C, Decimals included)
+    and answers MessagePack to clients that ask for it. Keys aren't sorted;
+    sorting is what the default provider spends most of its time on.
+    """
+    default = staticmethod(encode_default)
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=encode_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if wants_msgpack():
+            response = self._app.response_class(
+                msgpack.packb(obj, default=encode_default, use_bin_type=True),
+                mimetype=MSGPACK_MIMETYPES[0]
+            )
+        elif orjson is not None and not (self.compact is False or (self.compact is None and self._app.debug)):
+            body = orjson.dumps(obj, default=encode_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            response = self._app.response_class(body, mimetype=self.mimetype)
+        else:
+            response = super().response(obj)  # Indented output in debug mode
+        # Caches must keep the JSON and MessagePack copies apart
+        response.vary.add('Accept')
+        return response
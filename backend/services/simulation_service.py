@@ -0,0 +1,164 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from models.bracket import Bracket
+from models.match import Match
+from services.rating_service import rating_service
+from config import Config
+
+class SimulationService:
+    def __init__(self):
+        """Initialize the Monte Carlo bracket simulator"""
+        self.default_simulations = Config.PROJECTION_SIMULATIONS
+        self.max_simulations = Config.PROJECTION_MAX_SIMULATIONS
+        self.batch_size = Config.PROJECTION_BATCH_SIZE
+        self.cache_size = Config.PROJECTION_CACHE_SIZE
+        self._cache = OrderedDict()  # (tournament_id, simulations) -> (version, result)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get_projections(self, tournament_id, simulations=None):
+        """
+        Per-team probabilities of reaching each round and winning the title.
+        Results are cached per bracket version, which only changes when a
+        match completes (or a team is placed), so repeated reads just cost
+        one match query.
+        """
+        simulations = min(simulations or self.default_simulations, self.max_simulations)
+        bracket = Bracket.from_items(Match.query_items(tournament_id))
+        version = self.bracket_version(bracket)
+        key = (tournament_id, simulations)
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        # One request computes a new version; concurrent ones wait and reuse it
+        with lock:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached and cached[0] == version:
+                    self._cache.move_to_end(key)
+                    return cached[1]
+
+            result = self.simulate(bracket, simulations, seed=int(version[:16], 16))
+            result['version'] = version
+
+            with self._lock:
+                self._cache[key] = (version, result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    old_key, _ = self._cache.popitem(last=False)
+                    self._locks.pop(old_key, None)
+        return result
+
+    @staticmethod
+    def bracket_version(bracket):
+        """Fingerprint of everything that affects a simulation: who is where, and who won"""
+        digest = hashlib.sha1()
+        for index, match in enumerate(bracket.slots):
+            if match is None:
+                continue
+            winner = ''
+            if match.status == 'completed':
+                winner = 1 if match.score_team1 > match.score_team2 else 2
+            digest.update(f'{index}|{match.team1_id}|{match.team2_id}|{winner};'.encode())
+        return digest.hexdigest()
+
+    def simulate(self, bracket, simulations, seed=None):
+        """
+        Play out the rest of a bracket `simulations` times. Each round is one
+        array operation over every match in the round and every simulation,
+        so the Python-level work is per round, not per game.
+        """
+        teams = {}  # team_id -> (index, name)
+        for match in bracket.slots:
+            if match is None:
+                continue
+            for team_id, name in ((match.team1_id, match.team1_name), (match.team2_id, match.team2_name)):
+                if team_id and team_id not in teams:
+                    teams[team_id] = (len(teams), name)
+
+        num_teams = len(teams)
+        ratings = rating_service.ratings_for([(team_id, name) for team_id, (_, name) in teams.items()])
+        # The extra last entry stands in for "nobody" (index -1), e.g. an empty bye slot
+        strength = np.full(num_teams + 1, Config.RATING_INITIAL, dtype=np.float64)
+        for team_id, (index, _) in teams.items():
+            strength[index] = ratings[team_id]
+
+        reached = np.zeros((bracket.num_rounds + 1, num_teams + 1), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        remaining = simulations
+        while remaining > 0:
+            batch = min(remaining, self.batch_size)
+            self._simulate_batch(bracket, teams, strength, reached, batch, rng)
+            remaining -= batch
+
+        result = []
+        for team_id, (index, name) in teams.items():
+            probabilities = reached[:, index] / simulations
+            result.append({
+                'team_id': team_id,
+                'team_name': name,
+                'rating': round(float(strength[index]), 2),
+                'rounds': {str(r): round(float(probabilities[r]), 4) for r in range(1, bracket.num_rounds)},
+                'final': round(float(probabilities[bracket.num_rounds]), 4),
+                'champion': round(float(probabilities[0]), 4)
+            })
+        result.sort(key=lambda entry: (-entry['champion'], -entry['final']))
+        return {'simulations': simulations, 'teams': result}
+
+    def _simulate_batch(self, bracket, teams, strength, reached, batch, rng):
+        """Simulate one batch of completions, adding round appearances to `reached` (row 0 = titles)"""
+        nobody = np.full(batch, -1, dtype=np.int64)
+        winners = {}  # bracket index -> winner per simulation
+
+        def fixed(team_id):
+            return np.full(batch, teams[team_id][0], dtype=np.int64) if team_id else None
+
+        for round_number in range(1, bracket.num_rounds + 1):
+            width = 1 << (bracket.num_rounds - round_number)
+            indexes, first, second = [], [], []
+            for index in range(width, width * 2):
+                match = bracket.slots[index]
+                if match is None:
+                    continue
+                # Placed teams are certain; open slots are filled by unfinished feeder matches
+                entrants = [entrant for entrant in (fixed(match.team1_id), fixed(match.team2_id)) if entrant is not None]
+                if match.status != 'completed':
+                    for child in bracket.children(index):
+                        feeder = bracket.get(child)
+                        if feeder is not None and feeder.status != 'completed' and child in winners:
+                            entrants.append(winners[child])
+                entrants = (entrants + [nobody, nobody])[:2]
+
+                indexes.append(index)
+                first.append(entrants[0])
+                second.append(entrants[1])
+
+            if not indexes:
+                continue
+
+            a, b = np.stack(first), np.stack(second)
+            for side in (a, b):
+                reached[round_number] += np.bincount(side[side >= 0], minlength=reached.shape[1])
+
+            # Elo win probability for every (match, simulation) pair at once
+            p_a = rating_service.expected_score(strength[a], strength[b])
+            a_wins = rng.random(a.shape) < p_a
+            won = np.where(b < 0, a, np.where(a < 0, b, np.where(a_wins, a, b)))
+
+            # Already decided matches keep their real winner
+            for row, index in enumerate(indexes):
+                match = bracket.slots[index]
+                if match.status == 'completed':
+                    winner_id = match.team1_id if match.score_team1 > match.score_team2 else match.team2_id
+                    won[row] = teams[winner_id][0] if winner_id else -1
+                winners[index] = won[row]
+
+        champion = winners.get(1)
+        if champion is not None:
+            reached[0] += np.bincount(champion[champion >= 0], minlength=reached.shape[1])
+
+# Create a singleton instance
+simulation_service = SimulationService()
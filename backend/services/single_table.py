@@ -0,0 +1,79 @@
+from services.db_service import db_service
+from boto3.dynamodb.conditions import Attr, Key
+
+META_SK = 'META'
+TEAM_PREFIX = 'TEAM#'
+MATCH_PREFIX = 'MATCH#'
+
+def tournament_pk(tournament_id):
+    """Partition key shared by a tournament and all of its teams and matches"""
+    return f'TOURNAMENT#{tournament_id}'
+
+def team_sk(team_id):
+    """Sort key for a team item"""
+    return f'{TEAM_PREFIX}{team_id}'
+
+def match_sk(round_number, position, match_id):
+    """
+    Sort key for a match item. Zero padding keeps a partition query ordered
+    by round and then bracket position; matches without a slot sort last.
+    """
+    if round_number is None or position is None:
+        return f'{MATCH_PREFIX}~#{match_id}'
+    return f'{MATCH_PREFIX}{int(round_number):03d}#{int(position):05d}'
+
+def to_item(data, pk, sk, entity_type, entity_id):
+    """Add single-table keys to a model's attribute dict"""
+    item = dict(data)
+    item.update({
+        'PK': pk,
+        'SK': sk,
+        'entity_type': entity_type,
+        'entity_id': entity_id
+    })
+    return item
+
+def get_by_entity_id(entity_id, tournament_id=None):
+    """
+    Fetch an item by its match/team/tournament ID. The EntityIndex GSI that
+    maps the ID to its keys is eventually consistent, so an item written
+    moments ago may not be found yet. Callers that know the tournament pass
+    tournament_id, and its partition is read with a consistent query instead.
+    """
+    if tournament_id is not None:
+        items = query_partition(tournament_id, FilterExpression=Attr('entity_id').eq(entity_id))
+        return items[0] if items else None
+
+    response = db_service.single_table.query(
+        IndexName='EntityIndex',
+        KeyConditionExpression=Key('entity_id').eq(entity_id)
+    )
+    keys = response.get('Items', [])
+    if not keys:
+        return None
+
+    response = db_service.single_table.get_item(
+        Key={'PK': keys[0]['PK'], 'SK': keys[0]['SK']},
+        ConsistentRead=True
+    )
+    return response.get('Item')
+
+def query_partition(tournament_id, sk_prefix=None, **kwargs):
+    """Read a tournament's partition (optionally one entity type) in sort key order"""
+    condition = Key('PK').eq(tournament_pk(tournament_id))
+    if sk_prefix:
+        condition = condition & Key('SK').begins_with(sk_prefix)
+    return db_service.query_all(
+        db_service.single_table,
+        KeyConditionExpression=condition,
+        ConsistentRead=True,
+        **kwargs
+    )
+
+def scan_entities(entity_type, **kwargs):
+    """Scan the table for every item of one entity type"""
+    return db_service.scan_all(
+        db_service.single_table,
+        FilterExpression=Attr('entity_type').eq(entity_type),
+        **kwargs
+    )
@@ -0,0 +1,125 @@
+import sys
+from collections import defaultdict
+from services import matching
+
+class PairingError(Exception):
+    """Raised when a round can't be paired without rematches"""
+
+def standings(team_ids, match_items):
+    """
+    Swiss standings from a tournament's match items: points (a win or bye is
+    one point), Buchholz (sum of opponents' points) and seed, best first.
+    """
+    seeds = {team_id: i + 1 for i, team_id in enumerate(team_ids)}
+    points = dict.fromkeys(team_ids, 0)
+    opponents = defaultdict(set)
+    byes = set()
+
+    for item in match_items:
+        team1, team2 = item.get('team1_id'), item.get('team2_id')
+        for team_id, seed in ((team1, item.get('team1_seed')), (team2, item.get('team2_seed'))):
+            if team_id and seed is not None:
+                seeds[team_id] = int(seed)
+            if team_id:
+                points.setdefault(team_id, 0)
+        if team1 and team2:
+            opponents[team1].add(team2)
+            opponents[team2].add(team1)
+        elif team1 or team2:
+            byes.add(team1 or team2)
+
+        if item.get('status') == 'completed':
+            score1, score2 = item.get('score_team1') or 0, item.get('score_team2') or 0
+            winner = team1 if score1 > score2 else team2
+            if winner:
+                points[winner] += 1
+
+    table = []
+    for team_id, team_points in points.items():
+        buchholz = sum(points.get(opponent, 0) for opponent in opponents[team_id])
+        table.append({
+            'team_id': team_id,
+            'points': team_points,
+            'buchholz': buchholz,
+            'seed': seeds.get(team_id),
+            'played': len(opponents[team_id]),
+            'bye': team_id in byes,
+            'opponents': opponents[team_id]
+        })
+
+    table.sort(key=lambda row: (-row['points'], -row['buchholz'], row['seed'] or sys.maxsize))
+    return table
+
+# Sparse pairing graph: a team is first offered opponents at most this many
+# places away in the standings, in its own or an adjacent score group
+PAIRING_WINDOW = 12
+
+def pair_round(table):
+    """
+    Pair the next round from standings (best first). Returns (pairs, bye).
+
+    Every pairing that avoids rematches is a perfect matching on the graph
+    of teams that haven't met, so the round is a minimum cost perfect
+    matching there, found exactly by the blossom algorithm. A pair costs
+    the square of its points gap, weighted to outweigh everything else so
+    equal scores meet whenever possible, plus its rank distance, so teams
+    meet the nearest-ranked opponent the score groups allow. If the field
+    is odd, the bye is one more vertex, matched like an opponent ranked
+    below the last team and open only to teams without a bye yet (to
+    everyone once all have had one).
+
+    The blossom is cubic in the edges it is given, so it first runs on the
+    candidate pairs a Swiss round actually uses: the same or adjacent
+    score group, within PAIRING_WINDOW places (and the bye for the
+    PAIRING_WINDOW lowest teams that may take it). Only when that graph has
+    no perfect matching is every rematch-free pair offered. Raises
+    PairingError only when no rematch-free pairing exists.
+    """
+    order = [row['team_id'] for row in table]
+    opponents = {row['team_id']: row['opponents'] for row in table}
+
+    if not any(opponents[team_id] for team_id in order):
+        # First round: the bottom team sits out, then top half meets bottom half (1 v n/2+1, 2 v n/2+2, ...)
+        bye = order.pop() if len(order) % 2 else None
+        half = len(order) // 2
+        return list(zip(order[:half], order[half:])), bye
+
+    n = len(order)
+    points = [row['points'] for row in table]
+    groups = {value: index for index, value in enumerate(sorted(set(points), reverse=True))}
+    group = [groups[value] for value in points]
+    # Vertex n is the bye, open to teams without one yet (to everyone once all have had one)
+    open_to = ([i for i, row in enumerate(table) if not row['bye']] or list(range(n))) if n % 2 else []
+
+    mate = _match(n, points, [
+        (i, j) for i in range(n) for j in range(i + 1, min(n, i + PAIRING_WINDOW + 1))
+        if group[j] - group[i] <= 1 and order[j] not in opponents[order[i]]
+    ] + [(i, n) for i in open_to[-PAIRING_WINDOW:]])
+    if mate is None:
+        # Some team has no legal opponent near it; offer every rematch-free pair
+        mate = _match(n, points, [
+            (i, j) for i in range(n) for j in range(i + 1, n) if order[j] not in opponents[order[i]]
+        ] + [(i, n) for i in open_to])
+    if mate is None:
+        raise PairingError("No pairing avoids a rematch; the field has played too many rounds")
+
+    bye = order[mate[n]] if n % 2 else None
+    return [(order[i], order[j]) for i, j in enumerate(mate) if i < j < n], bye
+
+def _match(n, points, pairs):
+    """Minimum cost perfect matching of vertices 0..n (n is the bye, if the field is odd) over `pairs`, or None"""
+    # Total rank distance stays below n * n, so any smaller points gap wins over it
+    score_weight = n * n
+    lowest = min(points)
+
+    def cost(i, j):
+        gap = points[i] - (points[j] if j < n else lowest)
+        return gap * gap * score_weight + abs(j - i)
+
+    # Maximum weight on (ceiling - cost) over perfect matchings is minimum total cost
+    ceiling = 1 + max((cost(i, j) for i, j in pairs), default=0)
+    mate = matching.max_weight_matching([(i, j, ceiling - cost(i, j)) for i, j in pairs], max_cardinality=True)
+    mate += [-1] * (n + n % 2 - len(mate))
+    if any(partner == -1 for partner in mate):
+        return None
+    return mate
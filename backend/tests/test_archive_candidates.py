@@ -0,0 +1,30 @@
+import sys
+import os
+import time
+import logging
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.tournament import Tournament
+
+DAY = 86400
+
+def tournament_item(tournament_id, status='completed', **dates):
+    return dict({'tournament_id': tournament_id, 'name': tournament_id, 'status': status, 'type': 'single_elimination'}, **dates)
+
+def test_unreadable_dates_are_skipped_not_fatal(monkeypatch, caplog):
+    old = int(time.time()) - 60 * DAY
+    items = [
+        tournament_item('old', end_date=old),
+        tournament_item('text-date', end_date='2023-05-01'),
+        tournament_item('old-by-start', start_date=str(old)),
+        tournament_item('recent', end_date=int(time.time())),
+        tournament_item('running', status='in_progress', end_date=old),
+    ]
+    monkeypatch.setattr(Tournament, 'scan_items', classmethod(lambda cls, **kwargs: items))
+
+    with caplog.at_level(logging.WARNING):
+        candidates = Tournament.archive_candidates(older_than_days=30)
+    assert [t.tournament_id for t in candidates] == ['old', 'old-by-start']
+    assert 'text-date' in caplog.text
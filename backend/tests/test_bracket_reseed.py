@@ -0,0 +1,79 @@
+import sys
+import os
+import pytest
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.bracket import build_single_elimination, reseed_matches, BracketConflict
+from models.match import Match
+
+TEAMS = [(f'team-{i}', f'Team{i}') for i in range(6)]
+
+def built_bracket(teams):
+    """A freshly built 6-team bracket"""
+    return build_single_elimination('t', teams, scheduled_time=1700000000)
+
+def stored_bracket(teams):
+    """The same bracket as read back from the table, which is how reseed_matches receives it"""
+    return [Match.from_item(match._to_item()) for match in built_bracket(teams)]
+
+def play(matches, team1_id, team2_id, score1, score2):
+    """Complete the match between two teams, as stored once the result is written"""
+    match = next(m for m in matches if {m.team1_id, m.team2_id} == {team1_id, team2_id})
+    match.status, match.score_team1, match.score_team2 = 'completed', score1, score2
+    match._stored = match.to_dict()
+    return match
+
+def assert_one_live_slot_per_team(matches):
+    """Each team plays once per round, and nobody who lost plays again"""
+    by_round, losers = {}, set()
+    for match in matches:
+        teams = [team for team in (match.team1_id, match.team2_id) if team]
+        seen = by_round.setdefault(match.round_number, [])
+        assert not set(teams) & set(seen), f"team in two round {match.round_number} slots"
+        seen.extend(teams)
+        if match.status == 'completed' and match.team1_id and match.team2_id:
+            losers.add(match.team2_id if match.score_team1 > match.score_team2 else match.team1_id)
+    for match in matches:
+        if match.round_number > 1:
+            assert not {match.team1_id, match.team2_id} & losers, "eliminated team still in the bracket"
+    assert sorted(by_round[1]) == sorted(team_id for team_id, _ in TEAMS)
+
+def test_same_seeding_writes_nothing():
+    stored = stored_bracket(TEAMS)
+    plan = reseed_matches(stored, built_bracket(TEAMS))
+    assert (plan['changed'], plan['created'], plan['deleted']) == ([], [], [])
+    assert {m.match_id for m in plan['matches']} == {m.match_id for m in stored}
+
+def test_swapping_unplayed_seeds_rewrites_only_their_slots():
+    stored = stored_bracket(TEAMS)
+    ids = {m.match_id for m in stored}
+    swapped = TEAMS[:4] + [TEAMS[5], TEAMS[4]]
+    plan = reseed_matches(stored, built_bracket(swapped))
+    assert len(plan['changed']) == 2 and not plan['created'] and not plan['deleted']
+    assert {m.match_id for m in plan['matches']} == ids
+    assert_one_live_slot_per_team(plan['matches'])
+
+def test_reseed_moving_a_played_team_is_refused():
+    stored = stored_bracket(TEAMS)
+    played = play(stored, 'team-3', 'team-4', 25, 20)
+    before = [(m.match_id, m.team1_id, m.team2_id, m.status) for m in stored]
+
+    with pytest.raises(BracketConflict) as error:
+        reseed_matches(stored, built_bracket(list(reversed(TEAMS))))
+    assert [c['match_id'] for c in error.value.conflicts] == [played.match_id]
+    assert [(m.match_id, m.team1_id, m.team2_id, m.status) for m in stored] == before
+
+def test_reseed_around_a_played_match_keeps_its_result():
+    stored = stored_bracket(TEAMS)
+    played = play(stored, 'team-3', 'team-4', 25, 20)
+    # Seeds 3 and 6 trade places; the 4 v 5 match that was played stays put
+    reseeded = TEAMS[:2] + [TEAMS[5], TEAMS[3], TEAMS[4], TEAMS[2]]
+    plan = reseed_matches(stored, built_bracket(reseeded))
+
+    kept = next(m for m in plan['matches'] if m.match_id == played.match_id)
+    assert (kept.status, kept.team1_id, kept.team2_id) == ('completed', played.team1_id, played.team2_id)
+    parent = next(m for m in plan['matches'] if m.match_id == played.next_match_id)
+    assert 'team-3' in (parent.team1_id, parent.team2_id)
+    assert_one_live_slot_per_team(plan['matches'])
@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+import threading
+from types import SimpleNamespace
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from boto3.dynamodb.conditions import Key, Attr
+from services.db_service import db_service
+
+THREADS = 8
+QUERIES = 300
+
+def before_call(sent):
+    """Record each Query's final parameters and answer it without calling DynamoDB"""
+    def handler(params, **kwargs):
+        sent.setdefault(threading.get_ident(), []).append(json.loads(params['body']))
+        return SimpleNamespace(status_code=200, headers={}), {'Items': [], 'Count': 0, 'ScannedCount': 0}
+    return handler
+
+def test_threads_build_their_own_condition_expressions():
+    sent, hooked = {}, []
+    handler = before_call(sent)
+
+    def hook(client):
+        client.meta.events.register('before-call.dynamodb.Query', handler)
+        hooked.append(client)
+    db_service.add_client_hook(hook)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible, to interleave expression building
+    errors = []
+
+    def run(worker):
+        try:
+            table = db_service.dynamodb.Table(db_service.MATCHES_TABLE)
+            for i in range(QUERIES):
+                table.query(
+                    IndexName='TournamentStatusIndex',
+                    KeyConditionExpression=Key('tournament_id').eq(f'{worker}-{i}') & Key('status').eq('live'),
+                    FilterExpression=Attr('court').eq(str(worker)) & Attr('round_number').gte(i)
+                )
+        except Exception as e:  # Reported from the main thread
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=run, args=(worker,)) for worker in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+        db_service._client_hooks.remove(hook)
+        for client in hooked:
+            client.meta.events.unregister('before-call.dynamodb.Query', handler)
+
+    assert not errors, errors
+    assert sum(len(bodies) for bodies in sent.values()) == THREADS * QUERIES
+    for bodies in sent.values():
+        worker = None
+        for i, body in enumerate(bodies):
+            names, values = body['ExpressionAttributeNames'], body['ExpressionAttributeValues']
+            # One expression per call, numbered from zero: nothing left over from another thread's build
+            assert sorted(names.values()) == ['court', 'round_number', 'status', 'tournament_id']
+            assert sorted(names) == ['#n0', '#n1', '#n2', '#n3']
+            assert sorted(values) == [':v0', ':v1', ':v2', ':v3']
+            by_name = {names[placeholder]: placeholder for placeholder in names}
+            key = values[':v' + by_name['tournament_id'][2:]]['S']
+            court = values[':v' + by_name['court'][2:]]['S']
+            worker = worker or court
+            # Every value belongs to this thread's own query
+            assert court == worker and key == f'{worker}-{i}'
+            assert values[':v' + by_name['round_number'][2:]] == {'N': str(i)}
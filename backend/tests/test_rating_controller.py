@@ -0,0 +1,36 @@
+import sys
+import os
+import pytest
+from flask import Flask
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.rating_controller import rating_bp
+from models.rating import Rating
+
+@pytest.fixture
+def client(monkeypatch):
+    looked_up = []
+
+    def get(identity):
+        looked_up.append(identity)
+        return Rating(identity, 'Net Ninjas') if identity == 'net ninjas' else None
+    monkeypatch.setattr(Rating, 'get', staticmethod(get))
+
+    app = Flask(__name__)
+    app.register_blueprint(rating_bp, url_prefix='/api/ratings')
+    client = app.test_client()
+    client.looked_up = looked_up
+    return client
+
+def test_rating_is_found_by_normalised_name(client):
+    response = client.get('/api/ratings/%20Net%20%20NINJAS')
+    assert response.status_code == 200
+    assert response.get_json()['identity'] == 'net ninjas'
+
+@pytest.mark.parametrize('name', ['%20', '%20%09%20'])
+def test_blank_name_is_not_found_without_a_lookup(client, name):
+    response = client.get(f'/api/ratings/{name}')
+    assert response.status_code == 404
+    assert client.looked_up == []
@@ -0,0 +1,160 @@
+import sys
+import os
+import time
+import random
+import itertools
+import pytest
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import swiss
+from services.matching import max_weight_matching
+
+def table_for(points, played=(), byes=()):
+    """Standings rows for teams 0..n-1, already in rank order"""
+    opponents = {team: set() for team in range(len(points))}
+    for team1, team2 in played:
+        opponents[team1].add(team2)
+        opponents[team2].add(team1)
+    return [{'team_id': team, 'points': team_points, 'buchholz': 0, 'seed': team + 1,
+             'played': len(opponents[team]), 'bye': team in byes, 'opponents': opponents[team]}
+            for team, team_points in enumerate(points)]
+
+def rematch_free_pairings(table):
+    """Every legal (pairs, bye) for a table, by brute force"""
+    teams = [row['team_id'] for row in table]
+    rows = {row['team_id']: row for row in table}
+    byes = [None]
+    if len(teams) % 2:
+        byes = [team for team in teams if not rows[team]['bye']] or teams
+
+    def pairings(rest):
+        if not rest:
+            yield []
+            return
+        first = rest[0]
+        for partner in rest[1:]:
+            if partner not in rows[first]['opponents']:
+                remaining = [team for team in rest[1:] if team != partner]
+                for tail in pairings(remaining):
+                    yield [(first, partner)] + tail
+
+    for bye in byes:
+        for pairs in pairings([team for team in teams if team != bye]):
+            yield pairs, bye
+
+def score_gaps(table, pairs, bye):
+    """Sum of squared points gaps, the bye counting as a pair with the lowest score"""
+    points = {row['team_id']: row['points'] for row in table}
+    total = sum((points[a] - points[b]) ** 2 for a, b in pairs)
+    if bye is not None:
+        total += (points[bye] - min(points.values())) ** 2
+    return total
+
+def check_pairing(table, pairs, bye):
+    teams = [team for pair in pairs for team in pair] + ([bye] if bye is not None else [])
+    assert sorted(teams) == sorted(row['team_id'] for row in table)
+    rows = {row['team_id']: row for row in table}
+    for team1, team2 in pairs:
+        assert team2 not in rows[team1]['opponents']
+
+def test_first_round_pairs_top_half_with_bottom_half():
+    pairs, bye = swiss.pair_round(table_for([0] * 7))
+    assert (pairs, bye) == ([(0, 3), (1, 4), (2, 5)], 6)
+
+def test_equal_scores_meet_nearest_ranked():
+    table = table_for([2, 2, 1, 1, 1, 1], played=[(0, 3), (1, 2), (2, 5), (3, 4)])
+    pairs, bye = swiss.pair_round(table)
+    # 2 v 3 and 4 v 5 are the nearest ranks the score groups allow
+    assert (pairs, bye) == ([(0, 1), (2, 3), (4, 5)], None)
+
+def test_pairing_needs_a_different_bye():
+    # With the bottom team sitting out, the leader would have no one left to play
+    table = table_for([2, 2, 1, 1, 0], played=[(0, 1), (0, 2), (0, 3)])
+    pairs, bye = swiss.pair_round(table)
+    check_pairing(table, pairs, bye)
+    assert bye != 4
+
+def test_falls_back_to_every_pair_when_nearby_opponents_run_out():
+    # The leader has met everyone within the window, so only a distant team is left for it
+    n = swiss.PAIRING_WINDOW + 4
+    table = table_for([3] + [2] * (n - 1), played=[(0, j) for j in range(1, swiss.PAIRING_WINDOW + 2)])
+    pairs, bye = swiss.pair_round(table)
+    check_pairing(table, pairs, bye)
+    assert next(team2 for team1, team2 in pairs if team1 == 0) > swiss.PAIRING_WINDOW
+
+def test_no_rematch_free_pairing_raises():
+    table = table_for([1, 1, 1, 1], played=[(0, 1), (0, 2), (0, 3)])
+    with pytest.raises(swiss.PairingError):
+        swiss.pair_round(table)
+
+@pytest.mark.parametrize('seed', range(200))
+def test_pairs_whenever_a_pairing_exists(seed):
+    rng = random.Random(seed)
+    n = rng.randint(4, 9)
+    played = [pair for pair in itertools.combinations(range(n), 2) if rng.random() < 0.45] or [(0, n - 1)]
+    points = sorted((rng.randint(0, 4) for _ in range(n)), reverse=True)
+    table = table_for(points, played=played, byes={team for team in range(n) if rng.random() < 0.3})
+
+    legal = list(rematch_free_pairings(table))
+    if not legal:
+        with pytest.raises(swiss.PairingError):
+            swiss.pair_round(table)
+        return
+    pairs, bye = swiss.pair_round(table)
+    check_pairing(table, pairs, bye)
+    assert (pairs, bye) in legal
+    # Best among pairings within adjacent score groups when there is one, else best overall
+    near = [pairing for pairing in legal if all(adjacent_groups(table, a, b) for a, b in pairing[0])]
+    assert score_gaps(table, pairs, bye) == min(score_gaps(table, *pairing) for pairing in near or legal)
+
+def adjacent_groups(table, team1, team2):
+    """Whether two teams' points are the same or neighbouring values in the standings"""
+    values = sorted({row['points'] for row in table}, reverse=True)
+    points = {row['team_id']: row['points'] for row in table}
+    return abs(values.index(points[team1]) - values.index(points[team2])) <= 1
+
+def simulate_rounds(num_teams, rounds, seed=0):
+    """Pair and play `rounds` Swiss rounds; returns the seconds each pairing took"""
+    rng = random.Random(seed)
+    teams, items, timings = list(range(num_teams)), [], []
+    for _ in range(rounds):
+        table = swiss.standings(teams, items)
+        started = time.perf_counter()
+        pairs, bye = swiss.pair_round(table)
+        timings.append(time.perf_counter() - started)
+        check_pairing(table, pairs, bye)
+        for team1, team2 in pairs:
+            won = rng.random() < 0.5
+            items.append({'team1_id': team1, 'team2_id': team2, 'status': 'completed',
+                          'score_team1': 3 if won else 1, 'score_team2': 1 if won else 3})
+        if bye is not None:
+            items.append({'team1_id': bye, 'team2_id': None, 'status': 'completed', 'score_team1': 1, 'score_team2': 0})
+    return timings
+
+@pytest.mark.parametrize('num_teams', [200, 201])
+def test_large_field_pairs_within_budget(num_teams):
+    timings = simulate_rounds(num_teams, rounds=7)
+    # Pairing runs inside the next-round request, so it has to stay well under a second
+    assert max(timings) < 0.5, [round(t, 3) for t in timings]
+
+@pytest.mark.parametrize('seed', range(100))
+def test_max_weight_matching_is_optimal(seed):
+    rng = random.Random(seed)
+    n = rng.randint(2, 8)
+    edges = [(i, j, rng.randint(0, 15)) for i, j in itertools.combinations(range(n), 2) if rng.random() < 0.6]
+    mate = max_weight_matching(edges, max_cardinality=True)
+    weights = {(i, j): weight for i, j, weight in edges}
+    chosen = [(v, partner) for v, partner in enumerate(mate) if v < partner]
+    assert all(mate[partner] == v for v, partner in chosen)
+
+    best = (0, 0)
+    for size in range(n // 2, 0, -1):
+        for subset in itertools.combinations(weights, size):
+            vertices = [v for edge in subset for v in edge]
+            if len(set(vertices)) == len(vertices):
+                best = max(best, (size, sum(weights[edge] for edge in subset)))
+        if best[0]:
+            break
+    assert (len(chosen), sum(weights[edge] for edge in chosen)) == best
@@ -55,11 +55,15 @@ export const tournamentAPI = {
   update: (id, data) => api.put(`/tournaments/${id}`, data),
   delete: (id) => api.delete(`/tournaments/${id}`),
   createBracket: (id, teamIds) => api.post(`/tournaments/${id}/bracket`, { team_ids: teamIds }),
+  createNextRound: (id) => api.post(`/tournaments/${id}/rounds`),
+  getStandings: (id) => api.get(`/tournaments/${id}/standings`),
 };
 
 // Team API
 export const teamAPI = {
   getByTournament: (tournamentId) => api.get('/teams', { params: { tournament_id: tournamentId } }),
+  getNames: (tournamentId) => api.get('/teams', { params: { tournament_id: tournamentId, fields: 'team_id,team_name' } }),
+  search: (query, limit = 10) => api.get('/teams/search', { params: { q: query, limit } }),
   getById: (id) => api.get(`/teams/${id}`),
   create: (data) => api.post('/teams', data),
   update: (id, data) => api.put(`/teams/${id}`, data),
@@ -74,6 +78,7 @@ export const matchAPI = {
     return api.get('/matches', { params });
   },
   getById: (id) => api.get(`/matches/${id}`),
+  getLive: () => api.get('/matches/live'),
   updateScore: (id, score_team1, score_team2, complete = false) => 
     api.post(`/matches/${id}/score`, { score_team1, score_team2, complete }),
   updateCourt: (id, court) => api.post(`/matches/${id}/court`, { court }),
@@ -67,7 +67,7 @@ const AdminMatchesPage = () => {
       setMatches(matchesResponse.data);
       
       // Get teams for name lookup
-      const teamsResponse = await teamAPI.getByTournament(tournamentId);
+      const teamsResponse = await teamAPI.getNames(tournamentId);
       const teamsMap = {};
       teamsResponse.data.forEach(team => {
         teamsMap[team.team_id] = team.team_name;
@@ -83,6 +83,18 @@ const AdminMatchesPage = () => {
     }
   };
 
+  const handleCreateNextRound = async () => {
+    try {
+      setLoading(true);
+      await tournamentAPI.createNextRound(tournamentId);
+      await fetchData();
+    } catch (error) {
+      console.error('Failed to create round:', error);
+      setError(error.response?.data?.message || 'Failed to create the next round. Please try again.');
+      setLoading(false);
+    }
+  };
+
   const handleTabChange = (event, newValue) => {
     setTabValue(newValue);
   };
@@ -205,6 +217,16 @@ const AdminMatchesPage = () => {
                 Score Matches
               </Button>
             )}
+            {tournament.type === 'swiss' && tournament.status === 'in_progress' && (
+              <Button 
+                variant="contained" 
+                color="secondary"
+                onClick={handleCreateNextRound}
+                disabled={matches.some(match => match.status !== 'completed')}
+              >
+                Pair Next Round
+              </Button>
+            )}
             <Button 
               component={Link} 
               to={`/tournaments/${tournamentId}/bracket`}
@@ -84,7 +84,7 @@ const AdminScoringPage = () => {
       setMatches(activeMatches);
       
       // Get teams for name lookup
-      const teamsResponse = await teamAPI.getByTournament(tournamentId);
+      const teamsResponse = await teamAPI.getNames(tournamentId);
       const teamsMap = {};
       teamsResponse.data.forEach(team => {
         teamsMap[team.team_id] = team.team_name;
@@ -343,6 +343,7 @@ const AdminTournamentsPage = () => {
                     label="Tournament Type"
                   >
                     <MenuItem value="single_elimination">Single Elimination</MenuItem>
+                    <MenuItem value="swiss">Swiss</MenuItem>
                     <MenuItem value="double_elimination" disabled>Double Elimination (Coming Soon)</MenuItem>
                     <MenuItem value="round_robin" disabled>Round Robin (Coming Soon)</MenuItem>
                   </Select>
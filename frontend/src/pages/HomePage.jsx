@@ -15,26 +15,25 @@ import { tournamentAPI, matchAPI } from '../api/api';
 
 const HomePage = () => {
   const [activeTournaments, setActiveTournaments] = useState([]);
-  const [featuredMatches, setFeaturedMatches] = useState([]);
+  const [liveMatches, setLiveMatches] = useState([]);
+  const [tournamentNames, setTournamentNames] = useState({});
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // Get all tournaments
-        const tournamentsResponse = await tournamentAPI.getAll();
+        // Tournaments and everything live across all of them, in parallel
+        const [tournamentsResponse, liveResponse] = await Promise.all([
+          tournamentAPI.getAll(),
+          matchAPI.getLive()
+        ]);
         const tournaments = tournamentsResponse.data;
         
         // Filter active tournaments
         const active = tournaments.filter(t => t.status === 'in_progress');
         setActiveTournaments(active);
-
-        // Get featured matches from active tournaments
-        if (active.length > 0) {
-          const activeId = active[0].tournament_id;
-          const matchesResponse = await matchAPI.getByTournament(activeId, 'in_progress');
-          setFeaturedMatches(matchesResponse.data.slice(0, 3)); // Get first 3 matches
-        }
+        setTournamentNames(Object.fromEntries(tournaments.map(t => [t.tournament_id, t.name])));
+        setLiveMatches(liveResponse.data);
       } catch (error) {
         console.error('Failed to fetch data:', error);
       } finally {
@@ -108,18 +107,21 @@ const HomePage = () => {
         </Box>
       )}
 
-      {featuredMatches.length > 0 && (
+      {liveMatches.length > 0 && (
         <Box sx={{ my: 4 }}>
           <Typography variant="h4" component="h2" gutterBottom>
             Live Matches
           </Typography>
           <Grid container spacing={3}>
-            {featuredMatches.map((match) => (
+            {liveMatches.map((match) => (
               <Grid item xs={12} md={4} key={match.match_id}>
                 <Card>
                   <CardContent>
+                    <Typography color="textSecondary" gutterBottom>
+                      {tournamentNames[match.tournament_id] || 'Tournament'}
+                    </Typography>
                     <Typography variant="h6" component="h3">
-                      {match.team1_id ? match.team1_id : 'TBD'} vs {match.team2_id ? match.team2_id : 'TBD'}
+                      {match.team1_name || 'TBD'} vs {match.team2_name || 'TBD'}
                     </Typography>
                     <Typography variant="h4" align="center" sx={{ my: 2 }}>
                       {match.score_team1} - {match.score_team2}
@@ -13,7 +13,7 @@ import {
   Chip,
   Alert
 } from '@mui/material';
-import { tournamentAPI, teamAPI } from '../api/api';
+import { tournamentAPI } from '../api/api';
 import Loading from '../components/common/Loading';
 import moment from 'moment';
 
@@ -21,7 +21,6 @@ const LiveBracketPage = () => {
   const { tournamentId } = useParams();
   const [tournament, setTournament] = useState(null);
   const [bracket, setBracket] = useState([]);
-  const [teams, setTeams] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -35,14 +34,6 @@ const LiveBracketPage = () => {
         // Get bracket data
         const bracketResponse = await tournamentAPI.getBracket(tournamentId);
         setBracket(bracketResponse.data);
-
-        // Get teams for name lookup
-        const teamsResponse = await teamAPI.getByTournament(tournamentId);
-        const teamsMap = {};
-        teamsResponse.data.forEach(team => {
-          teamsMap[team.team_id] = team.team_name;
-        });
-        setTeams(teamsMap);
       } catch (error) {
         console.error('Error fetching bracket:', error);
         setError('Failed to load bracket data. Please try again later.');
@@ -61,10 +52,10 @@ const LiveBracketPage = () => {
     return () => clearInterval(intervalId);
   }, [tournamentId]);
 
-  // Helper to get team name from ID
-  const getTeamName = (teamId) => {
+  // Matches carry their teams' display names, so no team lookup is needed
+  const getTeamName = (teamId, teamName) => {
     if (!teamId) return 'TBD';
-    return teams[teamId] || teamId;
+    return teamName || teamId;
   };
 
   if (loading) {
@@ -218,7 +209,7 @@ const LiveBracketPage = () => {
                               fontSize: '0.9rem'
                             }}
                           >
-                            {getTeamName(match.team1_id)}
+                            {getTeamName(match.team1_id, match.team1_name)}
                           </Typography>
                           {(match.score_team1 > 0 || match.score_team2 > 0) && (
                             <Typography 
@@ -253,7 +244,7 @@ const LiveBracketPage = () => {
                               fontSize: '0.9rem'
                             }}
                           >
-                            {getTeamName(match.team2_id)}
+                            {getTeamName(match.team2_id, match.team2_name)}
                           </Typography>
                           {(match.score_team1 > 0 || match.score_team2 > 0) && (
                             <Typography 
@@ -26,6 +26,7 @@ const TournamentDetailPage = () => {
   const [teams, setTeams] = useState([]);
   const [upcomingMatches, setUpcomingMatches] = useState([]);
   const [completedMatches, setCompletedMatches] = useState([]);
+  const [standings, setStandings] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -47,6 +48,12 @@ const TournamentDetailPage = () => {
         
         const completedMatchesResponse = await matchAPI.getByTournament(tournamentId, 'completed');
         setCompletedMatches(completedMatchesResponse.data);
+        
+        // Swiss tournaments rank teams by points rather than a bracket
+        if (tournamentResponse.data.type === 'swiss') {
+          const standingsResponse = await tournamentAPI.getStandings(tournamentId);
+          setStandings(standingsResponse.data);
+        }
       } catch (error) {
         console.error('Error fetching tournament data:', error);
         setError('Failed to load tournament data. Please try again later.');
@@ -240,6 +247,32 @@ const TournamentDetailPage = () => {
           </Grid>
           
           <Grid item xs={12} md={4}>
+            {tournament.type === 'swiss' && (
+              <Paper sx={{ p: 3, mb: 3 }}>
+                <Typography variant="h5" gutterBottom>
+                  Standings
+                </Typography>
+                
+                {standings.length > 0 ? (
+                  <List>
+                    {standings.map(row => (
+                      <ListItem key={row.team_id} divider>
+                        <ListItemText
+                          primary={`${row.rank}. ${row.team_name || row.team_id}`}
+                          secondary={`Buchholz ${row.buchholz}${row.bye ? ' | had a bye' : ''}`}
+                        />
+                        <Typography>
+                          <strong>{row.points}</strong> pts
+                        </Typography>
+                      </ListItem>
+                    ))}
+                  </List>
+                ) : (
+                  <Typography>No rounds have been played yet.</Typography>
+                )}
+              </Paper>
+            )}
+            
             <Paper sx={{ p: 3, mb: 3 }}>
               <Typography variant="h5" gutterBottom>
                 Teams ({teams.length})
@@ -0,0 +1,41 @@
+import sys
+import os
+import argparse
+import time
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from models.tournament import Tournament
+from config import Config
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Move completed tournaments to the cold archive and delete them from the hot tables'
+    )
+    parser.add_argument('--older-than-days', type=int, default=Config.ARCHIVE_AFTER_DAYS,
+                        help=f'Only tournaments that ended at least this many days ago (default: {Config.ARCHIVE_AFTER_DAYS})')
+    parser.add_argument('--tournament-id', help='Archive this one completed tournament instead')
+    parser.add_argument('--dry-run', action='store_true', help='List what would be archived without changing anything')
+    args = parser.parse_args()
+
+    started = time.time()
+    if args.tournament_id:
+        tournament = Tournament.get(args.tournament_id)
+        if not tournament or tournament.archived:
+            sys.exit(f"No hot tournament {args.tournament_id}")
+        if not args.dry_run:
+            tournament.archive()
+        archived = [tournament.tournament_id]
+    elif args.dry_run:
+        archived = [tournament.tournament_id for tournament in Tournament.archive_candidates(args.older_than_days)]
+    else:
+        archived = Tournament.archive_completed(older_than_days=args.older_than_days)['archived']
+
+    for tournament_id in archived:
+        print(tournament_id)
+    print(f"{'Would archive' if args.dry_run else 'Archived'} {len(archived)} tournaments "
+          f"to {Config.ARCHIVE_DIR} in {time.time() - started:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sys
+import os
+import argparse
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.db_service import db_service
+from services import single_table
+from models.match import Match
+
+# Derived index keys this script fills in: CourtScheduleIndex and LiveMatchesIndex
+INDEX_ATTRIBUTES = ('tournament_court', 'live_partition')
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Index matches stored before CourtScheduleIndex or LiveMatchesIndex existed, '
+                    'so court boards and the live feed can see them'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Count matches without writing anything')
+    args = parser.parse_args()
+
+    if db_service.single_table_enabled:
+        items = single_table.scan_entities('match')
+    else:
+        items = db_service.scan_all(db_service.matches_table)
+
+    updated = 0
+    for item in items:
+        match = Match.from_item(item)
+        expected = match._to_item()
+        keys = {name: expected[name] for name in INDEX_ATTRIBUTES
+                if name in expected and item.get(name) != expected[name]}
+        if not keys:
+            continue
+        if not args.dry_run:
+            Match._table().update_item(
+                Key=match._key(),
+                UpdateExpression='SET ' + ', '.join(f'{name} = :{name}' for name in keys),
+                ExpressionAttributeValues={f':{name}': value for name, value in keys.items()}
+            )
+        updated += 1
+
+    print(f"{'Would index' if args.dry_run else 'Indexed'} {updated} of {len(items)} matches")
+
+if __name__ == "__main__":
+    main()
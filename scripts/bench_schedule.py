@@ -0,0 +1,76 @@
+import sys
+import os
+import time
+import random
+import argparse
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from models.bracket import build_single_elimination
+from services.schedule_service import ScheduleGraph
+
+def scheduled_items(num_teams, courts, match_minutes, start=1700000000):
+    """Match items for a bracket played round by round across `courts` courts"""
+    teams = [(f'team-{i}', f'Team {i}') for i in range(num_teams)]
+    items = []
+    slot_time = start
+    for round_number, matches in _by_round(build_single_elimination('bench', teams, scheduled_time=start)):
+        for index, match in enumerate(matches):
+            match.court = str(index % courts + 1)
+            match.scheduled_time = slot_time + index // courts * match_minutes * 60
+            items.append(match.to_dict())
+        slot_time += -(-len(matches) // courts) * match_minutes * 60
+    return items
+
+def _by_round(matches):
+    """Matches grouped by round, in round order"""
+    rounds = {}
+    for match in matches:
+        rounds.setdefault(match.round_number, []).append(match)
+    return sorted(rounds.items())
+
+def main():
+    parser = argparse.ArgumentParser(description='Time projected start time updates per match event')
+    parser.add_argument('--teams', type=int, default=300, help='Teams in the bracket (byes are matches too)')
+    parser.add_argument('--courts', type=int, default=8, help='Courts the bracket is played on')
+    parser.add_argument('--match-minutes', type=int, default=45, help='Scheduled and expected match length')
+    parser.add_argument('--events', type=int, default=2000, help='Score and completion events to replay')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for which matches run long')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    duration = args.match_minutes * 60
+    items = scheduled_items(args.teams, args.courts, args.match_minutes)
+
+    started = time.perf_counter()
+    graph = ScheduleGraph(items, duration, 60)
+    graph.propagate(list(graph.nodes.values()), items[0]['scheduled_time'])
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(items)} matches on {args.courts} courts: full build and projection {build_ms:.2f} ms")
+
+    # Play the matches in projected order; each one gets score updates while it overruns, then completes
+    pending = sorted((node for node in graph.nodes.values() if node.status != 'completed'), key=lambda n: n.order())
+    timings, moved = [], []
+    while pending and len(timings) < args.events:
+        node = pending.pop(0)
+        clock = node.projected_time
+        node.status, node.started_at = 'in_progress', clock
+        for minute in range(0, args.match_minutes + rng.choice((0, 0, 10, 25)), 5):
+            started = time.perf_counter()
+            changed = graph.propagate([node], clock + minute * 60)
+            timings.append(time.perf_counter() - started)
+            moved.append(len(changed))
+        node.status, node.completed_at = 'completed', clock + (args.match_minutes + rng.choice((-10, 0, 10, 25))) * 60
+        started = time.perf_counter()
+        changed = graph.propagate([node], node.completed_at)
+        timings.append(time.perf_counter() - started)
+        moved.append(len(changed))
+
+    timings.sort()
+    print(f"{len(timings)} events: mean {sum(timings) / len(timings) * 1000:.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms, max {timings[-1] * 1000:.3f} ms, "
+          f"mean {sum(moved) / len(moved):.1f} matches rewritten per event")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import time
+import argparse
+from decimal import Decimal
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from models.bracket import Bracket, build_single_elimination
+from services.serialization import FastJSONProvider, orjson, msgpack
+
+def stored_items(num_teams):
+    """Match items for a bracket of `num_teams`, with numbers as the Decimals DynamoDB returns"""
+    teams = [(f'team-{i}', f'Team {i}') for i in range(num_teams)]
+    items = []
+    for match in build_single_elimination('bench', teams, scheduled_time=1700000000):
+        item = match.to_dict()
+        items.append({key: Decimal(value) if isinstance(value, int) else value for key, value in item.items()})
+    return items
+
+def cpu_per_call(func, iterations):
+    """Mean process CPU time of func() in microseconds"""
+    func()  # Warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure CPU per bracket response for each serialisation path')
+    parser.add_argument('--sizes', default='16,32,64,128,256', help='Comma separated team counts')
+    parser.add_argument('--iterations', type=int, default=200, help='Responses per measurement')
+    args = parser.parse_args()
+
+    # Bare apps, so nothing here needs DynamoDB
+    before_app, after_app = Flask('before'), Flask('after')
+    after_app.json = FastJSONProvider(after_app)
+    before_app.json = DefaultJSONProvider(before_app)
+
+    print(f"orjson: {'yes' if orjson else 'no (stdlib json)'}, msgpack: {'yes' if msgpack else 'no'}")
+    print(f"{'teams':>5}  {'path':<22} {'cpu us/resp':>11} {'bytes':>8} {'speedup':>7}")
+    for num_teams in (int(size) for size in args.sizes.split(',')):
+        items = stored_items(num_teams)
+        paths = [
+            ('before: default json', before_app, 'application/json', Bracket.rounds),
+            ('orjson', after_app, 'application/json', Bracket.rounds),
+            ('orjson compact', after_app, 'application/json', Bracket.compact),
+            ('msgpack', after_app, 'application/msgpack', Bracket.rounds),
+            ('msgpack compact', after_app, 'application/msgpack', Bracket.compact),
+        ]
+        baseline = None
+        for label, app, accept, build in paths:
+            with app.test_request_context(headers={'Accept': accept}):
+                # Everything the bracket endpoint does after its DynamoDB query
+                respond = lambda: app.json.response(build(Bracket.from_items(items)))
+                micros = cpu_per_call(respond, args.iterations)
+                size = len(respond().get_data())
+            baseline = baseline or micros
+            print(f"{num_teams:>5}  {label:<22} {micros:>11.1f} {size:>8} {baseline / micros:>6.1f}x")
+        print()
+
+if __name__ == "__main__":
+    main()
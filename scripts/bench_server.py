@@ -0,0 +1,204 @@
+import sys
+import os
+import json
+import time
+import random
+import signal
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit, quote
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Read-heavy spectator mix: (weight, path template). Spectators poll brackets,
+# live scores and standings; every path is a public GET the frontend makes.
+SPECTATOR_MIX = (
+    (30, '/api/tournaments/{tid}/bracket'),
+    (25, '/api/matches/?tournament_id={tid}&status=in_progress'),
+    (15, '/api/tournaments/{tid}/full'),
+    (10, '/api/tournaments/{tid}/standings'),
+    (10, '/api/tournaments/{tid}'),
+    (5, '/api/teams/?tournament_id={tid}'),
+    (5, '/api/tournaments/'),
+)
+
+def percentile(values, fraction):
+    """Value at a fraction (0..1) of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+class LoadGenerator:
+    """Closed-loop load: each client thread sends its next request as soon as the last one returns"""
+
+    def __init__(self, base_url, tournament_ids, clients, seed=0):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.tournament_ids = tournament_ids
+        self.clients = clients
+        self.seed = seed
+        weights, self.templates = zip(*SPECTATOR_MIX)
+        self.cumulative = [sum(weights[:i + 1]) for i in range(len(weights))]
+
+    def run(self, duration, warmup):
+        """Drive the server for warmup + duration seconds; stats cover only the measured part"""
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+        results = [None] * self.clients
+        threads = [
+            threading.Thread(target=self._client, args=(i, measure_from, stop_at, results))
+            for i in range(self.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies, errors = [], 0
+        for client_latencies, client_errors in results:
+            latencies.extend(client_latencies)
+            errors += client_errors
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': len(latencies) / duration,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        }
+
+    def _client(self, index, measure_from, stop_at, results):
+        """One spectator: a keep-alive connection polling random paths from the mix"""
+        rng = random.Random(f'{self.seed}:{index}')
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        latencies, errors = [], 0
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            path = self._pick(rng)
+            try:
+                connection.request('GET', path, headers={'Accept': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 500 and response.status != 429
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                ok = False
+            finished = time.perf_counter()
+            if now >= measure_from:
+                if ok:
+                    latencies.append(finished - now)
+                else:
+                    errors += 1
+        connection.close()
+        results[index] = (latencies, errors)
+
+    def _pick(self, rng):
+        """A random path from the weighted mix"""
+        roll = rng.random() * self.cumulative[-1]
+        template = next(t for t, bound in zip(self.templates, self.cumulative) if roll < bound)
+        return template.format(tid=quote(rng.choice(self.tournament_ids), safe=''))
+
+def fetch_tournament_ids(base_url, limit):
+    """Tournament IDs to aim the load at, from the server's own listing"""
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    connection.request('GET', '/api/tournaments/', headers={'Accept': 'application/json'})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"GET /api/tournaments/ returned {response.status}")
+    return [t['tournament_id'] for t in json.loads(body)][:limit]
+
+def parse_mode(mode):
+    """'sync' or 'gthread:16' -> (label, worker class, threads)"""
+    worker_class, _, threads = mode.partition(':')
+    threads = int(threads or (1 if worker_class == 'sync' else 8))
+    return mode, worker_class, threads
+
+def start_server(bind, worker_class, threads, workers):
+    """Start gunicorn from backend/ with the given worker settings; returns the process"""
+    env = dict(os.environ)
+    env.update({
+        'GUNICORN_BIND': bind,
+        'GUNICORN_WORKERS': str(workers),
+        'GUNICORN_WORKER_CLASS': worker_class,
+        'GUNICORN_THREADS': str(threads),
+        # Measure the server, not the read throttle in front of it
+        'ADMISSION_ENABLED': 'False',
+    })
+    return subprocess.Popen(
+        ['gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def wait_until_up(base_url, timeout=60):
+    """Poll the server until it answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            fetch_tournament_ids(base_url, 1)
+            return
+        except (OSError, RuntimeError, http.client.HTTPException):
+            time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} didn't come up within {timeout}s")
+
+def stop_server(process):
+    """Stop gunicorn and its workers"""
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare gunicorn worker modes under a read-heavy spectator load')
+    parser.add_argument('--url', help='Benchmark an already running server instead of starting one per mode')
+    parser.add_argument('--modes', default='sync,gthread:8', help="Comma separated worker modes to start, e.g. 'sync,gthread:8,gthread:16'")
+    parser.add_argument('--workers', type=int, default=3, help='Gunicorn workers per mode')
+    parser.add_argument('--bind', default='127.0.0.1:5055', help='Address for the servers this script starts')
+    parser.add_argument('--clients', type=int, default=64, help='Concurrent spectators')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds per mode')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds before each measurement')
+    parser.add_argument('--tournaments', type=int, default=20, help='Spread load over this many tournaments')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the request mix')
+    args = parser.parse_args()
+
+    if args.url:
+        runs = [(args.url, None, args.url)]
+    else:
+        runs = [(label, parse_mode(label), f'http://{args.bind}') for label in args.modes.split(',')]
+
+    print(f"{args.clients} clients, {args.duration:g}s per run, mix: "
+          + ', '.join(f'{path} {weight}%' for weight, path in SPECTATOR_MIX))
+    print(f"{'mode':<16} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for label, mode, base_url in runs:
+        process = None
+        if mode is not None:
+            _, worker_class, threads = mode
+            process = start_server(args.bind, worker_class, threads, args.workers)
+        try:
+            wait_until_up(base_url)
+            tournament_ids = fetch_tournament_ids(base_url, args.tournaments)
+            if not tournament_ids:
+                print("No tournaments to read; create some first (see scripts/generate_data.py)")
+                return 1
+            stats = LoadGenerator(base_url, tournament_ids, args.clients, args.seed).run(args.duration, args.warmup)
+        finally:
+            if process is not None:
+                stop_server(process)
+        print(f"{label:<16} {stats['rps']:>9.1f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['errors']:>7}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import sys
+import os
+import argparse
+import time
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.export_service import export_service
+from config import Config
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export every tournament, team and match as gzip\'d NDJSON using parallel scans'
+    )
+    parser.add_argument('-o', '--output', default=None,
+                        help='Output file (default: volleytracker-export-<timestamp>.ndjson.gz, "-" for stdout)')
+    parser.add_argument('-s', '--segments', type=int, default=Config.EXPORT_SCAN_SEGMENTS,
+                        help=f'Parallel scan segments per table (default: {Config.EXPORT_SCAN_SEGMENTS})')
+    args = parser.parse_args()
+
+    output = args.output or f"volleytracker-export-{int(time.time())}.ndjson.gz"
+    started = time.time()
+    written = 0
+
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    try:
+        for chunk in export_service.export_ndjson_gz(args.segments):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    print(f"Wrote {written} bytes to {output} in {time.time() - started:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import sys
+import os
+import math
+import time
+import uuid
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.db_service import db_service
+from services import swiss
+from models.tournament import Tournament
+from models.team import Team
+from models.match import Match
+from models.bracket import build_single_elimination
+
+FIRST_NAMES = ('Alex', 'Ana', 'Ben', 'Carla', 'Chen', 'Dana', 'Diego', 'Elif', 'Emma', 'Femi', 'Grace', 'Hana',
+               'Ivan', 'Jade', 'Jonas', 'Kai', 'Lena', 'Luca', 'Maya', 'Nia', 'Omar', 'Priya', 'Rosa', 'Sam',
+               'Tariq', 'Uma', 'Vera', 'Wei', 'Yara', 'Zoe')
+LAST_NAMES = ('Adams', 'Baker', 'Costa', 'Dubois', 'Eriksen', 'Fischer', 'Garcia', 'Hughes', 'Ito', 'Jensen',
+              'Kowalski', 'Lopez', 'Moreau', 'Novak', 'Okafor', 'Petrov', 'Quinn', 'Rossi', 'Silva', 'Tanaka',
+              'Ueda', 'Varga', 'Walsh', 'Xu', 'Yilmaz', 'Zhang')
+TEAM_WORDS = (('Sand', 'Net', 'Beach', 'Spike', 'Block', 'Serve', 'Dig', 'Set', 'Rally', 'Ace', 'Sky', 'Tide'),
+              ('Sharks', 'Ninjas', 'Kings', 'Stars', 'Strikers', 'Flyers', 'Aces', 'Party', 'Hawks', 'Waves',
+               'Titans', 'Comets'))
+VENUES = ('City Sports Arena', 'Harbour Beach', 'North Park Courts', 'University Hall', 'Lakeside Sands')
+
+class BatchWriter:
+    """Concurrent BatchWriteItem calls (25 items each) with retries of unprocessed items"""
+
+    def __init__(self):
+        self.client = db_service.dynamodb.meta.client  # Clients are safe to share between threads
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def write(self, table_name, items):
+        """Write items to a table in batches of 25, backing off while DynamoDB throttles"""
+        for start in range(0, len(items), 25):
+            requests = {table_name: [{'PutRequest': {'Item': item}} for item in items[start:start + 25]]}
+            delay = 0.05
+            while requests:
+                response = self.client.batch_write_item(RequestItems=requests)
+                requests = response.get('UnprocessedItems') or {}
+                if requests:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 2)
+        with self._lock:
+            self.written += len(items)
+
+def deterministic_id(rng):
+    """A UUID4-shaped ID drawn from the tournament's RNG, so reruns produce the same IDs"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def play_score(rng, strength1, strength2, points):
+    """A completed set: winner by Elo odds, the loser's points tighter between close teams, deuce past points - 1"""
+    p_team1 = 1 / (1 + 10 ** ((strength2 - strength1) / 400))
+    team1_wins = rng.random() < p_team1
+    loser = round(rng.gauss(points - 5 - 8 * abs(p_team1 - 0.5), 3.5))
+    loser = max(points // 4, min(loser, points + 3))
+    if loser >= points - 1:
+        loser = points - 1 + min(int(rng.expovariate(0.8)), 8)  # Deuce: win by two
+        winner = loser + 2
+    else:
+        winner = points
+    return (winner, loser) if team1_wins else (loser, winner)
+
+def in_progress_score(rng, points):
+    """Scores part way through a set"""
+    return rng.randint(0, points - 1), rng.randint(0, points - 1)
+
+class TournamentGenerator:
+    """Builds one tournament's items in memory from its own seeded RNG"""
+
+    def __init__(self, args, index):
+        self.args = args
+        self.rng = random.Random(f'{args.seed}:{index}')
+        self.index = index
+
+    def build(self):
+        """(tournament, teams, matches) as model objects"""
+        rng, args = self.rng, self.args
+        num_teams = rng.choice(args.sizes)
+        tournament_type = rng.choice(args.types)
+        roll = rng.random()
+        state = 'completed' if roll < args.completed else 'in_progress' if roll < args.completed + args.in_progress else 'upcoming'
+
+        # Completed events happened over the last year; the others run from today
+        day = 86400
+        start = args.epoch - (rng.randint(7, 365) * day if state == 'completed' else rng.randint(0, 2) * 3600)
+        tournament = Tournament(
+            tournament_id=deterministic_id(rng),
+            name=f"{rng.choice(VENUES).split()[0]} {rng.choice(('Open', 'Cup', 'Classic', 'Series'))} #{self.index + 1}",
+            start_date=start,
+            end_date=start + rng.randint(1, 3) * day,
+            location=rng.choice(VENUES),
+            status=state,
+            type=tournament_type
+        )
+
+        teams = []
+        for _ in range(num_teams):
+            name = f'{rng.choice(TEAM_WORDS[0])} {rng.choice(TEAM_WORDS[1])} {rng.randint(1, 999)}'
+            players = [f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}' for _ in range(rng.randint(2, 6))]
+            teams.append(Team(team_id=deterministic_id(rng), team_name=name,
+                              tournament_id=tournament.tournament_id, players=players))
+        strength = {team.team_id: rng.gauss(1500, 150) for team in teams}
+
+        if state == 'upcoming':
+            return tournament, teams, []
+        # Seed by strength with some noise, like a real seeding committee
+        seeded = sorted(teams, key=lambda team: -(strength[team.team_id] + rng.gauss(0, 60)))
+        if tournament_type == 'swiss':
+            matches = self._swiss(tournament, seeded, strength, state, start)
+        else:
+            matches = self._single_elimination(tournament, seeded, strength, state, start)
+        return tournament, teams, matches
+
+    def _single_elimination(self, tournament, seeded, strength, state, start):
+        """Seeded bracket played round by round; in-progress events stop part way through a round"""
+        rng = self.rng
+        matches = build_single_elimination(tournament.tournament_id, [(team.team_id, team.team_name) for team in seeded],
+                                           scheduled_time=start)
+        ids = {match.match_id: deterministic_id(rng) for match in matches}
+        for match in matches:
+            match.match_id = ids[match.match_id]
+            match.next_match_id = ids.get(match.next_match_id)
+            if match.status == 'completed':
+                match.completed_at = start  # Byes
+
+        rounds = {}
+        for match in matches:
+            rounds.setdefault(match.round_number, []).append(match)
+        by_id = {match.match_id: match for match in matches}
+        last_round = max(rounds)
+        stop_round = last_round + 1 if state == 'completed' else rng.randint(1, last_round)
+
+        round_start = start
+        for round_number in sorted(rounds):
+            to_play = [match for match in rounds[round_number] if match.status != 'completed']
+            round_start = self._schedule(to_play, round_start)
+            if round_number > stop_round:
+                continue
+            for match in to_play:
+                if not (match.team1_id and match.team2_id) or not self._play(match, strength, round_number == stop_round):
+                    continue
+                if match.next_match_id:
+                    winner = (match.team1_id, match.team1_name, match.team1_seed) if match.score_team1 > match.score_team2 \
+                        else (match.team2_id, match.team2_name, match.team2_seed)
+                    by_id[match.next_match_id].place_team(*winner, slot=match.position % 2 + 1)
+        return matches
+
+    def _swiss(self, tournament, seeded, strength, state, start):
+        """Swiss rounds paired from live standings; in-progress events stop part way through a round"""
+        rng = self.rng
+        seeds = {team.team_id: number for number, team in enumerate(seeded, 1)}
+        names = {team.team_id: team.team_name for team in seeded}
+        num_rounds = max(1, (len(seeded) - 1).bit_length())
+        stop_round = num_rounds + 1 if state == 'completed' else rng.randint(1, num_rounds)
+
+        matches = []
+        round_start = start
+        for round_number in range(1, min(num_rounds, stop_round) + 1):
+            try:
+                pairs, bye = swiss.pair_round(swiss.standings(list(seeds), [match.to_dict() for match in matches]))
+            except swiss.PairingError:
+                break
+            round_matches = []
+            for team1_id, team2_id in pairs:
+                round_matches.append(Match(
+                    match_id=deterministic_id(rng), tournament_id=tournament.tournament_id,
+                    team1_id=team1_id, team2_id=team2_id, round_number=round_number, position=len(round_matches),
+                    team1_name=names[team1_id], team2_name=names[team2_id],
+                    team1_seed=seeds[team1_id], team2_seed=seeds[team2_id]
+                ))
+            round_start = self._schedule(round_matches, round_start)
+            if bye:
+                round_matches.append(Match(
+                    match_id=deterministic_id(rng), tournament_id=tournament.tournament_id, team1_id=bye,
+                    round_number=round_number, position=len(round_matches), status='completed',
+                    score_team1=1, score_team2=0, team1_name=names[bye], team1_seed=seeds[bye],
+                    scheduled_time=round_start, completed_at=round_start
+                ))
+
+            for match in round_matches:
+                if match.status != 'completed':
+                    self._play(match, strength, round_number == stop_round)
+            matches.extend(round_matches)
+        return matches
+
+    def _schedule(self, round_matches, round_start):
+        """Spread a round over the courts in waves; returns when the next round can start"""
+        courts, minutes = self.args.courts, self.args.match_minutes
+        for number, match in enumerate(round_matches):
+            match.court = str(number % courts + 1)
+            match.scheduled_time = round_start + (number // courts) * minutes * 60
+        waves = max(1, math.ceil(len(round_matches) / courts))
+        return round_start + waves * minutes * 60
+
+    def _play(self, match, strength, current_round):
+        """
+        Play a match to the end, or, in the round an in-progress event has
+        reached, maybe only start it or leave it scheduled. Returns whether
+        the match was completed.
+        """
+        roll = self.rng.random()
+        if current_round and roll >= 0.4:
+            if roll < 0.7:
+                match.status = 'in_progress'
+                match.started_at = int(match.scheduled_time)
+                match.score_team1, match.score_team2 = in_progress_score(self.rng, self.args.points)
+            return False
+        self._complete(match, strength)
+        return True
+
+    def _complete(self, match, strength):
+        """Play a match to the end"""
+        match.score_team1, match.score_team2 = play_score(self.rng, strength[match.team1_id], strength[match.team2_id],
+                                                          self.args.points)
+        match.status = 'completed'
+        match.started_at = int(match.scheduled_time)
+        match.completed_at = match.started_at + self.rng.randint(25, 70) * 60
+
+def parse_sizes(value):
+    """'8,16,24-32' -> every team count the generator may pick"""
+    sizes = []
+    for part in value.split(','):
+        low, _, high = part.partition('-')
+        sizes.extend(range(int(low), int(high or low) + 1))
+    if not sizes or min(sizes) < 2:
+        raise argparse.ArgumentTypeError('sizes must be team counts of at least 2')
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate reproducible synthetic tournaments, rosters and played brackets for capacity testing'
+    )
+    parser.add_argument('-n', '--tournaments', type=int, default=100, help='Tournaments to create (default: 100)')
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('8,16,32,64'),
+                        help='Team counts to pick from, e.g. "8,16,24-32" (default: 8,16,32,64)')
+    parser.add_argument('--types', default='single_elimination,swiss',
+                        help='Tournament types to pick from (default: single_elimination,swiss)')
+    parser.add_argument('--completed', type=float, default=0.7, help='Share of tournaments fully played (default: 0.7)')
+    parser.add_argument('--in-progress', type=float, default=0.2,
+                        help='Share of tournaments part way through; the rest are upcoming (default: 0.2)')
+    parser.add_argument('--points', type=int, default=25, help='Points to win a set, e.g. 21 for beach (default: 25)')
+    parser.add_argument('--courts', type=int, default=4, help='Courts per tournament (default: 4)')
+    parser.add_argument('--match-minutes', type=int, default=45, help='Scheduled slot per match (default: 45)')
+    parser.add_argument('--seed', default='volleytracker', help='RNG seed; the same seed and options give the same data')
+    parser.add_argument('--epoch', type=int, default=int(time.time()) // 86400 * 86400,
+                        help='"Now" for generated dates, as a unix timestamp (default: midnight UTC today)')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent writer threads (default: 16)')
+    parser.add_argument('--dry-run', action='store_true', help='Generate and count items without writing them')
+    args = parser.parse_args()
+    args.types = [name.strip() for name in args.types.split(',') if name.strip()]
+    if args.completed + args.in_progress > 1:
+        parser.error('--completed and --in-progress add up to more than 1')
+
+    if not args.dry_run:
+        db_service.create_tables_if_not_exists()
+    writer = BatchWriter()
+    tables = (Tournament._table().name, Team._table().name, Match._table().name)
+    totals = {'tournaments': 0, 'teams': 0, 'matches': 0}
+    totals_lock = threading.Lock()
+
+    def generate(index):
+        # Every tournament has its own RNG, so the output doesn't depend on thread scheduling
+        tournament, teams, matches = TournamentGenerator(args, index).build()
+        if not args.dry_run:
+            writer.write(tables[0], [tournament._to_item()])
+            writer.write(tables[1], [team._to_item() for team in teams])
+            writer.write(tables[2], [match._to_item() for match in matches])
+        with totals_lock:
+            totals['tournaments'] += 1
+            totals['teams'] += len(teams)
+            totals['matches'] += len(matches)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for number, _ in enumerate(executor.map(generate, range(args.tournaments)), 1):
+            if number % 100 == 0 or number == args.tournaments:
+                elapsed = time.time() - started
+                print(f"{number}/{args.tournaments} tournaments, {totals['matches']} matches, "
+                      f"{totals['matches'] / max(elapsed, 1e-9):.0f} matches/s", file=sys.stderr)
+
+    print(f"{'Generated' if args.dry_run else 'Wrote'} {totals['tournaments']} tournaments, {totals['teams']} teams "
+          f"and {totals['matches']} matches in {time.time() - started:.1f}s (seed {args.seed!r})")
+    if not args.dry_run:
+        print("Ratings aren't updated by generated data; run POST /api/ratings/recompute to rebuild them")
+
+if __name__ == "__main__":
+    main()
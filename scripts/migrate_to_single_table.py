@@ -0,0 +1,79 @@
+import sys
+import os
+import argparse
+
+# Add the backend directory to the path so we can import the backend modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.db_service import db_service
+from services import single_table
+from models.match import assign_positions
+from collections import defaultdict
+
+def copy_tournaments(writer):
+    """Copy every tournament into its partition's META item"""
+    items = db_service.scan_all(db_service.tournaments_table)
+    for item in items:
+        tournament_id = item['tournament_id']
+        writer.put_item(Item=single_table.to_item(
+            item, single_table.tournament_pk(tournament_id), single_table.META_SK,
+            'tournament', tournament_id
+        ))
+    return len(items)
+
+def copy_teams(writer):
+    """Copy every team under its tournament's partition"""
+    items = db_service.scan_all(db_service.teams_table)
+    for item in items:
+        writer.put_item(Item=single_table.to_item(
+            item, single_table.tournament_pk(item['tournament_id']), single_table.team_sk(item['team_id']),
+            'team', item['team_id']
+        ))
+    return len(items)
+
+def copy_matches(writer):
+    """Copy every match under its tournament's partition, keyed by round and position"""
+    by_tournament = defaultdict(list)
+    for item in db_service.scan_all(db_service.matches_table):
+        by_tournament[item['tournament_id']].append(item)
+
+    count = 0
+    for tournament_id, items in by_tournament.items():
+        # Older matches have no position; derive it from the bracket links
+        for item in assign_positions(items):
+            sk = single_table.match_sk(item.get('round_number'), item.get('position'), item['match_id'])
+            writer.put_item(Item=single_table.to_item(
+                item, single_table.tournament_pk(tournament_id), sk, 'match', item['match_id']
+            ))
+            count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Copy the VolleyDB_* tables into the single-table layout (DATA_LAYOUT=single_table)'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Count items without writing anything')
+    args = parser.parse_args()
+
+    existing_tables = db_service.client.list_tables()['TableNames']
+    if db_service.SINGLE_TABLE not in existing_tables and not args.dry_run:
+        print(f"Creating table {db_service.SINGLE_TABLE}...")
+        db_service._create_single_table()
+        db_service.client.get_waiter('table_exists').wait(TableName=db_service.SINGLE_TABLE)
+
+    if args.dry_run:
+        print(f"Tournaments: {len(db_service.scan_all(db_service.tournaments_table))}")
+        print(f"Teams: {len(db_service.scan_all(db_service.teams_table))}")
+        print(f"Matches: {len(db_service.scan_all(db_service.matches_table))}")
+        return
+
+    # Puts are idempotent, so the migration can be re-run until it's cut over
+    with db_service.single_table.batch_writer() as writer:
+        print(f"Copied {copy_tournaments(writer)} tournaments")
+        print(f"Copied {copy_teams(writer)} teams")
+        print(f"Copied {copy_matches(writer)} matches")
+
+    print("Migration complete! Set DATA_LAYOUT=single_table to switch the API over.")
+
+if __name__ == "__main__":
+    main()